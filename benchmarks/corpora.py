@@ -0,0 +1,38 @@
+"""
+Synthetic corpora for the benchmarks: random sentences drawn from small per-script word lists.
+"""
+import random
+
+WORDS = {
+    'ur-PK': ['جمہوریہ', 'پاکستان', 'کی', 'حکومت', 'نہیں', 'اسلام', 'آباد', 'ایک', 'اور', 'میں', 'ہے',
+              'گئے', 'آئے', 'جائیں', 'سوال', 'شہر', 'بھارت', 'کراچی', 'لاہور', 'دریا', 'کتاب', 'ہوئی', '۱۹۴۷'],
+    'hi-IN': ['हैदराबाद', 'भारत', 'का', 'एक', 'शहर', 'है', 'इसलिए', 'ईद', 'उम्मीद', 'ऊपर', 'ऐसा', 'औरत',
+              'गए', 'आए', 'क़िला', 'ज़रूर', 'सवाल', 'मैं', 'कहाँ', 'दुनिया', 'किताब', 'हुई', '१९४७'],
+    'pa-IN': ['ਪੰਜਾਬੀ', 'ਸਿੰਘ', 'ਗੁਰੂ', 'ਅੰਮ੍ਰਿਤਸਰ', 'ਲਾਹੌਰ', 'ਦਰਿਆ', 'ਕਿਤਾਬ', 'ਹੈ', 'ਦੀ', 'ਅਤੇ'],
+    'pa-PK': ['پنجابی', 'سنگھ', 'گرو', 'امرتسر', 'لاہور', 'دریا', 'کتاب', 'اے', 'دی', 'تے'],
+    'sd-IN': ['सिन्धी', 'हैदराबाद', 'कराची', 'दरियाह', 'किताब', 'आहे', 'में', 'ऐं', 'सिन्धु'],
+    'sd-PK': ['سنڌي', 'حيدرآباد', 'ڪراچي', 'درياهه', 'ڪتاب', 'آهي', '۾', '۽', 'سنڌو'],
+    'gu-IN': ['ગુજરાતી', 'અમદાવાદ', 'ભારત', 'શહેર', 'છે', 'અને', 'પુસ્તક', 'નદી'],
+}
+
+def make_sentence(script, rng, num_words):
+    return ' '.join(rng.choice(WORDS[script]) for _ in range(num_words)) + ('۔' if script.endswith('PK') else '।')
+
+def make_corpus(script, num_texts, words_per_text=(1, 3), seed=0):
+    """
+    Returns `num_texts` random texts of `words_per_text` (min, max) words each.
+    """
+    rng = random.Random(seed)
+    return [make_sentence(script, rng, rng.randint(*words_per_text)) for _ in range(num_texts)]
+
+def make_document(script, num_chars, seed=0):
+    """
+    Returns a single text of about `num_chars` characters, made of lines of sentences.
+    """
+    rng = random.Random(seed)
+    lines, size = [], 0
+    while size < num_chars:
+        line = ' '.join(make_sentence(script, rng, rng.randint(5, 20)) for _ in range(rng.randint(1, 4)))
+        lines.append(line)
+        size += len(line) + 1
+    return '\n'.join(lines)
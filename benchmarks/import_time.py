@@ -0,0 +1,115 @@
+"""
+Measures the cold-start cost of the rule-based converters:
+- time to `import indo_arabic_transliteration.mapper`
+- time and RSS growth of the first `script_convert()` call for each pair (which builds its converter,
+  for the direction of the pair only), and of the same first call with a converter built for both directions
+- time and RSS growth to `warmup()` every pair
+
+Each measurement runs in a fresh interpreter. Usage:
+    python benchmarks/import_time.py [--repeat 5] [--pairs ur-PK:hi-IN hi-IN:ur-PK]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = '''
+import time
+start = time.perf_counter()
+import indo_arabic_transliteration.mapper
+print(time.perf_counter() - start)
+'''
+
+# Resident memory (KiB) of the snippet's process
+RSS_FUNCTION = '''
+import os
+def rss_kib():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+'''
+
+FIRST_CALL_SNIPPET = RSS_FUNCTION + '''
+import time
+from indo_arabic_transliteration.mapper import script_convert
+rss = rss_kib()
+start = time.perf_counter()
+script_convert({text!r}, {from_script!r}, {to_script!r})
+print(time.perf_counter() - start, rss_kib() - rss)
+'''
+
+# Same, with the converter built for all its directions
+FULL_CONVERTER_SNIPPET = RSS_FUNCTION + '''
+import time
+from indo_arabic_transliteration.mapper import DELEGATES, get_converter
+delegate = DELEGATES[({from_script!r}, {to_script!r})]
+rss = rss_kib()
+start = time.perf_counter()
+getattr(get_converter(delegate.converter_name), delegate.method_name)({text!r})
+print(time.perf_counter() - start, rss_kib() - rss)
+'''
+
+WARMUP_SNIPPET = RSS_FUNCTION + '''
+import time
+from indo_arabic_transliteration.mapper import warmup
+rss = rss_kib()
+start = time.perf_counter()
+warmup()
+print(time.perf_counter() - start, rss_kib() - rss)
+'''
+
+SAMPLE_TEXTS = {
+    'hi-IN': 'हैदराबाद',
+    'ur-PK': 'حیدرآباد',
+    'pa-IN': 'ਪੰਜਾਬੀ',
+    'pa-PK': 'پنجابی',
+    'sd-IN': 'सिन्धी',
+    'sd-PK': 'سنڌي',
+    'gu-IN': 'ગુજરાતી',
+}
+
+def run_snippet(snippet, repeat):
+    timings, rss_growths = [], []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', snippet], cwd=REPO_ROOT, check=True,
+                                capture_output=True, text=True).stdout
+        timing, *rss_growth = output.strip().splitlines()[-1].split()
+        timings.append(float(timing))
+        rss_growths.extend(map(int, rss_growth))
+    result = {'median_s': statistics.median(timings), 'min_s': min(timings), 'runs': len(timings)}
+    if rss_growths:
+        result['median_rss_growth_kib'] = statistics.median(rss_growths)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--pairs', nargs='*', help='Pairs as FROM:TO (default: all pairs in DELEGATES)')
+    parser.add_argument('--skip-warmup', action='store_true')
+    args = parser.parse_args()
+
+    if args.pairs:
+        pairs = [tuple(pair.split(':')) for pair in args.pairs]
+    else:
+        sys.path.insert(0, REPO_ROOT)
+        from indo_arabic_transliteration.mapper import DELEGATES
+        pairs = list(DELEGATES)
+
+    report = {'import': run_snippet(IMPORT_SNIPPET, args.repeat), 'first_call': {}, 'first_call_full_converter': {}}
+    for from_script, to_script in pairs:
+        for section, snippet in (('first_call', FIRST_CALL_SNIPPET), ('first_call_full_converter', FULL_CONVERTER_SNIPPET)):
+            snippet = snippet.format(text=SAMPLE_TEXTS.get(from_script, ''), from_script=from_script, to_script=to_script)
+            report[section][f'{from_script}:{to_script}'] = run_snippet(snippet, args.repeat)
+    if not args.skip_warmup:
+        report['warmup_all'] = run_snippet(WARMUP_SNIPPET, args.repeat)
+    print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Compares the speed of whole-word overrides with a `Lexicon` (hash lookup per word) and with
+a regex alternation of the words (`\\b(?:word1|word2|...)\\b`), for growing lexicon sizes.
+The lexicons are random Urdu letter strings, a few of which occur in the corpus.
+Outputs of both are checked to be identical.
+
+Usage:
+    python benchmarks/lexicon_scaling.py [--sizes 10 1000 10000 100000] [--texts 20000]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpora import WORDS, make_corpus
+from indo_arabic_transliteration.lexicon import Lexicon
+from indo_arabic_transliteration.str_mapper import RegexRuleTranslator, get_keys_regex_str
+
+URDU_LETTERS = 'ابپتٹثجچحخدڈذرڑزژسشصضطظعغفقکگلمنوہھءیے'
+
+def make_lexicon(size, seed=0):
+    rng = random.Random(seed)
+    words = {word: word[::-1] for word in WORDS['ur-PK'][:5]}
+    while len(words) < size:
+        word = ''.join(rng.choice(URDU_LETTERS) for _ in range(rng.randint(2, 8)))
+        words[word] = word[::-1]
+    return words
+
+def measure(translate, texts):
+    start = time.perf_counter()
+    outputs = [translate(text) for text in texts]
+    return time.perf_counter() - start, outputs
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='*', default=[10, 1000, 10000, 100000])
+    parser.add_argument('--texts', type=int, default=20000)
+    args = parser.parse_args()
+
+    texts = make_corpus('ur-PK', args.texts, (5, 20))
+    results = []
+    for size in args.sizes:
+        words = make_lexicon(size)
+        start = time.perf_counter()
+        lexicon = Lexicon(words)
+        lexicon_build = time.perf_counter() - start
+        start = time.perf_counter()
+        regex = RegexRuleTranslator([(r'\b%s\b' % get_keys_regex_str(words), words)])
+        regex_build = time.perf_counter() - start
+
+        lexicon_seconds, lexicon_outputs = measure(lexicon.translate, texts)
+        regex_seconds, regex_outputs = measure(regex.translate, texts)
+        assert lexicon_outputs == regex_outputs, f"Lexicon and regex outputs differ for size {size}"
+        results.append({
+            'size': size, 'lexicon_build_ms': 1000 * lexicon_build, 'regex_build_ms': 1000 * regex_build,
+            'lexicon_texts_per_sec': len(texts) / lexicon_seconds, 'regex_texts_per_sec': len(texts) / regex_seconds,
+        })
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Throughput of `script_convert_parallel()` for an increasing number of workers,
+compared to calling `script_convert()` in a loop. Usage:
+    python benchmarks/parallel_scaling.py [--pair ur-PK:hi-IN] [--texts 200000] [--workers 1 2 4 8 16]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpora import make_corpus
+from indo_arabic_transliteration.mapper import script_convert, script_convert_parallel, warmup
+
+def main():
+    cpu_count = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pair', default='ur-PK:hi-IN')
+    parser.add_argument('--texts', type=int, default=100000)
+    parser.add_argument('--words-per-text', type=int, nargs=2, default=(5, 15))
+    parser.add_argument('--chunksize', type=int, default=256)
+    parser.add_argument('--workers', type=int, nargs='*', default=sorted({1, 2, 4, 8, 16, cpu_count} & set(range(1, cpu_count+1))))
+    args = parser.parse_args()
+
+    from_script, to_script = args.pair.split(':')
+    texts = make_corpus(from_script, args.texts, args.words_per_text)
+    num_chars = sum(map(len, texts))
+    warmup([(from_script, to_script)])
+
+    start = time.perf_counter()
+    expected = [script_convert(text, from_script, to_script) for text in texts]
+    serial_seconds = time.perf_counter() - start
+
+    report = {
+        'pair': args.pair, 'texts': len(texts), 'chars': num_chars, 'cpu_count': cpu_count,
+        'script_convert': {'seconds': serial_seconds, 'chars_per_sec': num_chars / serial_seconds},
+        'script_convert_parallel': [],
+    }
+    for workers in args.workers:
+        start = time.perf_counter()
+        outputs = list(script_convert_parallel(texts, from_script, to_script, workers=workers, chunksize=args.chunksize))
+        seconds = time.perf_counter() - start
+        assert outputs == expected, "Parallel output differs from script_convert()"
+        report['script_convert_parallel'].append({
+            'workers': workers, 'seconds': seconds, 'chars_per_sec': num_chars / seconds,
+            'speedup': serial_seconds / seconds,
+        })
+    print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
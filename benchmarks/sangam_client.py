@@ -0,0 +1,86 @@
+"""
+Throughput of the Sangam API clients against a local mock server which injects latency
+(no request reaches the real server):
+- `online_transliterate()` in a loop (one connection and one round trip per text)
+- `online_transliterate_many()`, for several concurrency levels, with and without packing
+
+Usage:
+    python benchmarks/sangam_client.py [--texts 2000] [--latency 0.05] [--concurrency 1 8 32] [--pack-chars 1000]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpora import make_corpus
+from indo_arabic_transliteration import sangam_api
+
+def make_mock_server(latency):
+    class MockSangamHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1' # Keep-alive
+        disable_nagle_algorithm = True
+        num_requests = 0
+
+        def do_POST(self):
+            text = json.loads(self.rfile.read(int(self.headers['Content-Length'])))['input']
+            MockSangamHandler.num_requests += 1
+            time.sleep(latency)
+            body = json.dumps({'d': '\n'.join(line[::-1] for line in text.split('\n'))}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MockSangamHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, MockSangamHandler
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pair', default='ur-PK:hi-IN')
+    parser.add_argument('--texts', type=int, default=1000)
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds added by the mock server to each request')
+    parser.add_argument('--concurrency', type=int, nargs='*', default=[1, 8, 32])
+    parser.add_argument('--pack-chars', type=int, default=1000)
+    args = parser.parse_args()
+
+    from_script, to_script = args.pair.split(':')
+    texts = make_corpus(from_script, args.texts)
+    expected = [text[::-1] for text in texts]
+
+    server, handler = make_mock_server(args.latency)
+    base_url = f'http://127.0.0.1:{server.server_port}/'
+    for pair, url in sangam_api.ENDPOINTS.items():
+        sangam_api.ENDPOINTS[pair] = base_url + url.rsplit('/', 1)[1]
+
+    def measure(name, convert, **params):
+        handler.num_requests = 0
+        start = time.perf_counter()
+        outputs = convert()
+        seconds = time.perf_counter() - start
+        assert outputs == expected, f"{name} output differs from the mock server's"
+        return {'method': name, **params, 'seconds': seconds, 'texts_per_sec': len(texts) / seconds, 'requests': handler.num_requests}
+
+    results = [measure('online_transliterate', lambda: [sangam_api.online_transliterate(text, from_script, to_script) for text in texts])]
+    for concurrency in args.concurrency:
+        for pack_chars in (0, args.pack_chars):
+            results.append(measure('online_transliterate_many', lambda: sangam_api.online_transliterate_many(
+                texts, from_script, to_script, concurrency=concurrency, pack_chars=pack_chars), concurrency=concurrency, pack_chars=pack_chars))
+    server.shutdown()
+
+    report = {'pair': args.pair, 'texts': len(texts), 'distinct_texts': len(set(texts)), 'latency': args.latency, 'results': results}
+    print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+Load test of the HTTP service (indo_arabic_transliteration.server) on localhost: concurrent
+keep-alive clients each send one text per request, and the throughput, latencies and
+micro-batching stats are reported. Outputs are checked against `script_convert()`.
+
+By default a server is started for the test (and stopped after it); `--url` targets a running one.
+Usage:
+    python benchmarks/server_load.py [--pair ur-PK:hi-IN] [--requests 20000] [--concurrency 1 16 64]
+                                     [--workers 4] [--max-delay-ms 2] [--url http://127.0.0.1:8080]
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpora import make_corpus
+from indo_arabic_transliteration.mapper import script_convert
+
+def get_free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_server(port, args):
+    command = [sys.executable, '-m', 'indo_arabic_transliteration.server', '--port', str(port), '--pairs', args.pair,
+               '--ml-pairs', '--max-delay-ms', str(args.max_delay_ms), '--max-batch-size', str(args.max_batch_size)]
+    if args.workers is not None:
+        command += ['--workers', str(args.workers)]
+    return subprocess.Popen(command, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def get(url):
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return response.status, response.read().decode('utf-8')
+    except urllib.error.HTTPError as error:
+        return error.code, error.read().decode('utf-8')
+
+def wait_until_ready(url, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if get(url + '/ready')[0] == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"Server at {url} not ready after {timeout} seconds")
+
+def get_batch_stats(url, pair):
+    _, metrics = get(url + '/metrics')
+    stats = {}
+    for name in ('requests', 'batches', 'batch_texts'):
+        match = re.search(r'^indo_xlit_%s_total\{method="rules",pair="%s"\} (\d+)$' % (name, re.escape(pair)), metrics, re.M)
+        stats[name] = int(match.group(1)) if match else 0
+    return stats
+
+async def run_client(host, port, requests, latencies, outputs):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for index, body in requests:
+            start = time.perf_counter()
+            writer.write(b'POST /convert HTTP/1.1\r\nHost: %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s'
+                         % (host.encode(), len(body), body))
+            await writer.drain()
+            status = (await reader.readline()).split()[1]
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.partition(b':')
+                if name.strip().lower() == b'content-length':
+                    length = int(value)
+            response = json.loads(await reader.readexactly(length))
+            latencies.append(time.perf_counter() - start)
+            if status != b'200':
+                raise RuntimeError(f"Request failed with {status.decode()}: {response}")
+            outputs[index] = response['output']
+    finally:
+        writer.close()
+
+async def run_load(host, port, bodies, concurrency):
+    latencies, outputs = [], [None] * len(bodies)
+    shares = [list(enumerate(bodies))[client::concurrency] for client in range(concurrency)]
+    start = time.perf_counter()
+    await asyncio.gather(*[run_client(host, port, share, latencies, outputs) for share in shares])
+    return time.perf_counter() - start, sorted(latencies), outputs
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pair', default='ur-PK:hi-IN')
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--words-per-text', type=int, nargs=2, default=(1, 10))
+    parser.add_argument('--concurrency', type=int, nargs='*', default=[1, 16, 64])
+    parser.add_argument('--url', help='Test this running server instead of starting one')
+    parser.add_argument('--workers', type=int, help='Worker processes of the started server (default: its own default)')
+    parser.add_argument('--max-delay-ms', type=float, default=2.0)
+    parser.add_argument('--max-batch-size', type=int, default=256)
+    parser.add_argument('--startup-timeout', type=float, default=60)
+    args = parser.parse_args()
+
+    from_script, to_script = args.pair.split(':')
+    texts = make_corpus(from_script, args.requests, args.words_per_text)
+    expected = [script_convert(text, from_script, to_script) for text in texts]
+    bodies = [json.dumps({'text': text, 'from': from_script, 'to': to_script}).encode() for text in texts]
+
+    process = None
+    url = args.url
+    if url is None:
+        port = get_free_port()
+        process = start_server(port, args)
+        url = f'http://127.0.0.1:{port}'
+    try:
+        start = time.perf_counter()
+        wait_until_ready(url, args.startup_timeout)
+        report = {'pair': args.pair, 'requests': len(texts), 'url': url, 'ready_seconds': time.perf_counter() - start, 'results': []}
+        host, port = url.split('//', 1)[1].rstrip('/').rsplit(':', 1)
+        for concurrency in args.concurrency:
+            before = get_batch_stats(url, args.pair)
+            seconds, latencies, outputs = asyncio.run(run_load(host, int(port), bodies, concurrency))
+            after = get_batch_stats(url, args.pair)
+            assert outputs == expected, "Server output differs from script_convert()"
+            batches = after['batches'] - before['batches']
+            report['results'].append({
+                'concurrency': concurrency, 'seconds': seconds, 'requests_per_sec': len(texts) / seconds,
+                'latency_p50_ms': 1000 * percentile(latencies, 0.5), 'latency_p90_ms': 1000 * percentile(latencies, 0.9),
+                'latency_p99_ms': 1000 * percentile(latencies, 0.99),
+                'batches': batches, 'texts_per_batch': (after['batch_texts'] - before['batch_texts']) / max(batches, 1),
+            })
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+    print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
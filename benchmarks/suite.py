@@ -0,0 +1,193 @@
+"""
+Benchmark suite of the rule-based converters, for every pair in `mapper.DELEGATES`:
+- import time, and construction time of each converter (first call, in a fresh interpreter)
+- for corpora of single words, sentences, and a large document (10M chars by default):
+  throughput (chars/sec) of `script_convert()` and `script_convert_batch()`,
+  p50/p99 latency per text, and peak memory allocated while converting (tracemalloc)
+
+Results are printed (or saved) as JSON. With `--compare`, they are checked against a
+previously saved baseline (run with the same options), and the command fails if any metric
+regressed by more than `--tolerance`, is missing, or if a pair failed to run. Usage:
+    python benchmarks/suite.py -o baseline.json
+    python benchmarks/suite.py --compare baseline.json [--tolerance 0.15]
+    python benchmarks/suite.py --pairs ur-PK:hi-IN --corpora sentences --corpus-file ur-PK=real.txt
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpora import make_corpus, make_document
+from import_time import FIRST_CALL_SNIPPET, IMPORT_SNIPPET, SAMPLE_TEXTS, run_snippet
+
+# Metric name -> whether higher is better
+METRICS = {
+    'chars_per_sec': True,
+    'batch_chars_per_sec': True,
+    'p50_ms': False,
+    'p99_ms': False,
+    'peak_memory_mb': False,
+    'median_s': False,
+}
+
+def make_corpora(script, names, num_texts, document_chars, corpus_file=None):
+    corpora = {}
+    if 'words' in names:
+        corpora['words'] = make_corpus(script, num_texts, words_per_text=(1, 1))
+    if 'sentences' in names:
+        corpora['sentences'] = make_corpus(script, num_texts // 4, words_per_text=(5, 15))
+    if 'document' in names:
+        corpora['document'] = [make_document(script, document_chars)]
+    if corpus_file:
+        with open(corpus_file, encoding='utf-8') as f:
+            corpora['file'] = f.read().splitlines()
+    return corpora
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+def measure_corpus(texts, from_script, to_script, repeat, measure_memory):
+    from indo_arabic_transliteration.mapper import script_convert, script_convert_batch
+
+    num_chars = sum(map(len, texts))
+    latencies = []
+    best_seconds = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            text_start = time.perf_counter()
+            script_convert(text, from_script, to_script)
+            latencies.append(time.perf_counter() - text_start)
+        best_seconds = min(best_seconds, time.perf_counter() - start)
+    latencies.sort()
+    result = {
+        'texts': len(texts), 'chars': num_chars,
+        'chars_per_sec': num_chars / best_seconds,
+        'p50_ms': 1000 * percentile(latencies, 0.50),
+        'p99_ms': 1000 * percentile(latencies, 0.99),
+    }
+
+    if len(texts) > 1:
+        best_seconds = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in script_convert_batch(texts, from_script, to_script):
+                pass
+            best_seconds = min(best_seconds, time.perf_counter() - start)
+        result['batch_chars_per_sec'] = num_chars / best_seconds
+
+    if measure_memory:
+        tracemalloc.start()
+        for text in texts:
+            script_convert(text, from_script, to_script)
+        result['peak_memory_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    return result
+
+def run(args):
+    from indo_arabic_transliteration.mapper import DELEGATES, warmup
+
+    pairs = [tuple(pair.split(':')) for pair in args.pairs] if args.pairs else list(DELEGATES)
+    corpus_files = dict(item.split('=', 1) for item in args.corpus_file)
+    report = {
+        'meta': {'python': platform.python_version(), 'platform': platform.platform(), 'cpu_count': os.cpu_count(),
+                 'corpora': args.corpora, 'texts': args.texts, 'document_chars': args.document_chars, 'repeat': args.repeat},
+        'import': run_snippet(IMPORT_SNIPPET, args.startup_repeat),
+        'pairs': {},
+    }
+    for from_script, to_script in pairs:
+        name = f'{from_script}:{to_script}'
+        print(f'Benchmarking {name}', file=sys.stderr)
+        try:
+            warmup([(from_script, to_script)])
+            snippet = FIRST_CALL_SNIPPET.format(text=SAMPLE_TEXTS.get(from_script, ''), from_script=from_script, to_script=to_script)
+            pair_report = {'construction': run_snippet(snippet, args.startup_repeat), 'corpora': {}}
+            corpora = make_corpora(from_script, args.corpora, args.texts, args.document_chars, corpus_files.get(from_script))
+            for corpus_name, texts in corpora.items():
+                pair_report['corpora'][corpus_name] = measure_corpus(texts, from_script, to_script, args.repeat, not args.no_memory)
+        except Exception as e:
+            pair_report = {'error': f'{type(e).__name__}: {e}'}
+        report['pairs'][name] = pair_report
+    return report
+
+def flatten(report, prefix=''):
+    for key, value in report.items():
+        if isinstance(value, dict):
+            yield from flatten(value, f'{prefix}{key}/')
+        elif key in METRICS:
+            yield f'{prefix}{key}', key, value
+
+def compare(baseline, current, tolerance):
+    """
+    Returns the failures of `current` against `baseline`: the pairs which errored, the metrics
+    of `baseline` missing from `current` (`current` is None), and the metrics which are worse
+    than in `baseline` by more than `tolerance` (relative).
+    """
+    errors = {name: pair_report['error'] for name, pair_report in current.get('pairs', {}).items() if 'error' in pair_report}
+    failures = [{'metric': f'pairs/{name}', 'error': error} for name, error in errors.items()]
+    errored_prefixes = tuple(f'pairs/{name}/' for name in errors)
+    current_metrics = {path: value for path, _, value in flatten(current)}
+    for path, metric, baseline_value in flatten(baseline):
+        if path.startswith(errored_prefixes):
+            continue
+        if path not in current_metrics:
+            failures.append({'metric': path, 'baseline': baseline_value, 'current': None})
+            continue
+        value = current_metrics[path]
+        if not baseline_value:
+            continue
+        change = value / baseline_value - 1
+        if (-change if METRICS[metric] else change) > tolerance:
+            failures.append({'metric': path, 'baseline': baseline_value, 'current': value, 'change': change})
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pairs', nargs='*', help='Pairs as FROM:TO (default: all pairs in DELEGATES)')
+    parser.add_argument('--corpora', nargs='*', default=['words', 'sentences', 'document'], choices=['words', 'sentences', 'document'])
+    parser.add_argument('--corpus-file', action='append', default=[], metavar='SCRIPT=PATH',
+                        help='Also benchmark the lines of a real corpus for the given source script')
+    parser.add_argument('--texts', type=int, default=20000, help='Number of words (and 1/4 as many sentences)')
+    parser.add_argument('--document-chars', type=int, default=10_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--startup-repeat', type=int, default=3, help='Fresh interpreters used for import/construction times')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the (slow) peak memory measurement')
+    parser.add_argument('-o', '--output', help='Save the results to this file (default: print them)')
+    parser.add_argument('--compare', metavar='BASELINE', help='Flag regressions against a saved baseline')
+    parser.add_argument('--current', help='Compare these saved results instead of running the benchmarks')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='Allowed relative slowdown/growth (default: 0.15)')
+    args = parser.parse_args()
+
+    if args.current:
+        with open(args.current, encoding='utf-8') as f:
+            report = json.load(f)
+    else:
+        report = run(args)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+        else:
+            print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            failures = compare(json.load(f), report, args.tolerance)
+        for failure in failures:
+            if 'error' in failure:
+                print(f"ERROR {failure['metric']}: {failure['error']}", file=sys.stderr)
+            elif failure['current'] is None:
+                print(f"MISSING {failure['metric']}: {failure['baseline']:.4g} -> none", file=sys.stderr)
+            else:
+                print(f"REGRESSION {failure['metric']}: {failure['baseline']:.4g} -> {failure['current']:.4g} ({failure['change']:+.1%})", file=sys.stderr)
+        if failures:
+            sys.exit(1)
+        print(f'No regression beyond {args.tolerance:.0%}', file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
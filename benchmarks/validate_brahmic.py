@@ -0,0 +1,102 @@
+"""
+Checks that the built-in Devanagari <-> Gurmukhi / Gujarati conversions (indo_arabic_transliteration.brahmic)
+give exactly the same output as aksharamukha's `process()` they replace, and compares their speed.
+Needs aksharamukha installed, at the version they follow (AKSHARAMUKHA_VERSION). Usage:
+    python benchmarks/validate_brahmic.py [--texts 100000] [--file hindi.txt --file punjabi.txt] [--save parity.jsonl]
+
+Besides the given files (checked with every conversion from their script), the texts are random
+mixes of the chars of the source block, ASCII and joiners, and random words made of syllables
+(consonant clusters with nukta, vowel signs, nasalization...) of the source script.
+With --save, the texts and aksharamukha's outputs are written to a JSON-lines file: tests/data/brahmic_parity.jsonl
+(checked by tests/test_brahmic.py, without aksharamukha) was made with `--texts 100 --save`.
+"""
+import argparse
+import importlib.metadata
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indo_arabic_transliteration.brahmic import AKSHARAMUKHA_VERSION, BLOCK_OFFSETS, BrahmicTranslator
+
+BLOCK_STARTS = {'Devanagari': 0x0900, **{script: 0x0900 + offset for script, offset in BLOCK_OFFSETS.items()}}
+CONVERSIONS = [(source, target) for script in BLOCK_OFFSETS for source, target in [('Devanagari', script), (script, 'Devanagari')]]
+
+OTHER_CHARS = list(" \t\n'\":|,?.-_()0123456789abchXYZ।॥↓↑│┃●") + ['‌', '‍', '\u034f']
+
+def get_block(script, categories):
+    import unicodedata
+    start = BLOCK_STARTS[script]
+    return [chr(code) for code in range(start, start + 0x80) if unicodedata.category(chr(code))[0] in categories]
+
+def make_texts(script, num_texts, rng):
+    alphabet = [chr(code) for code in range(BLOCK_STARTS[script], BLOCK_STARTS[script] + 0x80)] + OTHER_CHARS
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 40))) for _ in range(num_texts)]
+
+def make_words(script, num_texts, rng):
+    letters, signs = get_block(script, 'L'), get_block(script, 'M')
+    nukta, virama = chr(BLOCK_STARTS[script] + 0x3c), chr(BLOCK_STARTS[script] + 0x4d)
+    def make_syllable():
+        syllable = rng.choice(letters)
+        if rng.random() < 0.2:
+            syllable += nukta
+        if rng.random() < 0.3:
+            syllable += virama + rng.choice(letters)
+        if rng.random() < 0.6:
+            syllable += rng.choice(signs)
+        if rng.random() < 0.2:
+            syllable += rng.choice(signs)
+        return syllable
+    return [' '.join(''.join(make_syllable() for _ in range(rng.randint(1, 5))) for _ in range(rng.randint(1, 4))) for _ in range(num_texts)]
+
+def time_conversion(convert, texts):
+    start = time.perf_counter()
+    for text in texts:
+        convert(text)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--texts', type=int, default=100000, help='Number of random texts (and words) per conversion')
+    parser.add_argument('--file', action='append', default=[], help='Real corpus (one text per line)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', help='JSON-lines file to write the texts and the reference outputs to')
+    args = parser.parse_args()
+
+    version = importlib.metadata.version('aksharamukha')
+    if version != AKSHARAMUKHA_VERSION:
+        sys.exit(f"aksharamukha {AKSHARAMUKHA_VERSION} is needed (found {version})")
+    from aksharamukha.transliterate import process
+
+    real_texts = []
+    for path in args.file:
+        with open(path, encoding='utf-8') as f:
+            real_texts.extend(f.read().splitlines())
+
+    rng = random.Random(args.seed)
+    report, references = {}, []
+    for source, target in CONVERSIONS:
+        reference = lambda text: process(source, target, text)
+        builtin = BrahmicTranslator(source, target).translate
+        start = BLOCK_STARTS[source]
+        script_texts = [text for text in real_texts if any(start <= ord(char) < start + 0x80 for char in text)]
+        texts = make_texts(source, args.texts, rng) + make_words(source, args.texts, rng) + script_texts
+        outputs = [reference(text) for text in texts]
+        mismatches = [text for text, output in zip(texts, outputs) if builtin(text) != output]
+        references.extend({'source': source, 'target': target, 'text': text, 'output': output} for text, output in zip(texts, outputs))
+        report[f'{source}->{target}'] = {
+            'texts': len(texts), 'mismatches': len(mismatches), 'examples': mismatches[:5],
+            'reference_seconds': time_conversion(reference, texts), 'builtin_seconds': time_conversion(builtin, texts),
+        }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps(reference, ensure_ascii=False) + '\n' for reference in references)
+    if any(result['mismatches'] for result in report.values()):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Checks that the built-in normalizers (indo_arabic_transliteration.normalizers) give exactly
+the same output as the urduhack / indic_nlp_library functions they replace, and compares
+their speed. Needs both libraries installed. Usage:
+    python benchmarks/validate_normalizers.py [--texts 200000] [--file urdu.txt --file hindi.txt] [--save parity.jsonl]
+
+Besides the given files, the texts are random mixes of every char the normalizers handle,
+the Urdu/Devanagari/Gurmukhi blocks, punctuation and spaces.
+With --save, the texts and the libraries' outputs are written to a JSON-lines file: tests/data/normalizers_parity.jsonl
+(checked by tests/test_normalizers.py, without the libraries) was made with `--texts 300 --file <texts of tests/test_str_mapper.py> --save`.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indo_arabic_transliteration import normalizers
+
+def make_alphabet(first, last, *extra):
+    chars = [chr(code) for code in range(first, last+1)]
+    for mapping in extra:
+        chars.extend(char for key in mapping for char in key)
+        chars.extend(char for value in mapping.values() for char in value)
+    return chars + list(" \t\n'\":|,?.-") + ['​', '‌', '‍', ' ', '﻿']
+
+def make_texts(alphabet, num_texts, rng):
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 40))) for _ in range(num_texts)]
+
+def get_references():
+    from urduhack.normalization.character import remove_diacritics, normalize_characters, normalize_combine_characters
+    from indicnlp.normalize.indic_normalize import DevanagariNormalizer, GurmukhiNormalizer
+
+    urdu_variants = {variant: correct for correct, variants in normalizers.CORRECT_URDU_CHARACTERS.items() for variant in variants}
+    return {
+        'urdu': (
+            lambda text: normalize_combine_characters(normalize_characters(remove_diacritics(text))),
+            normalizers.UrduNormalizer().normalize,
+            make_alphabet(0x0600, 0x06ff, urdu_variants, normalizers.COMBINE_URDU_CHARACTERS),
+        ),
+        'devanagari': (
+            DevanagariNormalizer().normalize,
+            normalizers.DevanagariNormalizer().normalize,
+            make_alphabet(0x0900, 0x097f, normalizers.INDIC_COMMON_MAP, normalizers.DEVANAGARI_NORMALIZATION_MAP),
+        ),
+        'gurmukhi': (
+            GurmukhiNormalizer().normalize,
+            normalizers.GurmukhiNormalizer().normalize,
+            make_alphabet(0x0a00, 0x0a7f, normalizers.INDIC_COMMON_MAP, normalizers.GURMUKHI_NORMALIZATION_MAP, normalizers.GURMUKHI_VOWELS_MAP),
+        ),
+    }
+
+def time_normalizer(normalize, texts):
+    start = time.perf_counter()
+    for text in texts:
+        normalize(text)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--texts', type=int, default=200000, help='Number of random texts per normalizer')
+    parser.add_argument('--file', action='append', default=[], help='Real corpus (one text per line), checked with every normalizer')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', help='JSON-lines file to write the texts and the reference outputs to')
+    args = parser.parse_args()
+
+    real_texts = []
+    for path in args.file:
+        with open(path, encoding='utf-8') as f:
+            real_texts.extend(f.read().splitlines())
+
+    rng = random.Random(args.seed)
+    report, references = {}, []
+    for name, (reference, builtin, alphabet) in get_references().items():
+        texts = make_texts(alphabet, args.texts, rng) + real_texts
+        outputs = [reference(text) for text in texts]
+        mismatches = [text for text, output in zip(texts, outputs) if builtin(text) != output]
+        references.extend({'normalizer': name, 'text': text, 'output': output} for text, output in zip(texts, outputs))
+        report[name] = {
+            'texts': len(texts), 'mismatches': len(mismatches), 'examples': mismatches[:5],
+            'reference_seconds': time_normalizer(reference, texts), 'builtin_seconds': time_normalizer(builtin, texts),
+        }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps(reference, ensure_ascii=False) + '\n' for reference in references)
+    if any(result['mismatches'] for result in report.values()):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,13 @@
 import os
-import re
-import pandas as pd
-from .str_mapper import StringTranslator
-from .common import devanagari_preprocessor, devanagari_short_vowels_remover, \
-    devanagari_initial_vowels_abjadify, devanagari_nuqta_consonants_simplifier, \
-    devanagari_non_initial_vowels_abjadifier
+from types import MappingProxyType
 
-from urduhack.normalization.character import remove_diacritics, normalize_characters, normalize_combine_characters
+from .profiling import profiled
+from .str_mapper import StringTranslator, ContextRuleTranslator, RegexRuleTranslator, char_local, get_shared, get_translator
+from .tables import load_table
+from .common import DEVANAGARI_CHARS_REGEX, DEVANAGARI_INITIAL_CONTEXT, devanagari_preprocessor, remove_devanagari_short_vowels, \
+    devanagari_initial_vowels_abjadifier, devanagari_nuqta_consonants_simplifier, \
+    abjadify_devanagari_non_initial_vowels
+from .normalizers import UrduNormalizer, DevanagariNormalizer
 
 # Shared Map Files
 INITIAL_MAP_FILES = ['initial_vowels.csv']
@@ -18,135 +19,228 @@ ARABIC_MAP_FILES = ['arabic.csv']
 HAMZA_FILES = ['hamza.csv']
 HAMZA_COMBO_FILES = ['hamza_combo.csv']
 
+ARABIC_PUNCTUATIONS_MAP = {
+    ',': '،',
+    '?': '؟',
+    '؛': ';',
+    '؍': '/',
+    '٪': '%',
+}
+# Drops short-vowels, then normalizes the chars and punctuations
+arabic_normalizer = UrduNormalizer(ARABIC_PUNCTUATIONS_MAP)
+
+# Improper hamzas. Also, if a word starts with hamza, it is mostly a spacing error: remove the space
+ARABIC_HAMZA_FIXES = {
+    'اے': 'ائے',
+    'یے': 'ئے',
+}
+ARABIC_HAMZA_FIXES_RULES = [
+    (r'اے|\Bیے|\s(?=[ۓؤئ])', lambda text: ARABIC_HAMZA_FIXES.get(text, '')),
+]
+arabic_hamza_fixer = RegexRuleTranslator(ARABIC_HAMZA_FIXES_RULES, window=(1, 2))
+
+# Patch: ए is present in both hamza and initial vowels, so handle first
+DEVANAGARI_INITIAL_E_RULES = [
+    (DEVANAGARI_INITIAL_CONTEXT + 'ए', 'ای'),
+]
+devanagari_initial_e_patcher = RegexRuleTranslator(DEVANAGARI_INITIAL_E_RULES, window=(1, 1))
+# Bari ye can be only in final position
+DEVANAGARI_MEDIAL_BARI_YE_RULES = [
+    ('े' + DEVANAGARI_CHARS_REGEX, lambda text: 'ी' + text[1:]),
+]
+devanagari_medial_bari_ye_fixer = RegexRuleTranslator(DEVANAGARI_MEDIAL_BARI_YE_RULES, window=(0, 2))
+
+@char_local
+def drop_devanagari_virama(text):
+    return text.replace('्', '')
+
+DEVANAGARI_MEDIAL_VOWELS_MAP = {
+    'य': 'ी',
+    'व': 'ो',
+    'यं': 'ीं',
+    'वं': 'ों',
+}
+
+
+def load_arabic_to_devanagari_maps(data_dir, consonants_map_files):
+    '''
+    Returns the (read-only) maps of the Arabic to Devanagari translators, by attribute name,
+    from the shared map files and `consonants_map_files` of `data_dir`.
+    '''
+    initial_arabic_to_devanagari_map = {}
+    final_arabic_to_devanagari_map = {}
+    arabic_to_devanagari_map_pass1 = {}
+    arabic_to_devanagari_map_pass2 = {}
+    arabic_to_devanagari_cleanup_pass = {}  # To handle chars at erraneous/unconventional places
+    hamza_to_devanagari_map = {}
+    hamza_combo_to_devanagari_map = {}
+
+    for map_file in MISC_MAP_FILES:
+        for arabic_letter, roman_letter, devanagari_letter, *_ in load_table(data_dir, map_file):
+            arabic_to_devanagari_map_pass1[arabic_letter] = devanagari_letter
+
+    for map_file in INITIAL_MAP_FILES:
+        for arabic_letter, roman_letter, devanagari_letter, *_ in load_table(data_dir, map_file):
+            initial_arabic_to_devanagari_map[arabic_letter] = devanagari_letter
+            arabic_to_devanagari_cleanup_pass[arabic_letter] = devanagari_letter
+    
+    for map_file in FINAL_MAP_FILES:
+        for arabic_letter, roman_letter, devanagari_letter, *_ in load_table(data_dir, map_file):
+            final_arabic_to_devanagari_map[arabic_letter] = devanagari_letter
+            arabic_to_devanagari_cleanup_pass[arabic_letter] = devanagari_letter # Sometimes, Devanagari vowel-marks doesn't work without this
+    
+    for map_file in ARABIC_MAP_FILES:
+        for arabic_letter, roman_letter, devanagari_letter, *_ in load_table(data_dir, map_file):
+            arabic_to_devanagari_cleanup_pass[arabic_letter] = devanagari_letter
+    
+    for map_file in HAMZA_FILES:
+        for arabic_letter, roman_letter, devanagari_letter, *_ in load_table(data_dir, map_file):
+            hamza_to_devanagari_map[arabic_letter] = devanagari_letter
+    
+    for map_file in HAMZA_COMBO_FILES:
+        for arabic_letter, roman_letter, devanagari_letter, *_ in load_table(data_dir, map_file):
+            hamza_combo_to_devanagari_map[arabic_letter] = devanagari_letter
+
+    for map_file in MAIN_MAP_FILES:
+        for arabic_letter, roman_letter, devanagari_letter, *_ in load_table(data_dir, map_file):
+            arabic_to_devanagari_map_pass2[arabic_letter] = devanagari_letter
+    
+    consonants = []
+    for map_file in consonants_map_files:
+        for arabic_letter, roman_letter, devanagari_letter, *_ in load_table(data_dir, map_file):
+            arabic_to_devanagari_map_pass2[arabic_letter] = devanagari_letter
+
+            # Non-initial forms: Consonant+ا to Consonant+ा
+            arabic_to_devanagari_map_pass2[arabic_letter+'ا'] = devanagari_letter+'ा'
+            if arabic_letter not in {'ی', 'و', 'ھ'}:
+                consonants.append((arabic_letter, roman_letter, devanagari_letter))
+
+            arabic_shadda, devanagari_shadda = arabic_letter+" ّ".strip(), devanagari_letter+'्'+devanagari_letter
+            arabic_to_devanagari_map_pass1[arabic_shadda] = devanagari_shadda
+            arabic_to_devanagari_map_pass1[arabic_shadda+'ا'] = devanagari_shadda+'ा'
+
+    maps = {
+        'initial_arabic_to_devanagari_map': initial_arabic_to_devanagari_map,
+        'final_arabic_to_devanagari_map': final_arabic_to_devanagari_map,
+        'arabic_to_devanagari_map_pass1': arabic_to_devanagari_map_pass1,
+        'arabic_to_devanagari_map_pass2': arabic_to_devanagari_map_pass2,
+        'arabic_to_devanagari_cleanup_pass': arabic_to_devanagari_cleanup_pass,
+        'hamza_to_devanagari_map': hamza_to_devanagari_map,
+        'hamza_combo_to_devanagari_map': hamza_combo_to_devanagari_map,
+    }
+    maps = {name: MappingProxyType(table) for name, table in maps.items()}
+    # Assume medial ی as ी and و as ो (only between 2 consonants)
+    maps['devanagari_consonants'] = tuple(devanagari_letter for arabic_letter, roman_letter, devanagari_letter in consonants)
+    return maps
+
 
 class BaseIndoArabicTransliterator:
     '''
     Common processing for all supported Indo-Pakistani languages (except Kashmiri)
+
+    The tables and translators are shared by all the instances (and subclasses) of the process
+    (see str_mapper.get_translator()), so they are never modified: subclasses declare changes instead.
     '''
+    # Entries of the reverse (Devanagari to Arabic) maps replaced by subclasses, for letters with several Arabic forms
+    pass1_reverse_overrides = {}
+    pass2_reverse_overrides = {}
+
+    # Conversions which a subclass can be built for alone (see get_directions()), as direction -> attributes only it uses
+    DIRECTION_ATTRIBUTES = {}
+
     def __init__(self, consonants_map_files, data_dir=os.path.dirname(__file__) + '/data/'):
         self.data_dir = data_dir
-        self.initial_arabic_to_devanagari_map = {}
-        self.final_arabic_to_devanagari_map = {}
-        self.arabic_to_devanagari_map_pass1 = {}
-        self.arabic_to_devanagari_map_pass2 = {}
-        self.arabic_to_devanagari_cleanup_pass = {}  # To handle chars at erraneous/unconventional places
-        self.hamza_to_devanagari_map = {}
-        self.hamza_combo_to_devanagari_map = {}
-        self.devanagari_postprocess_map = {}
-
-        for map_file in MISC_MAP_FILES:
-            df = pd.read_csv(data_dir+map_file, header=None)
-            for i in df.columns:
-                arabic_letter, roman_letter, devanagari_letter = str(df[i][0]).strip(), str(df[i][1]).strip(), str(df[i][2]).strip()
-                self.arabic_to_devanagari_map_pass1[arabic_letter] = devanagari_letter
-
-        for map_file in INITIAL_MAP_FILES:
-            df = pd.read_csv(data_dir+map_file, header=None)
-            for i in df.columns:
-                arabic_letter, roman_letter, devanagari_letter = str(df[i][0]).strip(), str(df[i][1]).strip(), str(df[i][2]).strip()
-                self.initial_arabic_to_devanagari_map[arabic_letter] = devanagari_letter
-                self.arabic_to_devanagari_cleanup_pass[arabic_letter] = devanagari_letter
-        
-        for map_file in FINAL_MAP_FILES:
-            df = pd.read_csv(data_dir+map_file, header=None)
-            for i in df.columns:
-                arabic_letter, roman_letter, devanagari_letter = str(df[i][0]).strip(), str(df[i][1]).strip(), str(df[i][2]).strip()
-                self.final_arabic_to_devanagari_map[arabic_letter] = devanagari_letter
-                self.arabic_to_devanagari_cleanup_pass[arabic_letter] = devanagari_letter # Sometimes, Devanagari vowel-marks doesn't work without this
-        
-        for map_file in ARABIC_MAP_FILES:
-            df = pd.read_csv(data_dir+map_file, header=None)
-            for i in df.columns:
-                arabic_letter, roman_letter, devanagari_letter = str(df[i][0]).strip(), str(df[i][1]).strip(), str(df[i][2]).strip()
-                self.arabic_to_devanagari_cleanup_pass[arabic_letter] = devanagari_letter
-        
-        for map_file in HAMZA_FILES:
-            df = pd.read_csv(data_dir+map_file, header=None)
-            for i in df.columns:
-                arabic_letter, roman_letter, devanagari_letter = str(df[i][0]).strip(), str(df[i][1]).strip(), str(df[i][2]).strip()
-                self.hamza_to_devanagari_map[arabic_letter] = devanagari_letter
-        
-        for map_file in HAMZA_COMBO_FILES:
-            df = pd.read_csv(data_dir+map_file, header=None)
-            for i in df.columns:
-                arabic_letter, roman_letter, devanagari_letter = str(df[i][0]).strip(), str(df[i][1]).strip(), str(df[i][2]).strip()
-                self.hamza_combo_to_devanagari_map[arabic_letter] = devanagari_letter
-
-        for map_file in MAIN_MAP_FILES:
-            df = pd.read_csv(data_dir+map_file, header=None)
-            for i in df.columns:
-                arabic_letter, roman_letter, devanagari_letter = str(df[i][0]).strip(), str(df[i][1]).strip(), str(df[i][2]).strip()
-                self.arabic_to_devanagari_map_pass2[arabic_letter] = devanagari_letter
-        
-        consonants = []
-        for map_file in consonants_map_files:
-            df = pd.read_csv(data_dir+map_file, header=None)
-            for i in df.columns:
-                arabic_letter, roman_letter, devanagari_letter = str(df[i][0]).strip(), str(df[i][1]).strip(), str(df[i][2]).strip()
-                self.arabic_to_devanagari_map_pass2[arabic_letter] = devanagari_letter
-
-                # Non-initial forms: Consonant+ا to Consonant+ा
-                self.arabic_to_devanagari_map_pass2[arabic_letter+'ا'] = devanagari_letter+'ा'
-                if arabic_letter not in {'ی', 'و', 'ھ'}:
-                    consonants.append((arabic_letter, roman_letter, devanagari_letter))
-
-                arabic_shadda, devanagari_shadda = arabic_letter+" ّ".strip(), devanagari_letter+'्'+devanagari_letter
-                self.arabic_to_devanagari_map_pass1[arabic_shadda] = devanagari_shadda
-                self.arabic_to_devanagari_map_pass1[arabic_shadda+'ا'] = devanagari_shadda+'ा'
-
-        # Assume medial ی as ी and و as ो
-        for i in range(len(consonants)):
-            arabic_letter_i, roman_letter_i, devanagari_letter_i = consonants[i]
-            for j in range(len(consonants)):
-                arabic_letter_j, roman_letter_j, devanagari_letter_j = consonants[j]
-                self.devanagari_postprocess_map[devanagari_letter_i+'य'+devanagari_letter_j] = devanagari_letter_i+'ी'+devanagari_letter_j
-                self.devanagari_postprocess_map[devanagari_letter_i+'व'+devanagari_letter_j] = devanagari_letter_i+'ो'+devanagari_letter_j
-                self.devanagari_postprocess_map[devanagari_letter_i+'यं'+devanagari_letter_j] = devanagari_letter_i+'ीं'+devanagari_letter_j
-                self.devanagari_postprocess_map[devanagari_letter_i+'वं'+devanagari_letter_j] = devanagari_letter_i+'ों'+devanagari_letter_j
-
-        self.initial_arabic_to_devanagari_converter = StringTranslator(self.initial_arabic_to_devanagari_map, match_initial_only=True)
-        self.final_arabic_to_devanagari_converter = StringTranslator(self.final_arabic_to_devanagari_map, match_final_only=True)
-        self.arabic_to_devanagari_converter_pass1 = StringTranslator(self.arabic_to_devanagari_map_pass1)
-        self.arabic_to_devanagari_converter_pass2 = StringTranslator(self.arabic_to_devanagari_map_pass2)
-        self.arabic_to_devanagari_final_cleanup = StringTranslator(self.arabic_to_devanagari_cleanup_pass)
-        self.hamza_to_devanagari_converter = StringTranslator(self.hamza_to_devanagari_map)
-        self.hamza_combo_to_devanagari_converter = StringTranslator(self.hamza_combo_to_devanagari_map)
-        self.devanagari_postprocessor = StringTranslator(self.devanagari_postprocess_map)
+        maps = get_shared(('arabic_to_devanagari_maps', data_dir, tuple(consonants_map_files)),
+                          lambda: load_arabic_to_devanagari_maps(data_dir, consonants_map_files))
+        self.initial_arabic_to_devanagari_map = maps['initial_arabic_to_devanagari_map']
+        self.final_arabic_to_devanagari_map = maps['final_arabic_to_devanagari_map']
+        self.arabic_to_devanagari_map_pass1 = maps['arabic_to_devanagari_map_pass1']
+        self.arabic_to_devanagari_map_pass2 = maps['arabic_to_devanagari_map_pass2']
+        self.arabic_to_devanagari_cleanup_pass = maps['arabic_to_devanagari_cleanup_pass']
+        self.hamza_to_devanagari_map = maps['hamza_to_devanagari_map']
+        self.hamza_combo_to_devanagari_map = maps['hamza_combo_to_devanagari_map']
+        self.devanagari_consonants = maps['devanagari_consonants']
 
-        from indicnlp.normalize.indic_normalize import DevanagariNormalizer
-        self.devanagari_normalizer = DevanagariNormalizer()
-    
-    def arabic_normalize(self, text):
-        text = remove_diacritics(text) # Drops short-vowels
-        text = normalize_combine_characters(normalize_characters(text))
-        text = text.replace(',', '،').replace('?', '؟').replace('؛', ';').replace('؍', '/').replace('٪', '%')
+        self.initial_arabic_to_devanagari_converter = get_translator(StringTranslator, self.initial_arabic_to_devanagari_map, match_initial_only=True)
+        self.final_arabic_to_devanagari_converter = get_translator(StringTranslator, self.final_arabic_to_devanagari_map, match_final_only=True)
+        self.arabic_to_devanagari_converter_pass1 = get_translator(StringTranslator, self.arabic_to_devanagari_map_pass1, reverse_overrides=self.pass1_reverse_overrides)
+        self.arabic_to_devanagari_converter_pass2 = get_translator(StringTranslator, self.arabic_to_devanagari_map_pass2, reverse_overrides=self.pass2_reverse_overrides)
+        self.arabic_to_devanagari_final_cleanup = get_translator(StringTranslator, self.arabic_to_devanagari_cleanup_pass)
+        self.hamza_to_devanagari_converter = get_translator(StringTranslator, self.hamza_to_devanagari_map)
+        self.hamza_combo_to_devanagari_converter = get_translator(StringTranslator, self.hamza_combo_to_devanagari_map)
+        self.devanagari_postprocessor = get_translator(ContextRuleTranslator, self.devanagari_consonants, DEVANAGARI_MEDIAL_VOWELS_MAP)
+        self.devanagari_initial_e_patcher = devanagari_initial_e_patcher
+        self.devanagari_medial_bari_ye_fixer = devanagari_medial_bari_ye_fixer
+
+        self.devanagari_normalizer = get_translator(DevanagariNormalizer)
+        self.stages_cache = {}
 
-        # Improper hamzas
-        text = text.replace("اے", "ائے")
-        text = re.sub("(\B)یے", r"\1ئے", text)
+    def get_directions(self, directions=None, direction_attributes=None):
+        '''
+        Returns the directions (keys of `direction_attributes`, by default DIRECTION_ATTRIBUTES)
+        a converter is built for: `directions`, or all of them.
+        '''
+        direction_attributes = self.DIRECTION_ATTRIBUTES if direction_attributes is None else direction_attributes
+        if directions is None:
+            return frozenset(direction_attributes)
+        directions = frozenset(directions)
+        unknown = directions - set(direction_attributes)
+        if unknown:
+            raise ValueError(f"Unknown directions {sorted(unknown)} for {type(self).__name__}, expected some of {sorted(direction_attributes)}")
+        return directions
 
-        # If word starts with hamza, mostly an spacing error. Remove space
-        text = re.sub('\s([ۓؤئ])', '\\1', text)
+    def __getattr__(self, name):
+        # Only reached for missing attributes, like those of the directions the converter was not built for
+        for direction, attributes in type(self).DIRECTION_ATTRIBUTES.items():
+            if name in attributes:
+                raise ValueError(f"{type(self).__name__} was not built for {direction} conversions")
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def apply_stages(self, stages_method, text, *args):
+        '''
+        Runs on `text` the stages returned by the method named `stages_method` (called with `args` once).
+        '''
+        key = (stages_method, args)
+        stages = self.stages_cache.get(key)
+        if stages is None:
+            stages = self.stages_cache[key] = getattr(self, stages_method)(*args)
+        for stage in stages:
+            text = stage(text)
         return text
     
-    def devanagari_normalize(self, text, abjadify_initial_vowels=True, drop_virama=False):
-        text = self.devanagari_normalizer.normalize(text)
+    # The normalizations are lists of stages (callables), so that they can also be streamed
+    # as part of a TranslatorPipeline (see str_mapper.get_stage_stream())
+    def get_arabic_normalize_stages(self):
+        return [arabic_normalizer.normalize, arabic_hamza_fixer.translate]
+
+    @profiled
+    def arabic_normalize(self, text):
+        return self.apply_stages('get_arabic_normalize_stages', text)
+
+    def get_devanagari_normalize_stages(self, abjadify_initial_vowels=True, drop_virama=False):
+        stages = [self.devanagari_normalizer.normalize]
         if abjadify_initial_vowels:
-            text = devanagari_initial_vowels_abjadify(text)
+            stages.append(devanagari_initial_vowels_abjadifier.translate)
         if drop_virama:
-            text = text.replace('्', '')
+            stages.append(drop_devanagari_virama)
+        return stages + [
+            abjadify_devanagari_non_initial_vowels,
+            self.devanagari_postprocessor.reverse_translate,
+            self.devanagari_postprocessor.reverse_translate,
+            devanagari_preprocessor.translate,
+        ]
+
+    @profiled
+    def devanagari_normalize(self, text, abjadify_initial_vowels=True, drop_virama=False):
+        return self.apply_stages('get_devanagari_normalize_stages', text, abjadify_initial_vowels, drop_virama)
+
+    def get_devanagari_remove_short_vowels_stages(self):
+        return [remove_devanagari_short_vowels, self.devanagari_medial_bari_ye_fixer.translate]
 
-        text = text.translate(devanagari_non_initial_vowels_abjadifier)
-        text = self.devanagari_postprocessor.reverse_translate(text)
-        text = self.devanagari_postprocessor.reverse_translate(text)
-        text = devanagari_preprocessor.translate(text)
-        return text
-    
     def devanagari_remove_short_vowels(self, text):
-        text = text.translate(devanagari_short_vowels_remover)
-        text = re.sub("े([\u0900-\u0963\u0972-\u097f])", "ी\\1", text) # bari ye can be only in final position
-        return text
+        return self.apply_stages('get_devanagari_remove_short_vowels_stages', text)
 
+    @profiled
     def devanagari_nativize(self, text):
         return devanagari_nuqta_consonants_simplifier.translate(text)
 
@@ -166,10 +260,7 @@ class GujaratiIndoArabicTransliterator(BaseIndoArabicTransliterator):
             data_dir=data_dir
         )
         # Load Gujarati-specific post-processing mappings
-        gujarati_postprocess_map_file = os.path.join(data_dir, 'gujarati/postprocess.csv')
-        df = pd.read_csv(gujarati_postprocess_map_file, header=None)
-        for i in df.columns:
-            src, tgt = str(df[i][0]).strip(), str(df[i][1]).strip()
+        for src, tgt, *_ in load_table(data_dir, 'gujarati/postprocess.csv'):
             self.devanagari_postprocess_map[src] = tgt
         self.devanagari_postprocessor = StringTranslator(self.devanagari_postprocess_map)
 
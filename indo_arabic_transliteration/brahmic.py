@@ -0,0 +1,232 @@
+'''
+Built-in conversions between Devanagari and Gurmukhi / Gujarati, with the same output as aksharamukha's
+`process(source_script, target_script, text)` (with its default options, at AKSHARAMUKHA_VERSION), used
+by the Punjabi and Gujarati converters instead of aksharamukha's generic (and much slower) pipeline.
+
+The Unicode blocks of these scripts are laid out in parallel, so most letters convert by adding a
+fixed offset to their code point: each conversion is precomputed into one str.translate() table,
+with the few letters aksharamukha spells otherwise (nukta forms, vowels missing from Gurmukhi...),
+plus a regex for the multi-char spellings and aksharamukha's contextual rules of the scripts
+(Gurmukhi addak and tippi...), each only run on the texts having the char it rewrites.
+Their output is identical to aksharamukha's (checked with benchmarks/validate_brahmic.py, which
+needs it installed, and tests/test_brahmic.py), for any text except one with aksharamukha's own
+notation marks (ʽ, ˂, ¹...).
+'''
+import re
+
+from .str_mapper import get_keys_regex_str
+
+AKSHARAMUKHA_VERSION = '2.3'
+
+BLOCK_OFFSETS = {'Gurmukhi': 0x100, 'Gujarati': 0x180}
+
+# Devanagari code points (first, last) of the letters and signs found at the same place in the other block
+SHARED_RANGES = {
+    'Gurmukhi': [
+        (0x0901, 0x0903), (0x0905, 0x090a), (0x090f, 0x0910), (0x0913, 0x0928), (0x092a, 0x0930),
+        (0x0932, 0x0933), (0x0935, 0x0936), (0x0938, 0x0939), (0x093c, 0x093c), (0x093e, 0x0942),
+        (0x0947, 0x0948), (0x094b, 0x094d), (0x0959, 0x095c), (0x095e, 0x095e), (0x0966, 0x096f),
+    ],
+    'Gujarati': [
+        (0x0901, 0x0903), (0x0905, 0x090d), (0x090f, 0x0911), (0x0913, 0x0928), (0x092a, 0x0930),
+        (0x0932, 0x0933), (0x0935, 0x0939), (0x093c, 0x0945), (0x0947, 0x0949), (0x094b, 0x094d),
+        (0x0960, 0x0963), (0x0966, 0x096f),
+    ],
+}
+
+# aksharamukha's spellings of the other Devanagari letters (its marks ʼ ˘ ˇ are removed at the very end)
+LETTERS = {
+    'Gurmukhi': {
+        'ऋ': 'ਰੁʼ', 'ॠ': 'ਰੂʼ', 'ऌ': 'ਲੁʼ', 'ॡ': 'ਲੂʼ', 'ऍ': 'ਏʼ', 'ऎ': 'ਏ˘', 'ऑ': 'ਆʼ', 'ऒ': 'ਓ˘', 'एॕ': 'ਏˇ',
+        'ृ': '੍ਰੁʼ', 'ॄ': '੍ਰੂʼ', 'ॢ': '੍ਲੁʼ', 'ॣ': '੍ਲੂʼ', 'ॅ': 'ੇʼ', 'ॆ': 'ੇ˘', 'ॉ': 'ਾʼ', 'ॊ': 'ੋ˘', 'ॕ': 'ੇˇ',
+        'ॶ': 'ਉʼ', 'ॷ': 'ਊʼ', 'ॳ': 'ਆʼʼ', 'ॴ': 'ਆʼʼʼ', 'ॖ': 'ੁʼ', 'ॗ': 'ੂʼ', 'ऺ': 'ਾʼʼ', 'ऻ': 'ਾʼʼʼ',
+        'ऩ': 'ਨ\u0a3c', 'ऱ': 'ਰ\u0a3c', 'ऴ': '\u0a33\u0a3c', 'ष': '\u0a36\u0a3c',
+        '\u0958': 'ਕ\u0a3c', '\u095d': 'ੜ੍ਹ', '\u095f': 'ਯ\u0a3c',
+        'ऽ': '(ਅ)', 'ॐ': 'ੴ',
+    },
+    'Gujarati': {
+        'ऎ': 'એ˘', 'ऒ': 'ઓ˘', 'एॕ': 'ઍˇ', 'ॆ': 'ે˘', 'ॊ': 'ો˘', 'ॕ': 'ૅˇ',
+        'ॶ': 'ઉʼ', 'ॷ': 'ઊʼ', 'ॳ': 'આʼʼ', 'ॴ': 'આʼʼʼ', 'ॖ': 'ુʼ', 'ॗ': 'ૂʼ', 'ऺ': 'ાʼʼ', 'ऻ': 'ાʼʼʼ',
+        'ऩ': 'ન\u0abc', 'ऱ': 'ર\u0abc', 'ऴ': 'ળ\u0abc',
+        '\u0958': 'ક\u0abc', '\u0959': 'ખ\u0abc', '\u095a': 'ગ\u0abc', '\u095b': 'જ\u0abc',
+        '\u095c': 'ડ\u0abc', '\u095d': 'ઢ\u0abc', '\u095e': 'ફ\u0abc', '\u095f': 'ય\u0abc',
+        'ॐ': 'ૐ',
+    },
+}
+
+# Rewritten by aksharamukha in any input, before converting it
+INPUT_NORMALIZATION_MAP = {
+    'क\u093c': '\u0958', 'ख\u093c': '\u0959', 'ग\u093c': '\u095a', 'ज\u093c': '\u095b',
+    'ड\u093c': '\u095c', 'ढ\u093c': '\u095d', 'फ\u093c': '\u095e', 'य\u093c': '\u095f',
+    'ਲ\u0a3c': '\u0a33', 'ਸ\u0a3c': '\u0a36', 'ਖ\u0a3c': '\u0a59', 'ਗ\u0a3c': '\u0a5a', 'ਜ\u0a3c': '\u0a5b', 'ਫ\u0a3c': '\u0a5e',
+    '।।': '॥',
+    'ॲ': 'ऍ',
+    '↓': '॒', '↑↑': '᳚', '↑': '॑',
+}
+INPUT_NORMALIZATION_REGEX = re.compile(get_keys_regex_str(INPUT_NORMALIZATION_MAP))
+JOINERS_REMOVER = str.maketrans(dict.fromkeys('\u200c\u200d'))
+
+# Devanagari letters spelled with others (and marks) before converting them
+DEVANAGARI_SOURCE_SPELLINGS = {
+    'ॎे': 'ै', 'ॎो': 'ौ', 'ॎा': 'ो', 'ॎ': 'े',
+    'ॽ': 'ʔ', 'ॹ': '\u095b\u093c', 'ॻ': 'ˍग', 'ॼ': 'ˍज', 'ॾ': 'ˍड', 'ॿ': 'ˍब',
+}
+GUJARATI_SOURCE_SPELLINGS = {
+    'ૹ': 'જ\u0abc\u0abc',
+    # Full stops are read as dandas
+    '..': '॥', '.': '।',
+}
+
+# aksharamukha's lists of consonants and vowels of Devanagari (converted char by char for the other scripts)
+DEVANAGARI_CONSONANTS = [
+    *'कखगघङचछजझञटठडढणतथदधनपफबभमयरलवशषसह', 'त\u093c', *'ळऴऱऩ', *'\u0958\u0959\u095a\u095b\u095c\u095d\u095e\u095f',
+    'ँˆग', 'ँˆज', 'ँˆड', 'ँˆद', 'ँˆब',
+]
+DEVANAGARI_VOWELS = [*'अआइईउऊऋॠऌॡएऐओऔॶॷॳॴऎऒऍऑ', 'एॕ']
+# Indexes of the consonants doubled with Gurmukhi addak, and of the aspirated ones (doubling the unaspirated one before)
+GEMINATING_CONSONANTS = [0, 2, 5, 7, 10, 12, 15, 17, 20, 22, 4, 9, 14, 19, 24, *range(25, 33), *range(34, 46)]
+ASPIRATED_CONSONANTS = [1, 3, 6, 8, 11, 13, 16, 18, 21, 23]
+
+GURMUKHI_ADDAK = '\u0a71'
+GURMUKHI_TIPPI = '\u0a70'
+GURMUKHI_BINDI = '\u0a02'
+GURMUKHI_VIRAMA = '\u0a4d'
+VEDIC_ACCENTS = '॒᳚॑'
+
+# Removed from aksharamukha's output (whether from its spellings or from the input), or replaced
+MARKS_REMOVER = str.maketrans({**dict.fromkeys('ʼˇˆ˘·\u02bd\u034f'), '│': '।', '┃': '॥', '●': '.'})
+
+def get_regex_alternation(strings):
+    return '|'.join(map(re.escape, strings))
+
+def spell_in_script(strings, letters):
+    '''
+    Converts each Devanagari string of `strings` with `letters` (Devanagari -> script), longest letters first.
+    '''
+    regex = re.compile(get_keys_regex_str(letters))
+    return [regex.sub(lambda match: letters[match.group(0)], string) for string in strings]
+
+def get_devanagari_letters(script):
+    '''
+    Returns aksharamukha's conversion of every Devanagari letter to `script`, as Devanagari -> `script`.
+    '''
+    offset = BLOCK_OFFSETS[script]
+    letters = {chr(code): chr(code + offset) for first, last in SHARED_RANGES[script] for code in range(first, last+1)}
+    letters.update(LETTERS[script])
+    return letters
+
+class BrahmicTranslator:
+    '''
+    Same output as aksharamukha's `process(source_script, target_script, text)`, from Devanagari
+    to Gurmukhi or Gujarati, or back.
+    '''
+    def __init__(self, source_script, target_script):
+        if source_script == 'Devanagari' and target_script in BLOCK_OFFSETS:
+            letters = get_devanagari_letters(target_script)
+            spellings = DEVANAGARI_SOURCE_SPELLINGS
+        elif target_script == 'Devanagari' and source_script in BLOCK_OFFSETS:
+            letters = {value: key for key, value in get_devanagari_letters(source_script).items()}
+            spellings = GUJARATI_SOURCE_SPELLINGS if source_script == 'Gujarati' else {}
+        else:
+            raise ValueError(f"Unsupported conversion from {source_script} to {target_script}")
+        self.source_script = source_script
+        self.target_script = target_script
+
+        # Multi-char spellings are matched first, then the rest is converted char by char
+        self.letters_table = str.maketrans({key: value for key, value in letters.items() if len(key) == 1})
+        self.multi_letters = {key: value for key, value in letters.items() if len(key) > 1}
+        self.multi_letters_regex = re.compile(get_keys_regex_str(self.multi_letters))
+        for key, value in spellings.items():
+            value = self.convert_letters(value)
+            if len(key) > 1:
+                self.multi_letters[key] = value
+            else:
+                self.letters_table[ord(key)] = value
+        self.multi_letters_regex = re.compile(get_keys_regex_str(self.multi_letters))
+
+        self.source_rules = getattr(self, f'get_{source_script.lower()}_source_rules')()
+        self.target_rules = getattr(self, f'get_{target_script.lower()}_target_rules')()
+
+    def convert_letters(self, text):
+        return self.multi_letters_regex.sub(lambda match: self.multi_letters[match.group(0)], text).translate(self.letters_table)
+
+    def get_devanagari_source_rules(self):
+        # The schwa accent is dropped
+        return [('\u0954', re.compile('\u0954'), '')]
+
+    def get_gujarati_source_rules(self):
+        return []
+
+    def get_gurmukhi_source_rules(self):
+        consonants = spell_in_script(DEVANAGARI_CONSONANTS, get_devanagari_letters('Gurmukhi'))
+        aspirated = {consonants[aspirated]: consonants[GEMINATING_CONSONANTS[i]] + GURMUKHI_VIRAMA + consonants[aspirated] for i, aspirated in enumerate(ASPIRATED_CONSONANTS)}
+        # Tippi is read as bindi, except for a doubled n/m
+        self.letters_table[ord(GURMUKHI_TIPPI)] = self.letters_table[ord(GURMUKHI_BINDI)]
+        return [
+            # ASCII digits are read as native ones, except after h (a rule with no char runs on any text)
+            (None, re.compile('(?<!h)[0-9]'), lambda match: chr(ord(match.group(0)) - ord('0') + 0x0a66)),
+            ('(', re.compile(re.escape('(ਆ)')), '(ਅ)(ਅ)'),
+            (GURMUKHI_ADDAK, re.compile(GURMUKHI_ADDAK + '\u0a36\u0a3c'), '\u0a36\u0a3c' + GURMUKHI_VIRAMA + '\u0a36\u0a3c'),
+            (GURMUKHI_ADDAK, re.compile('%s(%s)' % (GURMUKHI_ADDAK, get_regex_alternation(consonants[i] for i in GEMINATING_CONSONANTS))), '\\1' + GURMUKHI_VIRAMA + '\\1'),
+            (GURMUKHI_ADDAK, re.compile('%s(%s)' % (GURMUKHI_ADDAK, get_regex_alternation(aspirated))), lambda match: aspirated[match.group(1)]),
+            (GURMUKHI_TIPPI, re.compile(GURMUKHI_TIPPI + '([ਨਮ])'), '\\1' + GURMUKHI_VIRAMA + '\\1'),
+            ('ੵ', re.compile('ੵ'), GURMUKHI_VIRAMA + 'ਯ'),
+        ]
+
+    def get_gurmukhi_target_rules(self):
+        letters = get_devanagari_letters('Gurmukhi')
+        consonants = spell_in_script(DEVANAGARI_CONSONANTS, letters)
+        vowels = spell_in_script(DEVANAGARI_VOWELS, letters)
+        aspirated = {consonants[GEMINATING_CONSONANTS[i]] + GURMUKHI_VIRAMA + consonants[aspirated]: GURMUKHI_ADDAK + consonants[aspirated] for i, aspirated in enumerate(ASPIRATED_CONSONANTS)}
+        tippi_bearers = consonants + [vowels[i] for i in [0, 2, 4]] + ['ਿ', 'ੁ', 'ੂ']
+        # Native digits are written with ASCII ones, and candrabindu with bindi
+        for code in range(0x0966, 0x0970):
+            self.letters_table[code] = self.letters_table[code + 0x100] = chr(code - 0x0966 + ord('0'))
+        self.letters_table[0x0901] = self.letters_table[0x0a01] = GURMUKHI_BINDI
+        return [
+            ('_', re.compile(GURMUKHI_VIRAMA + '_'), GURMUKHI_VIRAMA),
+            ('(', re.compile(re.escape('(ਅ)(ਅ)')), '(ਆ)'),
+            (GURMUKHI_VIRAMA, re.compile('(%s)%s\\1' % (get_regex_alternation(consonants[i] for i in GEMINATING_CONSONANTS), GURMUKHI_VIRAMA)), GURMUKHI_ADDAK + '\\1'),
+            (GURMUKHI_VIRAMA, re.compile(get_regex_alternation(aspirated)), lambda match: aspirated[match.group(0)]),
+            (GURMUKHI_ADDAK, re.compile('([%s])%s(.)' % (VEDIC_ACCENTS, GURMUKHI_ADDAK)), '\\1\\2' + GURMUKHI_VIRAMA + '\\2'),
+            (GURMUKHI_BINDI, re.compile('(ੂ)%s(?!%s)' % (GURMUKHI_BINDI, get_regex_alternation(consonants + vowels))), '\\1' + GURMUKHI_TIPPI),
+            (GURMUKHI_BINDI, re.compile('(%s)%s' % (get_regex_alternation(tippi_bearers), GURMUKHI_BINDI)), '\\1' + GURMUKHI_TIPPI),
+            # Doubled n/m are written with tippi
+            (GURMUKHI_ADDAK, re.compile(GURMUKHI_ADDAK + '([ਨਮ])'), GURMUKHI_TIPPI + '\\1'),
+        ]
+
+    def get_gujarati_target_rules(self):
+        # Dandas are written with full stops
+        self.letters_table[ord('।')] = '.'
+        self.letters_table[ord('॥')] = '..'
+        return [
+            ('_', re.compile('\u0acd_'), '\u0acd'),
+            ('\u0abc', re.compile('જ\u0abc\u0abc|શ\u0abc'), 'ૹ'),
+        ]
+
+    def get_devanagari_target_rules(self):
+        consonants = get_regex_alternation(DEVANAGARI_CONSONANTS)
+        sindhi_letters = {'ग': 'ॻ', 'ज': 'ॼ', 'ड': 'ॾ', 'ब': 'ॿ'}
+        self.letters_table[ord('ʔ')] = 'ॽ'
+        return [
+            ('_', re.compile('\u094d_'), '\u094d'),
+            ('ˍ', re.compile('ˍ([%s])' % ''.join(sindhi_letters)), lambda match: sindhi_letters[match.group(1)]),
+            ('\u093c', re.compile('\u095b\u093c|श\u093c'), 'ॹ'),
+            # ZWNJ stops a conjunct with rra, except with ya or ha
+            ('ऱ', re.compile('ऱ\u094d(?![यह])'), 'ऱ\u094d\u200c'),
+            ('ʼ', re.compile('(%s)ʼ' % consonants), '\\1\u093a'),
+            ('ʼ', re.compile('\u093eʼ'), '\u093b'),
+        ]
+
+    def translate(self, text):
+        text = INPUT_NORMALIZATION_REGEX.sub(lambda match: INPUT_NORMALIZATION_MAP[match.group(0)], text)
+        if '\u200c' in text or '\u200d' in text:
+            text = text.translate(JOINERS_REMOVER)
+        for char, regex, replacement in self.source_rules:
+            if char is None or char in text:
+                text = regex.sub(replacement, text)
+        text = self.convert_letters(text)
+        for char, regex, replacement in self.target_rules:
+            if char in text:
+                text = regex.sub(replacement, text)
+        return text.translate(MARKS_REMOVER)
@@ -0,0 +1,124 @@
+'''
+Command-line interface for rule-based script conversion:
+
+    indo-xlit -f ur-PK -t hi-IN in.txt > out.txt
+    indo-xlit -f hi-IN -t ur-PK --workers 8 corpus.txt.gz -o corpus.ur.txt.gz
+
+Input is streamed line by line (each line is converted on its own), so memory use stays
+bounded regardless of the input size. With `--stream`, each input is instead converted as
+a single text (so rules may apply across line breaks), read in chunks with constant memory.
+Files ending with `.gz` (and gzipped stdin) are (de)compressed on the fly.
+'''
+import argparse
+import gzip
+import io
+import sys
+import time
+from collections import deque
+
+from .mapper import DELEGATES, STREAM_DELEGATES, script_convert_batch, script_convert_parallel, script_convert_stream
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+def open_text(path, mode):
+    if path == '-':
+        stream = sys.stdin.buffer if mode == 'r' else sys.stdout.buffer
+        if mode == 'r' and stream.peek(2)[:2] == GZIP_MAGIC:
+            stream = gzip.GzipFile(fileobj=stream)
+        return io.TextIOWrapper(stream, encoding='utf-8', newline='')
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8', newline='')
+    return open(path, mode, encoding='utf-8', newline='')
+
+class ProgressReporter:
+    '''
+    Prints the number of lines/chars converted and the throughput on stderr, at most once per `interval` seconds.
+    '''
+    def __init__(self, enabled, interval=1.0):
+        self.enabled = enabled
+        self.interval = interval
+        self.start = self.last_report = time.perf_counter()
+        self.lines = self.chars = 0
+
+    def update(self, text, lines=1):
+        self.lines += lines
+        self.chars += len(text)
+        if self.enabled and time.perf_counter() - self.last_report >= self.interval:
+            self.report()
+
+    def report(self, end=''):
+        now = time.perf_counter()
+        self.last_report = now
+        elapsed = max(now - self.start, 1e-9)
+        sys.stderr.write(f'\r{self.lines} lines, {self.chars} chars, {self.lines/elapsed:.0f} lines/s, {self.chars/elapsed:.0f} chars/s' + end)
+        sys.stderr.flush()
+
+    def close(self):
+        if self.enabled:
+            self.report(end='\n')
+
+def iter_lines(paths, line_endings, progress):
+    for path in paths:
+        with open_text(path, 'r') as f:
+            for line in f:
+                text = line.rstrip('\r\n')
+                line_endings.append(line[len(text):])
+                progress.update(line)
+                yield text
+
+def iter_chunks(f, progress, chunk_size=65536):
+    for chunk in iter(lambda: f.read(chunk_size), ''):
+        progress.update(chunk, chunk.count('\n'))
+        yield chunk
+
+def get_parser():
+    supported_pairs = ', '.join(f'{from_script}->{to_script}' for from_script, to_script in DELEGATES)
+    parser = argparse.ArgumentParser(prog='indo-xlit', description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     epilog=f'Supported conversions: {supported_pairs}')
+    parser.add_argument('inputs', nargs='*', default=['-'], help="Input files ('-' for stdin, the default)")
+    parser.add_argument('-f', '--from', dest='from_script', required=True, help='Source script, e.g. ur-PK')
+    parser.add_argument('-t', '--to', dest='to_script', required=True, help='Target script, e.g. hi-IN')
+    parser.add_argument('-o', '--output', default='-', help="Output file ('-' for stdout, the default)")
+    parser.add_argument('--workers', type=int, default=1, help='Number of worker processes (default: 1, no pool)')
+    parser.add_argument('--batch-size', type=int, default=512, help='Number of lines converted together (default: 512)')
+    parser.add_argument('--stream', action='store_true', help='Convert each input as a single text, in chunks (not with --workers)')
+    progress = parser.add_mutually_exclusive_group()
+    progress.add_argument('--progress', dest='progress', action='store_true', default=None, help='Show progress on stderr (default: if stderr is a terminal)')
+    progress.add_argument('--no-progress', dest='progress', action='store_false')
+    return parser
+
+def main(argv=None):
+    args = get_parser().parse_args(argv)
+    if (args.from_script, args.to_script) not in DELEGATES:
+        sys.exit(f'indo-xlit: unsupported conversion from {args.from_script} to {args.to_script}')
+    if args.workers < 1 or args.batch_size < 1:
+        sys.exit('indo-xlit: --workers and --batch-size should be at least 1')
+    if args.stream and (args.from_script, args.to_script) not in STREAM_DELEGATES:
+        sys.exit(f'indo-xlit: --stream is not supported for conversion from {args.from_script} to {args.to_script}')
+    if args.stream and args.workers > 1:
+        sys.exit('indo-xlit: --stream cannot be used with --workers')
+
+    progress = ProgressReporter(sys.stderr.isatty() if args.progress is None else args.progress)
+    if args.stream:
+        with open_text(args.output, 'w') as out:
+            for path in args.inputs:
+                with open_text(path, 'r') as f:
+                    for output in script_convert_stream(iter_chunks(f, progress), args.from_script, args.to_script):
+                        out.write(output)
+        progress.close()
+        return
+
+    line_endings = deque()
+    lines = iter_lines(args.inputs, line_endings, progress)
+    if args.workers > 1:
+        outputs = script_convert_parallel(lines, args.from_script, args.to_script, workers=args.workers, chunksize=args.batch_size)
+    else:
+        outputs = script_convert_batch(lines, args.from_script, args.to_script, batch_size=args.batch_size)
+
+    with open_text(args.output, 'w') as out:
+        for output in outputs:
+            out.write(output + line_endings.popleft())
+    progress.close()
+
+if __name__ == '__main__':
+    main()
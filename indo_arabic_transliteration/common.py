@@ -1,10 +1,14 @@
-import re
-from .str_mapper import StringTranslator
+from .str_mapper import StringTranslator, RegexRuleTranslator, char_local, get_keys_regex_str
 
 # -----------------------------
 # Existing Preprocessing Mappings
 # -----------------------------
 
+# Letters and signs of the Devanagari block (excluding dandas, digits and abbreviation signs)
+DEVANAGARI_CHARS_REGEX = '[\u0900-\u0963\u0972-\u097f]'
+# Word-initial for Devanagari rules: not preceded by any of the above
+DEVANAGARI_INITIAL_CONTEXT = '(?<!%s)' % DEVANAGARI_CHARS_REGEX
+
 DEVANAGARI_PREPROCESS_MAP = {
     # Desanskritize
     'ँ': 'ं',
@@ -55,6 +59,10 @@ DEVANAGARI_SHORT_VOWELS_REMOVE_MAP = {
 }
 devanagari_short_vowels_remover = str.maketrans(DEVANAGARI_SHORT_VOWELS_REMOVE_MAP)
 
+@char_local
+def remove_devanagari_short_vowels(text):
+    return text.translate(devanagari_short_vowels_remover)
+
 DEVANAGARI_NON_INITIAL_VOWELS_ABJADIFY = {
     'ै': 'े',
     'ौ': 'ो',
@@ -68,6 +76,10 @@ DEVANAGARI_NON_INITIAL_VOWELS_ABJADIFY = {
 }
 devanagari_non_initial_vowels_abjadifier = str.maketrans(DEVANAGARI_NON_INITIAL_VOWELS_ABJADIFY)
 
+@char_local
+def abjadify_devanagari_non_initial_vowels(text):
+    return text.translate(devanagari_non_initial_vowels_abjadifier)
+
 DEVANAGARI_INITIAL_VOWELS_ABJADIFY = {
     'इ': 'अ',
     'ई': 'ए',
@@ -76,18 +88,12 @@ DEVANAGARI_INITIAL_VOWELS_ABJADIFY = {
     'ऐ': 'ए',
     'औ': 'ओ',
 }
-devanagari_initial_vowels_abjadifier = StringTranslator(DEVANAGARI_INITIAL_VOWELS_ABJADIFY,
-                                                       match_initial_only=True,
-                                                       support_back_translation=False)
+devanagari_initial_vowels_abjadifier = RegexRuleTranslator([
+    (DEVANAGARI_INITIAL_CONTEXT + get_keys_regex_str(DEVANAGARI_INITIAL_VOWELS_ABJADIFY), DEVANAGARI_INITIAL_VOWELS_ABJADIFY),
+], window=(1, 1))
 
 def devanagari_initial_vowels_abjadify(text):
-    text = re.sub('((^|[^\u0900-\u0963\u0972-\u097f]))इ', '\\1अ', text)
-    text = re.sub('((^|[^\u0900-\u0963\u0972-\u097f]))ई', '\\1ए', text)
-    text = re.sub('((^|[^\u0900-\u0963\u0972-\u097f]))उ', '\\1अ', text)
-    text = re.sub('((^|[^\u0900-\u0963\u0972-\u097f]))ऊ', '\\1ओ', text)
-    text = re.sub('((^|[^\u0900-\u0963\u0972-\u097f]))ऐ', '\\1ए', text)
-    text = re.sub('((^|[^\u0900-\u0963\u0972-\u097f]))औ', '\\1ओ', text)
-    return text
+    return devanagari_initial_vowels_abjadifier.translate(text)
 
 DEVANAGARI_NUQTA_CONSONANTS_SIMPLIFY_MAP = {
     # Unicode chars
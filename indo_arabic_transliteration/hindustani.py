@@ -1,6 +1,9 @@
 from .base import BaseIndoArabicTransliterator
-from .common import convert_devanagari_to_gujarati, normalize_gujarati
-import re
+from .common import convert_devanagari_to_gujarati, normalize_gujarati, devanagari_nuqta_consonants_simplifier
+from .lexicon import Lexicon
+from .profiling import profiled
+from .str_mapper import TranslatorPipeline, char_local, get_shared
+from .tables import load_table
 
 URDU_POSTPROCESS_MAP = {
     # Normalizer to modern Urdu
@@ -9,65 +12,121 @@ URDU_POSTPROCESS_MAP = {
 }
 urdu_postprocessor = str.maketrans(URDU_POSTPROCESS_MAP)
 
+@char_local
+def nativize_urdu(text):
+    return text.translate(urdu_postprocessor)
+
 CONSONANT_MAP_FILES = ['hindustani_consonants.csv']
+# Force ह to map only to Urdu ہ (not ھ)
+HINDI_TO_URDU_PASS1_OVERRIDES = {
+    'ह्ह': 'ہّ',
+    'ह्ह'+'ा': 'ہّ'+'ا',
+}
+HINDI_TO_URDU_PASS2_OVERRIDES = {
+    'ह': 'ہ',
+    'ह'+'ा': 'ہ'+'ا',
+}
+# Whole-word overrides of the rules, for ambiguous words (see lexicon.py)
+URDU_TO_HINDI_LEXICON_FILES = ['hindustani_urdu_to_hindi_lexicon.tsv']
 
 class HindustaniTransliterator(BaseIndoArabicTransliterator):
-    def __init__(self):
+    pass1_reverse_overrides = HINDI_TO_URDU_PASS1_OVERRIDES
+    pass2_reverse_overrides = HINDI_TO_URDU_PASS2_OVERRIDES
+
+    DIRECTION_ATTRIBUTES = {
+        'ur->hi': ('urdu_to_hindi_lexicon', 'urdu_to_hindi_pipeline'),
+        'hi->ur': ('hindi_to_urdu_pipeline',),
+    }
+
+    def __init__(self, compile_pipeline=False, directions=None):
         super().__init__(CONSONANT_MAP_FILES)
-        
-        # Monkey patch: Force ह to map only to Urdu ہ (not ھ)
-        self.arabic_to_devanagari_converter_pass2.reverse_translation_dict['ह'] = 'ہ'
-        self.arabic_to_devanagari_converter_pass2.reverse_translation_dict['ह'+'ा'] = 'ہ'+'ا'
-        self.arabic_to_devanagari_converter_pass1.reverse_translation_dict['ह्ह'] = 'ہّ'
-        self.arabic_to_devanagari_converter_pass1.reverse_translation_dict['ह्ह'+'ा'] = 'ہّ'+'ا'
+        # With `directions` (e.g. {'ur->hi'}), only the tables of those conversions are ever built
+        # (Checked against this class's directions, which subclasses map theirs to)
+        self.directions = self.get_directions(directions, HindustaniTransliterator.DIRECTION_ATTRIBUTES)
+
+        # With `compile_pipeline`, independent passes are fused into fewer scans (same output)
+        if 'ur->hi' in self.directions:
+            self.urdu_to_hindi_lexicon = get_shared(('lexicon', self.data_dir, tuple(URDU_TO_HINDI_LEXICON_FILES)),
+                                                    lambda: Lexicon.load(self.data_dir, URDU_TO_HINDI_LEXICON_FILES))
+            self.urdu_to_hindi_pipeline = TranslatorPipeline(self.get_urdu_to_hindi_stages(), fuse=compile_pipeline, name='urdu_to_hindi', owner=self)
+        if 'hi->ur' in self.directions:
+            self.hindi_to_urdu_pipeline = TranslatorPipeline(self.get_hindi_to_urdu_stages(), fuse=compile_pipeline, name='hindi_to_urdu', owner=self)
     
+    @profiled
     def transliterate_ambiguous_urdu_words_to_hindi(self, text):
-        # TODO: Handle these using mapper
-        text = re.sub(r"(\b)و(\b)", "\\1व\\2", text)
-        text = re.sub(r"(\b)کیں(\b)", "\\1कीं\\2", text)
-        text = re.sub(r"(\b)نہیں(\b)", "\\1नहीं\\2", text)
-        return text
+        return self.urdu_to_hindi_lexicon.translate(text)
+
+    def get_urdu_to_hindi_stages(self):
+        return [
+            (self.initial_arabic_to_devanagari_converter, False),
+
+            # Convert Hamza-combos first, then remaining hamza
+            (self.hamza_combo_to_devanagari_converter, False),
+            (self.hamza_to_devanagari_converter, False),
+
+            (self.arabic_to_devanagari_converter_pass1, False),
+            (self.final_arabic_to_devanagari_converter, False),
+            (self.arabic_to_devanagari_converter_pass2, False),
+            (self.arabic_to_devanagari_final_cleanup, False),
+            self.devanagari_postprocessor.translate, #  (جمہوریہ) जमहवरयह -> जमहोरयह
+            self.devanagari_postprocessor.translate, # जमहोरयह -> जमहोरीह
+        ]
     
     def transliterate_from_urdu_to_hindi(self, text, nativize=False):
         text = self.arabic_normalize(text)
+        return self.transliterate_normalized_urdu_to_hindi(text, nativize)
+
+    def transliterate_normalized_urdu_to_hindi(self, text, nativize=False):
+        # Rules from here on never look across whitespace (see mapper.WORD_CACHE_DELEGATES)
         text = self.transliterate_ambiguous_urdu_words_to_hindi(text)
-        text = self.initial_arabic_to_devanagari_converter.translate(text)
-        
-        # Convert Hamza-combos first, then remaining hamza
-        text = self.hamza_combo_to_devanagari_converter.translate(text)
-        text = self.hamza_to_devanagari_converter.translate(text)
-        
-        text = self.arabic_to_devanagari_converter_pass1.translate(text)
-        text = self.final_arabic_to_devanagari_converter.translate(text)
-        text = self.arabic_to_devanagari_converter_pass2.translate(text)
-        text = self.arabic_to_devanagari_final_cleanup.translate(text)
-        text = self.devanagari_postprocessor.translate(text) #  (جمہوریہ) जमहवरयह -> जमहोरयह
-        text = self.devanagari_postprocessor.translate(text) # जमहोरयह -> जमहोरीह
+        text = self.urdu_to_hindi_pipeline(text)
         if nativize:
             text = self.devanagari_nativize(text)
         return text
 
+    def get_hindi_to_urdu_stages(self):
+        return [
+            self.devanagari_initial_e_patcher.translate, # Patch: ए is present in both hamza and initial vowels, so handle first
+
+            # Convert Devanagari-Hamza first, then hamza-combos
+            (self.hamza_to_devanagari_converter, True),
+            (self.hamza_combo_to_devanagari_converter, True),
+
+            (self.arabic_to_devanagari_converter_pass1, True),
+            *self.get_devanagari_remove_short_vowels_stages(), # Running it now since previous pass could have handled some short vowels (hamza_combos)
+            char_local(lambda text: text.replace('ा', 'ا')), # Regex finds 'ा' as a \b unfortunately. So a quick hack to avoid those confusions
+            (self.final_arabic_to_devanagari_converter, True),
+            char_local(lambda text: text.replace('ी', 'ی').replace('ो', 'و').replace('े', 'ے')), # In-case anything remains, should never happen tho
+            (self.initial_arabic_to_devanagari_converter, True),
+            char_local(lambda text: text.replace("ओ", "ؤ")),
+            (self.arabic_to_devanagari_converter_pass2, True),
+            (self.arabic_to_devanagari_final_cleanup, True),
+        ]
+
     def transliterate_from_hindi_to_urdu(self, text, nativize=False):
         text = self.devanagari_normalize(text)
-        text = re.sub('((^|[^\u0900-\u0963\u0972-\u097f]))ए', '\\1ای', text) # Patch: ए is present in both hamza and initial vowels, so handle first
-
-        # Convert Devanagari-Hamza first, then hamza-combos
-        text = self.hamza_to_devanagari_converter.reverse_translate(text)
-        text = self.hamza_combo_to_devanagari_converter.reverse_translate(text)
-
-        text = self.arabic_to_devanagari_converter_pass1.reverse_translate(text)
-        text = self.devanagari_remove_short_vowels(text) # Running it now since previous pass could have handled some short vowels (hamza_combos)
-        text = text.replace('ा', 'ا') # Regex finds 'ा' as a \b unfortunately. So a quick hack to avoid those confusions
-        text = self.final_arabic_to_devanagari_converter.reverse_translate(text)
-        text = text.replace('ी', 'ی').replace('ो', 'و').replace('े', 'ے') # In-case anything remains, should never happen tho
-        text = self.initial_arabic_to_devanagari_converter.reverse_translate(text)
-        text = text.replace("ओ", "ؤ")
-        text = self.arabic_to_devanagari_converter_pass2.reverse_translate(text)
-        text = self.arabic_to_devanagari_final_cleanup.reverse_translate(text)
+        return self.transliterate_normalized_hindi_to_urdu(text, nativize)
+
+    def transliterate_normalized_hindi_to_urdu(self, text, nativize=False):
+        # Rules from here on never look across whitespace (see mapper.WORD_CACHE_DELEGATES)
+        text = self.hindi_to_urdu_pipeline(text)
         
         if nativize:
-            text = text.translate(urdu_postprocessor)
+            text = nativize_urdu(text)
         return text
+
+    # Whole conversions as pipeline stages, for TranslatorPipeline.stream() (see mapper.script_convert_stream())
+    def get_urdu_to_hindi_stream_stages(self, nativize=False):
+        stages = [*self.get_arabic_normalize_stages(), self.urdu_to_hindi_lexicon.translate, self.urdu_to_hindi_pipeline]
+        if nativize:
+            stages.append(devanagari_nuqta_consonants_simplifier.translate)
+        return stages
+
+    def get_hindi_to_urdu_stream_stages(self, nativize=False):
+        stages = [*self.get_devanagari_normalize_stages(), self.hindi_to_urdu_pipeline]
+        if nativize:
+            stages.append(nativize_urdu)
+        return stages
     
     def __call__(self, text, src_lang, dest_lang, nativize=False):
         if dest_lang == 'ur':
@@ -86,10 +145,7 @@ class GujaratiTransliterator(BaseIndoArabicTransliterator):
             data_dir=data_dir
         )
         # Load Gujarati-specific postprocessing rules
-        gujarati_postprocess_map_file = os.path.join(self.data_dir, 'gujarati/postprocess.csv')
-        df = pd.read_csv(gujarati_postprocess_map_file, header=None)
-        for i in df.columns:
-            src, tgt = str(df[i][0]).strip(), str(df[i][1]).strip()
+        for src, tgt, *_ in load_table(self.data_dir, 'gujarati/postprocess.csv'):
             self.devanagari_postprocess_map[src] = tgt
         self.devanagari_postprocessor = StringTranslator(self.devanagari_postprocess_map)
 
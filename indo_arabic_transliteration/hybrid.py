@@ -0,0 +1,173 @@
+import re
+import threading
+from collections import Counter
+
+from .mapper import get_delegate, script_convert
+
+# Scripts whose (unvocalized) spelling drops short vowels
+ABJAD_SCRIPTS = {'ur-PK', 'pa-PK', 'sd-PK'}
+
+# Long vowels, their carriers and hamza forms: any other letter is taken as a consonant
+ARABIC_VOWEL_LETTERS = set('اآأإٱوؤیيےۓئءى')
+# و/ی inside a word can be a consonant (v/y) or any of several long vowels
+ARABIC_AMBIGUOUS_VOWEL_REGEX = re.compile(r'\B[وی]\B')
+
+# Letters having several Arabic-script spellings (e.g. स -> س/ص/ث, ज -> ج/ز/ذ/ض/ظ)
+INDIC_AMBIGUOUS_LETTERS = {
+    'hi-IN': 'सजतहअ',
+    'sd-IN': 'सजतहअ',
+    'pa-IN': 'ਸਜਤਹਅ',
+    'gu-IN': 'સજતહઅ',
+}
+
+WORD_REGEX = re.compile(r'\S+')
+
+def score_abjad_word(word: str) -> float:
+    """
+    Ambiguity of an Arabic-script word for conversion to an Indic script, from 0 to 1:
+    the share of letters followed by a consonant (where a short vowel may have been dropped),
+    plus the medial و/ی (which can be consonants or vowels).
+    """
+    is_consonant = [char.isalpha() and char not in ARABIC_VOWEL_LETTERS for char in word]
+    num_letters = sum(1 for char in word if char.isalpha())
+    if num_letters < 2:
+        return 0.0
+    dropped_vowels = sum(1 for i in range(len(word) - 1) if word[i].isalpha() and is_consonant[i+1])
+    ambiguous_vowels = len(ARABIC_AMBIGUOUS_VOWEL_REGEX.findall(word))
+    return min(1.0, (dropped_vowels + ambiguous_vowels) / num_letters)
+
+def make_indic_word_scorer(ambiguous_letters: str):
+    """
+    Returns a scorer giving the share of letters of a word having several Arabic-script spellings.
+    """
+    ambiguous_letters = set(ambiguous_letters)
+    def score_indic_word(word):
+        num_letters = sum(1 for char in word if char.isalpha())
+        if not num_letters:
+            return 0.0
+        return min(1.0, 2 * sum(1 for char in word if char in ambiguous_letters) / num_letters)
+    return score_indic_word
+
+def get_word_scorer(from_script: str):
+    if from_script in ABJAD_SCRIPTS:
+        return score_abjad_word
+    if from_script in INDIC_AMBIGUOUS_LETTERS:
+        return make_indic_word_scorer(INDIC_AMBIGUOUS_LETTERS[from_script])
+    raise ValueError(f"No ambiguity scorer for {from_script}")
+
+def get_engine(engine: str, from_script: str, to_script: str):
+    """
+    Returns a function converting a list of words with the given fallback engine ('ml' or 'online').
+    """
+    if engine == 'ml':
+        from .ml_based import get_model, ml_transliterate_batch
+        get_model(from_script, to_script)
+        return lambda words: ml_transliterate_batch(words, from_script, to_script)
+    if engine == 'online':
+        from .sangam_api import get_endpoint, online_transliterate_many
+        get_endpoint(from_script, to_script)
+        return lambda words: online_transliterate_many(words, from_script, to_script)
+    raise ValueError(f"Unknown engine: {engine}")
+
+class HybridRouter:
+    '''
+    Converts texts with the rule-based converter, then re-converts only the words it most
+    likely got wrong with an expensive engine (ML models or the Sangam API), merging them back.
+
+    Each word of the input is scored for ambiguity from 0 to 1 (see `score_abjad_word()` and
+    `make_indic_word_scorer()`), and words scoring at least `threshold` (and at least
+    `min_word_length` chars long) are escalated, each distinct word once per call.
+    If the rule-based output does not have as many words as the input (some rules join words),
+    the whole text is escalated instead, as soon as any of its words would be.
+
+    Args:
+        from_script (str): Source script (e.g., 'ur-PK')
+        to_script (str): Target script (e.g., 'hi-IN')
+        engine (str or callable): 'ml', 'online', or a function converting a list of words
+        threshold (float): Minimum ambiguity score of escalated words (0 escalates all of them)
+        min_word_length (int): Shorter words (often frequent function words) are never escalated
+        scorer (callable): Word -> ambiguity score. Defaults to the one for `from_script`.
+        fail_safe (bool): If the engine fails, keep the rule-based output instead of raising
+            (counted in `metrics` as `engine_errors`, with the words and texts whose escalation
+            failed as `failed_escalated_words` and `failed_escalated_texts`)
+    '''
+    def __init__(self, from_script, to_script, engine='ml', threshold=0.75, min_word_length=4, scorer=None, fail_safe=True):
+        self.from_script = from_script
+        self.to_script = to_script
+        get_delegate(from_script, to_script)
+        self.engine = get_engine(engine, from_script, to_script) if isinstance(engine, str) else engine
+        self.threshold = threshold
+        self.min_word_length = min_word_length
+        self.scorer = scorer or get_word_scorer(from_script)
+        self.fail_safe = fail_safe
+        self.metrics = Counter()
+        self.metrics_lock = threading.Lock()
+
+    def should_escalate(self, word):
+        return len(word) >= self.min_word_length and self.scorer(word) >= self.threshold
+
+    def convert_many(self, texts):
+        '''
+        Converts a list of texts, sending all their escalated words to the engine in a single call.
+        '''
+        outputs = [script_convert(text, self.from_script, self.to_script) for text in texts]
+        escalated = {}  # Text/word to escalate -> its conversion
+        merges = []
+        metrics = Counter(texts=len(texts))
+        # Only counted as escalated once the engine has converted them
+        escalations = Counter()
+        for i, (text, output) in enumerate(zip(texts, outputs)):
+            words = WORD_REGEX.findall(text)
+            flags = [self.should_escalate(word) for word in words]
+            metrics['words'] += len(words)
+            escalations['escalated_words'] += sum(flags)
+            if not any(flags):
+                continue
+            output_words = list(WORD_REGEX.finditer(output))
+            if len(output_words) != len(words):
+                escalated[text] = None
+                merges.append((i, None, text))
+                escalations['escalated_texts'] += 1
+                continue
+            for flag, word, output_word in zip(flags, words, output_words):
+                if flag:
+                    escalated[word] = None
+                    merges.append((i, output_word.span(), word))
+
+        metrics['engine_inputs'] += len(escalated)
+        if escalated:
+            try:
+                conversions = list(self.engine(list(escalated)))
+                if len(conversions) != len(escalated):
+                    raise ValueError(f"The engine returned {len(conversions)} conversions for {len(escalated)} inputs")
+                escalated.update(zip(escalated, conversions))
+                metrics.update(escalations)
+            except Exception:
+                metrics['engine_errors'] += 1
+                metrics.update({f'failed_{key}': value for key, value in escalations.items()})
+                if not self.fail_safe:
+                    with self.metrics_lock:
+                        self.metrics.update(metrics)
+                    raise
+                merges = []
+
+        # Replace from the end of each output, so that the spans stay valid
+        for i, span, source in reversed(merges):
+            if span is None:
+                outputs[i] = escalated[source]
+            else:
+                outputs[i] = outputs[i][:span[0]] + escalated[source] + outputs[i][span[1]:]
+
+        with self.metrics_lock:
+            self.metrics.update(metrics)
+        return outputs
+
+    def __call__(self, text):
+        return self.convert_many([text])[0]
+
+    @property
+    def escalated_share(self):
+        '''
+        Share of the words escalated so far (by successful engine calls).
+        '''
+        return self.metrics['escalated_words'] / max(self.metrics['words'], 1)
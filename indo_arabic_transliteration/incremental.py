@@ -0,0 +1,126 @@
+'''
+Incremental conversion of a text being edited (e.g. in a live side-by-side editor):
+after each edit, only the lines around it are converted again, and the output is patched.
+
+    session = TransliterationSession('hi-IN', 'ur-PK', text)
+    output_edit = session.edit(offset, deleted_length, inserted_text)
+'''
+import bisect
+import re
+
+from .mapper import DELEGATES, WORD_CACHE_DELEGATES, get_converter
+
+LINE_REGEX = re.compile(r'[^\n]*\n|[^\n]+')
+
+def first_line(text):
+    return text[:text.find('\n')+1] or text
+
+def last_line(text):
+    return text[text.rfind('\n', 0, -1)+1:]
+
+class TransliterationSession:
+    '''
+    Holds a text and its conversion between two scripts, keeping the conversion up to date
+    as the text is edited. The output is always the same as `script_convert()` of the whole text.
+
+    The text is split into segments: lines, merged with the next one when the normalization
+    looks across the line break (like the Urdu hamza spacing fix). After normalization, the
+    rules of the pair never look across whitespace (see mapper.WORD_CACHE_DELEGATES), so each
+    segment is converted on its own, and an edit only converts again the segments it touches.
+    '''
+    def __init__(self, from_script, to_script, text=''):
+        if (from_script, to_script) not in WORD_CACHE_DELEGATES:
+            raise ValueError(f"Incremental conversion is not supported for conversion from {from_script} to {to_script}")
+        converter_name, normalize_method, convert_method = WORD_CACHE_DELEGATES[(from_script, to_script)]
+        converter = get_converter(converter_name, DELEGATES[(from_script, to_script)].direction)
+        self.normalize = getattr(converter, normalize_method)
+        self.convert_normalized = getattr(converter, convert_method)
+
+        # Segments of the text, their conversions, and the offsets where they start
+        self.sources, self.outputs = [], []
+        self.source_starts, self.output_starts = [], []
+        self.edit(0, 0, text)
+
+    @property
+    def text(self):
+        return ''.join(self.sources)
+
+    @property
+    def output(self):
+        return ''.join(self.outputs)
+
+    def __len__(self):
+        return self.source_starts[-1] + len(self.sources[-1]) if self.sources else 0
+
+    def is_safe_cut(self, left, right):
+        '''
+        Whether the text `left + right` (`left` ending a line) can be converted as `left` and `right` separately.
+        '''
+        left, right = last_line(left), first_line(right)
+        normalized_left = self.normalize(left)
+        return normalized_left[-1:].isspace() and self.normalize(left + right) == normalized_left + self.normalize(right)
+
+    def split_segments(self, text):
+        segments = []
+        for line in LINE_REGEX.findall(text):
+            if segments and not self.is_safe_cut(segments[-1], line):
+                segments[-1] += line
+            else:
+                segments.append(line)
+        return segments
+
+    def convert(self, segment):
+        return self.convert_normalized(self.normalize(segment))
+
+    def edit(self, offset, deleted, inserted=''):
+        """
+        Replace `deleted` chars of the text from `offset` with `inserted`, and update the conversion.
+
+        Args:
+            offset (int): Position of the edit in the text
+            deleted (int): Number of chars removed from `offset`
+            inserted (str): Text inserted at `offset`
+
+        Returns:
+            tuple: (offset, deleted, inserted) edit of the output, turning the previous output into the new one
+        """
+        if offset < 0 or deleted < 0 or offset + deleted > len(self):
+            raise ValueError(f"Edit of {deleted} chars at {offset} is out of the text (of {len(self)} chars)")
+        sources, num_segments = self.sources, len(self.sources)
+
+        # Segments touched by the edit
+        first = max(bisect.bisect_right(self.source_starts, offset) - 1, 0)
+        last = min(max(bisect.bisect_left(self.source_starts, offset + deleted), first + 1), num_segments)
+        start = self.source_starts[first] if first < num_segments else 0
+        text = ''.join(sources[first:last])
+        text = text[:offset-start] + inserted + text[offset+deleted-start:]
+
+        # Extend them while the edited text joins with its neighbours
+        while True:
+            segments = self.split_segments(text)
+            if first > 0 and not self.is_safe_cut(sources[first-1], segments[0] if segments else ''.join(sources[last:last+1])):
+                first -= 1
+                start -= len(sources[first])
+                text = sources[first] + text
+            elif last < num_segments and text and (not text.endswith('\n') or not self.is_safe_cut(text, sources[last])):
+                text += sources[last]
+                last += 1
+            else:
+                break
+
+        outputs = [self.convert(segment) for segment in segments]
+        output_start = self.output_starts[first] if first < num_segments else sum(map(len, self.outputs))
+        output_deleted = sum(map(len, self.outputs[first:last]))
+
+        source_starts, output_starts = [start], [output_start]
+        for segment, output in zip(segments, outputs):
+            source_starts.append(source_starts[-1] + len(segment))
+            output_starts.append(output_starts[-1] + len(output))
+        source_shift = source_starts.pop() - start - sum(map(len, sources[first:last]))
+        output_shift = output_starts.pop() - output_start - output_deleted
+
+        self.sources[first:last] = segments
+        self.outputs[first:last] = outputs
+        self.source_starts[first:] = source_starts + [position + source_shift for position in self.source_starts[last:]]
+        self.output_starts[first:] = output_starts + [position + output_shift for position in self.output_starts[last:]]
+        return output_start, output_deleted, ''.join(outputs)
@@ -0,0 +1,66 @@
+'''
+Whole-word overrides of the rules (names, loanwords, and words the rules get wrong),
+loaded from the `*_lexicon.tsv` files of the data directory (see tables.py).
+
+A lexicon replaces the words of a text which it lists, in a single tokenizing scan: each
+word is looked up in a hash table, so the cost per word does not depend on the lexicon size
+(unlike a regex alternation of the words, or one regex per word).
+'''
+import re
+
+from .str_mapper import stream_translate
+from .tables import load_lexicon
+
+# A word is a maximal run of word chars (by default, what `\b(?:word)\b` matches)
+WORD_CHAR_REGEX = r'\w'
+
+class Lexicon:
+    '''
+    Replaces the words of a text found in `words` (word -> replacement).
+
+    Args:
+        words (dict): The overrides. Every word must be a run of word chars.
+        word_char_regex (str): Regex of a single word char (e.g. a char class)
+    '''
+    def __init__(self, words, word_char_regex=WORD_CHAR_REGEX):
+        word_matcher = re.compile('%s+' % word_char_regex)
+        for word in words:
+            if not word_matcher.fullmatch(word):
+                raise ValueError(f"Lexicon entry {word!r} is not a single word")
+        self.words = dict(words)
+        self.splitter = re.compile('(%s+)' % word_char_regex)
+        self.finder = re.compile('(?<!%s)%s+' % (word_char_regex, word_char_regex))
+        self.max_word_length = max(map(len, self.words), default=0)
+
+    @classmethod
+    def load(cls, data_dir, lexicon_files, word_char_regex=WORD_CHAR_REGEX):
+        '''
+        Merges the lexicons of the given files (later files override earlier ones).
+        '''
+        words = {}
+        for lexicon_file in lexicon_files:
+            words.update(load_lexicon(data_dir, lexicon_file))
+        return cls(words, word_char_regex)
+
+    def __len__(self):
+        return len(self.words)
+
+    def translate(self, text):
+        if not self.words:
+            return text
+        # Separators are never found: words and separators alternate
+        tokens = self.splitter.split(text)
+        return ''.join(map(self.words.get, tokens, tokens))
+
+    def iter_matches(self, text, pos, last):
+        words = self.words
+        for match in self.finder.finditer(text, pos):
+            word = match.group(0)
+            if word in words:
+                yield match.start(), match.end(), words[word]
+
+    def stream(self, chunks):
+        '''
+        Same as translate() over the concatenation of `chunks`, yielded incrementally.
+        '''
+        return stream_translate(chunks, self.iter_matches, 1, self.max_word_length + 1)
@@ -1,36 +1,152 @@
-from .hindustani import HindustaniTransliterator
-hindi_urdu_converter = HindustaniTransliterator()
+import codecs
+import importlib
+import os
+import threading
+from collections import deque
+from itertools import islice
 
-from .punjabi import PunjabiTransliterator
-panjabi_converter = PunjabiTransliterator()
+from .str_mapper import TranslatorPipeline
+from .word_cache import WordCache
 
-from .sindhi import SindhiTransliterator
-sindhi_converter = SindhiTransliterator()
+# Converters are constructed lazily on first use, since each of them loads its own tables.
+# Name -> (module, class)
+CONVERTERS = {
+    'hindustani': ('.hindustani', 'HindustaniTransliterator'),
+    'punjabi': ('.punjabi', 'PunjabiTransliterator'),
+    'sindhi': ('.sindhi', 'SindhiTransliterator'),
+    # 🌟 New: Import Gujarati Transliterator
+    'gujarati': ('.punjabi', 'GujaratiTransliterator'),
+}
+
+# Module attributes kept for backward-compatibility, resolved by __getattr__()
+LEGACY_CONVERTER_NAMES = {
+    'hindi_urdu_converter': 'hindustani',
+    'panjabi_converter': 'punjabi',
+    'sindhi_converter': 'sindhi',
+    'gujarati_converter': 'gujarati',
+}
+
+_converters = {}
+_converters_lock = threading.Lock()
+
+def get_converter(name, direction=None):
+    """
+    Returns the shared converter instance for `name` (a key of CONVERTERS), building it on first use.
+    With `direction` (e.g. 'ur->hi'), it is a converter built for that direction only, which never
+    builds the tables of the others (see HindustaniTransliterator(directions=...)).
+    Safe to call from multiple threads: each converter is constructed only once.
+    """
+    key = name if direction is None else (name, direction)
+    converter = _converters.get(key)
+    if converter is None:
+        with _converters_lock:
+            converter = _converters.get(key)
+            if converter is None:
+                module_name, class_name = CONVERTERS[name]
+                converter_class = getattr(importlib.import_module(module_name, __package__), class_name)
+                converter = _converters[key] = converter_class() if direction is None else converter_class(directions={direction})
+    return converter
+
+def __getattr__(name):
+    if name in LEGACY_CONVERTER_NAMES:
+        return get_converter(LEGACY_CONVERTER_NAMES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class LazyDelegate:
+    """
+    Callable standing for `getattr(get_converter(converter_name, direction), method_name)`,
+    without constructing the converter until it is first called (or loaded).
+    """
+    def __init__(self, converter_name, method_name, direction=None):
+        self.converter_name = converter_name
+        self.method_name = method_name
+        self.direction = direction
+        self.method = None
 
-# 🌟 New: Import Gujarati Transliterator
-from .gujarati import GujaratiTransliterator
-gujarati_converter = GujaratiTransliterator()
+    def load(self):
+        if self.method is None:
+            self.method = getattr(get_converter(self.converter_name, self.direction), self.method_name)
+        return self.method
 
-# Alternatively, define inline if not imported
-# gujarati_converter = GujaratiTransliterator(data_dir='path/to/data')
+    def __call__(self, text):
+        return (self.method or self.load())(text)
 
+# Converters which support it are built for the direction of the pair only
 DELEGATES = {
     # Hindustani languages
-    ('hi-IN', 'ur-PK'): hindi_urdu_converter.transliterate_from_hindi_to_urdu,
-    ('ur-PK', 'hi-IN'): hindi_urdu_converter.transliterate_from_urdu_to_hindi,
-    
+    ('hi-IN', 'ur-PK'): LazyDelegate('hindustani', 'transliterate_from_hindi_to_urdu', 'hi->ur'),
+    ('ur-PK', 'hi-IN'): LazyDelegate('hindustani', 'transliterate_from_urdu_to_hindi', 'ur->hi'),
+
     # Punjabi scripts
-    ('pa-IN', 'pa-PK'): panjabi_converter.transliterate_from_gurmukhi_to_shahmukhi,
-    ('pa-PK', 'pa-IN'): panjabi_converter.transliterate_from_shahmukhi_to_gurmukhi,
-    
+    ('pa-IN', 'pa-PK'): LazyDelegate('punjabi', 'transliterate_from_gurmukhi_to_shahmukhi', 'gurmukhi->shahmukhi'),
+    ('pa-PK', 'pa-IN'): LazyDelegate('punjabi', 'transliterate_from_shahmukhi_to_gurmukhi', 'shahmukhi->gurmukhi'),
+
     # Sindhi scripts
-    ('sd-IN', 'sd-PK'): sindhi_converter.transliterate_from_devanagari_to_sindhi,
-    ('sd-PK', 'sd-IN'): sindhi_converter.transliterate_from_sindhi_to_devanagari,
+    ('sd-IN', 'sd-PK'): LazyDelegate('sindhi', 'transliterate_from_devanagari_to_sindhi', 'devanagari->sindhi'),
+    ('sd-PK', 'sd-IN'): LazyDelegate('sindhi', 'transliterate_from_sindhi_to_devanagari', 'sindhi->devanagari'),
 
     # 🌟 Gujarati to Urdu and vice versa
-    ('gu-IN', 'ur-PK'): gujarati_converter.transliterate_from_gujarati_to_urdu,
-    ('ur-PK', 'gu-IN'): gujarati_converter.transliterate_from_urdu_to_gujarati,
+    ('gu-IN', 'ur-PK'): LazyDelegate('gujarati', 'transliterate_from_gujarati_to_urdu', 'gujarati->urdu'),
+    ('ur-PK', 'gu-IN'): LazyDelegate('gujarati', 'transliterate_from_urdu_to_gujarati', 'urdu->gujarati'),
+}
+
+# Pairs which can be memoized word by word (see WordCache), as
+# (converter, method normalizing a whole text, method converting normalized words).
+# NUL (see BATCH_SEPARATOR) acts like the start/end of a text, so it separates words too.
+WORD_CACHE_DELEGATES = {
+    ('hi-IN', 'ur-PK'): ('hindustani', 'devanagari_normalize', 'transliterate_normalized_hindi_to_urdu'),
+    ('ur-PK', 'hi-IN'): ('hindustani', 'arabic_normalize', 'transliterate_normalized_urdu_to_hindi'),
 }
+WORD_CACHE_SEPARATOR_REGEX = r'[\s\x00]+'
+
+_word_caches = {}
+
+def enable_word_cache(pairs=None, maxsize: int = 65536) -> None:
+    """
+    Memoize the conversions of the given pairs word by word, in a separate LRU cache
+    of `maxsize` words per pair. The output stays identical to the uncached conversion.
+
+    Args:
+        pairs (iterable): (from_script, to_script) tuples. Defaults to all the pairs in WORD_CACHE_DELEGATES.
+        maxsize (int): Maximum number of words remembered per pair
+    """
+    for from_script, to_script in (WORD_CACHE_DELEGATES if pairs is None else pairs):
+        if (from_script, to_script) not in WORD_CACHE_DELEGATES:
+            raise ValueError(f"Word cache is not supported for conversion from {from_script} to {to_script}")
+        converter_name, normalize_method, convert_method = WORD_CACHE_DELEGATES[(from_script, to_script)]
+        converter = get_converter(converter_name, DELEGATES[(from_script, to_script)].direction)
+        _word_caches[(from_script, to_script)] = WordCache(getattr(converter, convert_method), maxsize,
+                                                           WORD_CACHE_SEPARATOR_REGEX, getattr(converter, normalize_method))
+
+def disable_word_cache(pairs=None) -> None:
+    for pair in list(_word_caches if pairs is None else pairs):
+        _word_caches.pop(tuple(pair), None)
+
+def word_cache_info(from_script: str, to_script: str):
+    """
+    Returns the (hits, misses, maxsize, currsize) statistics of the word cache of a pair, or None if it is disabled.
+    """
+    word_cache = _word_caches.get((from_script, to_script))
+    return word_cache.cache_info() if word_cache else None
+
+def get_delegate(from_script: str, to_script: str):
+    if (from_script, to_script) not in DELEGATES:
+        raise ValueError(f"Unsupported conversion from {from_script} to {to_script}")
+    return _word_caches.get((from_script, to_script)) or DELEGATES[(from_script, to_script)]
+
+def warmup(pairs=None) -> None:
+    """
+    Preload the converters needed for the given conversion pairs, so that the first
+    `script_convert()` call does not pay for their construction.
+
+    Args:
+        pairs (iterable): (from_script, to_script) tuples, e.g. [('ur-PK', 'hi-IN')].
+            Defaults to all the pairs in DELEGATES.
+    """
+    for from_script, to_script in (DELEGATES if pairs is None else pairs):
+        if (from_script, to_script) not in DELEGATES:
+            raise ValueError(f"Unsupported conversion from {from_script} to {to_script}")
+        DELEGATES[(from_script, to_script)].load()
 
 def script_convert(text: str, from_script: str, to_script: str) -> str:
     """
@@ -44,7 +160,256 @@ def script_convert(text: str, from_script: str, to_script: str) -> str:
     Returns:
         str: Converted text
     """
-    if (from_script, to_script) not in DELEGATES:
+    return get_delegate(from_script, to_script)(text)
+
+# Pairs converted through another conversion (their pivot), as pair -> (pivot pair, conversion of
+# the pivot's output). Several targets of a text sharing a pivot only compute it once (see script_convert_multi()).
+# Shahmukhi and Urdu go through the same Arabic-to-Devanagari conversion.
+PIVOT_DELEGATES = {
+    ('pa-PK', 'pa-IN'): (('ur-PK', 'hi-IN'), LazyDelegate('punjabi', 'transliterate_from_devanagari_to_gurmukhi', 'shahmukhi->gurmukhi')),
+    ('ur-PK', 'gu-IN'): (('ur-PK', 'hi-IN'), LazyDelegate('gujarati', 'transliterate_from_devanagari_to_gujarati', 'urdu->gujarati')),
+}
+PIVOT_PAIRS = {pivot_pair for pivot_pair, _ in PIVOT_DELEGATES.values()}
+
+class PivotCache:
+    """
+    Remembers the pivot conversions (see PIVOT_DELEGATES) of the texts converted with it, so that
+    the calls of `script_convert_multi()` sharing it (e.g. while serving one request) convert each
+    text to a pivot only once. Unbounded: use one per request or batch, then drop it.
+    """
+    def __init__(self):
+        self.pivots = {}
+        self.hits = self.misses = 0
+
+    def get(self, text: str, pivot_pair) -> str:
+        key = (pivot_pair, text)
+        pivot = self.pivots.get(key)
+        if pivot is None:
+            self.misses += 1
+            pivot = self.pivots[key] = get_delegate(*pivot_pair)(text)
+        else:
+            self.hits += 1
+        return pivot
+
+    def clear(self):
+        self.pivots.clear()
+        self.hits = self.misses = 0
+
+def script_convert_multi(text: str, from_script: str, to_scripts, pivot_cache: PivotCache = None) -> dict:
+    """
+    Convert the given `text` to several scripts, giving the same results as `script_convert()`
+    for each of them, but converting it only once to the pivot shared by several targets
+    (e.g. Urdu to Devanagari, for Hindi and Gujarati).
+
+    Args:
+        text (str): Text to be converted
+        from_script (str): Source script (e.g., 'ur-PK')
+        to_scripts (iterable of str): Target scripts (e.g., ['hi-IN', 'gu-IN'])
+        pivot_cache (PivotCache): Cache of pivot conversions to use (and fill), e.g. shared by the
+            calls of a request. Defaults to a new cache for this call only.
+
+    Returns:
+        dict: Target script -> converted text
+    """
+    to_scripts = list(to_scripts)
+    for to_script in to_scripts:
+        get_delegate(from_script, to_script)
+    if pivot_cache is None:
+        pivot_cache = PivotCache()
+
+    outputs = {}
+    for to_script in to_scripts:
+        pair = (from_script, to_script)
+        if pair in PIVOT_DELEGATES:
+            pivot_pair, convert_pivot = PIVOT_DELEGATES[pair]
+            outputs[to_script] = convert_pivot(pivot_cache.get(text, pivot_pair))
+        elif pair in PIVOT_PAIRS:
+            outputs[to_script] = pivot_cache.get(text, pair)
+        else:
+            outputs[to_script] = get_delegate(*pair)(text)
+    return outputs
+
+# Pairs which can be converted in a stream of chunks, as (converter, method returning the stages of
+# the whole conversion). Punjabi and Gujarati (see brahmic.BrahmicTranslator) are not streamed yet.
+STREAM_DELEGATES = {
+    ('hi-IN', 'ur-PK'): ('hindustani', 'get_hindi_to_urdu_stream_stages'),
+    ('ur-PK', 'hi-IN'): ('hindustani', 'get_urdu_to_hindi_stream_stages'),
+    ('sd-IN', 'sd-PK'): ('sindhi', 'get_devanagari_to_sindhi_stream_stages'),
+    ('sd-PK', 'sd-IN'): ('sindhi', 'get_sindhi_to_devanagari_stream_stages'),
+}
+
+_stream_pipelines = {}
+
+def get_stream_pipeline(from_script: str, to_script: str):
+    pair = (from_script, to_script)
+    if pair not in STREAM_DELEGATES:
+        if pair in DELEGATES:
+            raise ValueError(f"Streaming is not supported for conversion from {from_script} to {to_script}")
         raise ValueError(f"Unsupported conversion from {from_script} to {to_script}")
-    
-    return DELEGATES[(from_script, to_script)](text)
+    pipeline = _stream_pipelines.get(pair)
+    if pipeline is None:
+        converter_name, stages_method = STREAM_DELEGATES[pair]
+        stages = getattr(get_converter(converter_name, DELEGATES[pair].direction), stages_method)()
+        pipeline = _stream_pipelines[pair] = TranslatorPipeline(stages, fuse=False, name='stream')
+    return pipeline
+
+def iter_text_chunks(source, chunk_size: int = 65536):
+    """
+    Yields the text of `source` in chunks of about `chunk_size` chars.
+
+    Args:
+        source: A str, an iterable of str or bytes chunks (e.g. a file), or an object with a
+            `read(size)` method returning str or bytes (e.g. an open file, or an mmap).
+            Bytes are decoded as UTF-8, incrementally, so chunk edges may split a char.
+        chunk_size (int): Number of chars (or bytes) read at a time
+    """
+    if isinstance(source, str):
+        for start in range(0, len(source), chunk_size):
+            yield source[start:start+chunk_size]
+        return
+    if hasattr(source, 'read'):
+        chunks = iter(lambda: source.read(chunk_size), source.read(0))
+    else:
+        chunks = iter(source)
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    for chunk in chunks:
+        if not isinstance(chunk, str):
+            chunk = decoder.decode(chunk)
+        if chunk:
+            yield chunk
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+def script_convert_stream(source, from_script: str, to_script: str, chunk_size: int = 65536):
+    """
+    Convert a text of any size in chunks, with constant memory, giving the same result
+    as `script_convert()` on the whole text.
+
+    Each stage of the conversion holds back only the few chars at chunk edges which its
+    rules may still depend on (its longest key plus boundary context).
+
+    Args:
+        source: Text to be converted: a str, an iterable of str/bytes chunks, or a file/mmap (see iter_text_chunks())
+        from_script (str): Source script (e.g., 'hi-IN', 'ur-PK')
+        to_script (str): Target script (e.g., 'ur-PK', 'hi-IN'). The pair must be in STREAM_DELEGATES.
+        chunk_size (int): Number of chars (or bytes) read at a time
+
+    Returns:
+        generator of str: Consecutive pieces of the converted text
+    """
+    pipeline = get_stream_pipeline(from_script, to_script)
+    if chunk_size < 1:
+        raise ValueError("chunk_size should be at least 1")
+    return pipeline.stream(iter_text_chunks(source, chunk_size))
+
+# Pairs whose rules behave at BATCH_SEPARATOR exactly like at the start/end of a text
+# (it is neither a word char, nor a space, nor a Devanagari/Arabic letter), so that
+# several texts can be converted in a single call.
+BATCH_SEPARATOR = '\x00'
+JOINABLE_PAIRS = {
+    ('hi-IN', 'ur-PK'),
+    ('ur-PK', 'hi-IN'),
+    ('sd-IN', 'sd-PK'),
+}
+
+def _convert_batch(convert, texts, joinable):
+    # Convert each distinct text only once
+    outputs = dict.fromkeys(texts)
+    if joinable:
+        joined = [text for text in outputs if BATCH_SEPARATOR not in text]
+        converted = convert(BATCH_SEPARATOR.join(joined)).split(BATCH_SEPARATOR)
+        if len(converted) == len(joined):
+            outputs.update(zip(joined, converted))
+    for text, output in outputs.items():
+        if output is None:
+            outputs[text] = convert(text)
+    return [outputs[text] for text in texts]
+
+def _iter_batches(convert, texts, joinable, batch_size):
+    batch = []
+    for text in texts:
+        batch.append(text)
+        if len(batch) == batch_size:
+            yield from _convert_batch(convert, batch, joinable)
+            batch = []
+    if batch:
+        yield from _convert_batch(convert, batch, joinable)
+
+def script_convert_batch(texts, from_script: str, to_script: str, batch_size: int = 512):
+    """
+    Convert many texts between the required scripts, giving the same results as calling
+    `script_convert()` on each of them.
+
+    The texts are processed `batch_size` at a time: duplicates within a batch are converted
+    once, and for pairs in JOINABLE_PAIRS, the whole batch is converted in a single pass.
+
+    Args:
+        texts (iterable of str): Texts to be converted (can be a generator)
+        from_script (str): Source script (e.g., 'gu-IN', 'ur-PK')
+        to_script (str): Target script (e.g., 'ur-PK', 'gu-IN')
+        batch_size (int): Number of texts converted together
+
+    Returns:
+        generator of str: Converted texts, in input order (yielded lazily, batch by batch)
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size should be at least 1")
+    convert = get_delegate(from_script, to_script)
+    return _iter_batches(convert, texts, (from_script, to_script) in JOINABLE_PAIRS, batch_size)
+
+# Set in each worker process of script_convert_parallel()
+_worker_pair = None
+
+def _init_parallel_worker(from_script, to_script, word_cache_maxsize):
+    global _worker_pair
+    _worker_pair = (from_script, to_script)
+    warmup([_worker_pair])
+    if word_cache_maxsize is not None:
+        enable_word_cache([_worker_pair], word_cache_maxsize)
+
+def _convert_chunk(texts):
+    return list(script_convert_batch(texts, *_worker_pair, batch_size=len(texts)))
+
+def _iter_parallel(texts, pair, workers, chunksize, max_pending_chunks):
+    import multiprocessing
+    texts = iter(texts)
+    word_cache = _word_caches.get(pair)
+    word_cache_maxsize = word_cache.cache_info().maxsize if word_cache else None
+    with multiprocessing.Pool(workers, _init_parallel_worker, (*pair, word_cache_maxsize)) as pool:
+        pending = deque()
+        while True:
+            # Keep a bounded number of chunks in flight, so that inputs are consumed lazily
+            while len(pending) < max_pending_chunks:
+                chunk = list(islice(texts, chunksize))
+                if not chunk:
+                    break
+                pending.append(pool.apply_async(_convert_chunk, (chunk,)))
+            if not pending:
+                break
+            yield from pending.popleft().get()
+
+def script_convert_parallel(texts, from_script: str, to_script: str, workers: int = None, chunksize: int = 256):
+    """
+    Convert many texts on a pool of worker processes, giving the same results (in the
+    same order) as calling `script_convert()` on each of them.
+
+    Each worker builds its converter once when it starts (with its own word cache, if
+    enabled for the pair); only the texts and their conversions are sent between
+    processes, `chunksize` texts at a time.
+
+    Args:
+        texts (iterable of str): Texts to be converted (can be a generator)
+        from_script (str): Source script (e.g., 'gu-IN', 'ur-PK')
+        to_script (str): Target script (e.g., 'ur-PK', 'gu-IN')
+        workers (int): Number of worker processes (defaults to the number of CPUs)
+        chunksize (int): Number of texts per task sent to a worker
+
+    Returns:
+        generator of str: Converted texts, in input order
+    """
+    get_delegate(from_script, to_script)
+    if chunksize < 1:
+        raise ValueError("chunksize should be at least 1")
+    workers = workers or os.cpu_count() or 1
+    return _iter_parallel(texts, (from_script, to_script), workers, chunksize, max_pending_chunks=4*workers)
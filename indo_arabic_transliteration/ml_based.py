@@ -1,15 +1,41 @@
-from indictrans import Transliterator
+import functools
+import threading
 
-MODELS = {
+# Models are loaded lazily, per pair, on first use
+MODEL_LANGUAGES = {
     # Hindustani languages
-    ('hi-IN', 'ur-PK'): Transliterator(source='hin', target='urd', build_lookup=True, rb=False),
-    ('ur-PK', 'hi-IN'): Transliterator(source='urd', target='hin', build_lookup=True, rb=False),
+    ('hi-IN', 'ur-PK'): ('hin', 'urd'),
+    ('ur-PK', 'hi-IN'): ('urd', 'hin'),
 
     # 🌟 Gujarati ↔ Urdu
-    ('gu-IN', 'ur-PK'): Transliterator(source='guj', target='urd', build_lookup=True, rb=False),
-    ('ur-PK', 'gu-IN'): Transliterator(source='urd', target='guj', build_lookup=True, rb=False),
+    ('gu-IN', 'ur-PK'): ('guj', 'urd'),
+    ('ur-PK', 'gu-IN'): ('urd', 'guj'),
 }
 
+MODELS = {}
+_models_lock = threading.Lock()
+
+# Bounded token -> output caches used by ml_transliterate_batch(), per pair
+CACHE_SIZE = 65536
+_caches = {}
+
+def get_model(from_script: str, to_script: str):
+    """
+    Returns the indictrans model for the given pair, loading it on first use (thread-safe).
+    """
+    if (from_script, to_script) not in MODEL_LANGUAGES:
+        raise ValueError(f"Unsupported conversion from {from_script} to {to_script}")
+
+    model = MODELS.get((from_script, to_script))
+    if model is None:
+        with _models_lock:
+            model = MODELS.get((from_script, to_script))
+            if model is None:
+                from indictrans import Transliterator
+                source, target = MODEL_LANGUAGES[(from_script, to_script)]
+                model = MODELS[(from_script, to_script)] = Transliterator(source=source, target=target, build_lookup=True, rb=False)
+    return model
+
 def ml_transliterate(text: str, from_script: str, to_script: str) -> str:
     """
     Machine-Learning-based Transliteration for the given `text` between required scripts.
@@ -22,7 +48,77 @@ def ml_transliterate(text: str, from_script: str, to_script: str) -> str:
     Returns:
         str: Transliterated text by models
     """
-    if (from_script, to_script) not in MODELS:
-        raise ValueError(f"Unsupported conversion from {from_script} to {to_script}")
+    return get_model(from_script, to_script).transform(text)
+
+def get_word_transliterator(model):
+    """
+    Returns the indictrans transliterator behind `model.transform` if it converts texts token by token
+    (viterbi decoding), else None.
+    """
+    transliterator = getattr(model.transform, '__self__', None)
+    if getattr(model.transform, '__name__', None) != 'transliterate':
+        return None
+    if not all(hasattr(transliterator, name) for name in ('convert_to_wx', 'case_trans', 'non_alpha', 'space', 'tab')):
+        return None
+    return transliterator
+
+def get_cached_transform(from_script: str, to_script: str):
+    """
+    Returns the transliterator of the pair's model (None if it cannot be split into tokens), and
+    its token conversion (else the whole `transform()`) memoized in an LRU cache of CACHE_SIZE entries.
+    """
+    cached = _caches.get((from_script, to_script))
+    if cached is None:
+        model = get_model(from_script, to_script)
+        with _models_lock:
+            cached = _caches.get((from_script, to_script))
+            if cached is None:
+                transliterator = get_word_transliterator(model)
+                convert = model.transform if transliterator is None else transliterator.case_trans
+                cached = _caches[(from_script, to_script)] = (transliterator, functools.lru_cache(maxsize=CACHE_SIZE)(convert))
+    return cached
 
-    return MODELS[(from_script, to_script)].transform(text)
+def split_tokens(transliterator, text):
+    # Same steps as indictrans' transliterate(): the whole text is normalized first (its rules
+    # can look across words), then each line is split into words and separators
+    text = transliterator.convert_to_wx(text)
+    text = text.replace('\t', transliterator.tab).replace(' ', transliterator.space)
+    return [line if not line.strip() else transliterator.non_alpha.split(line) for line in text.split('\n')]
+
+def join_tokens(transliterator, lines, outputs):
+    text = '\n'.join(line if isinstance(line, str) else ''.join(outputs[token] for token in line) for line in lines)
+    return text.replace(transliterator.space, ' ').replace(transliterator.tab, '\t')
+
+def ml_transliterate_batch(texts, from_script: str, to_script: str) -> list:
+    """
+    Machine-Learning-based Transliteration for many texts, with the same output as `ml_transliterate()`
+    on each of them. Each text is normalized and split into tokens like the model does, and the model
+    runs only once per distinct token: across the whole batch, and across calls (for the last CACHE_SIZE
+    distinct tokens of each pair).
+
+    Args:
+        texts (iterable of str): Texts to be converted
+        from_script (str): Source script (e.g., 'gu-IN', 'ur-PK')
+        to_script (str): Target script (e.g., 'ur-PK', 'gu-IN')
+
+    Returns:
+        list of str: Transliterated texts, in input order
+    """
+    transliterator, convert = get_cached_transform(from_script, to_script)
+    texts = list(texts)
+    if transliterator is None:
+        outputs = {text: convert(text) for text in dict.fromkeys(texts)}
+        return [outputs[text] for text in texts]
+
+    lines = {text: split_tokens(transliterator, text) for text in dict.fromkeys(texts)}
+    tokens = dict.fromkeys(token for text_lines in lines.values() for line in text_lines if not isinstance(line, str) for token in line)
+    outputs = {token: convert(token) for token in tokens}
+    outputs = {text: join_tokens(transliterator, text_lines, outputs) for text, text_lines in lines.items()}
+    return [outputs[text] for text in texts]
+
+def ml_cache_info(from_script: str, to_script: str):
+    """
+    Returns the (hits, misses, maxsize, currsize) statistics of the token cache of a pair, or None if not used yet.
+    """
+    cached = _caches.get((from_script, to_script))
+    return cached[1].cache_info() if cached else None
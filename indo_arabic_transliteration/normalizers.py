@@ -0,0 +1,233 @@
+'''
+Built-in equivalents of the urduhack and indic_nlp_library normalizers used by the converters,
+with their exact character mappings precomputed into str.translate() tables (plus a couple
+of regexes for the few multi-character rules), so that each text is normalized in 1-3 passes.
+Only the default options of the libraries are supported. Their output is identical to the
+libraries' (checked with benchmarks/validate_normalizers.py, which needs them installed).
+Unlike the libraries, they can also normalize a text streamed in chunks, with `stream()`.
+'''
+import re
+
+from .str_mapper import iter_table_matches, stream_translate
+
+# urduhack.urdu_characters.URDU_DIACRITICS, removed by urduhack's remove_diacritics()
+URDU_DIACRITICS = '\u064e\u064b\u0670\u0650\u064f\u064d'
+
+# urduhack's normalize_characters(): correct character -> its variants (presentation forms, Arabic letters...)
+CORRECT_URDU_CHARACTERS = {
+    'آ': 'ﺁﺂ',
+    'أ': 'ﺃ',
+    'ا': 'ﺍﺎ',
+    'ب': 'ﺏﺐﺑﺒ',
+    'پ': 'ﭖﭘﭙ',
+    'ت': 'ﺕﺖﺗﺘ',
+    'ٹ': 'ﭦﭧﭨﭩ',
+    'ث': 'ﺛﺜﺚ',
+    'ج': 'ﺝﺞﺟﺠ',
+    'ح': 'ﺡﺣﺤﺢ',
+    'خ': 'ﺧﺨﺦ',
+    'د': 'ﺩﺪ',
+    'ذ': 'ﺬﺫ',
+    'ر': 'ﺭﺮ',
+    'ز': 'ﺯﺰ',
+    'س': 'ﺱﺲﺳﺴ',
+    'ش': 'ﺵﺶﺷﺸ',
+    'ص': 'ﺹﺺﺻﺼ',
+    'ض': 'ﺽﺾﺿﻀ',
+    'ط': 'ﻃﻄ',
+    'ظ': 'ﻅﻇﻈ',
+    'ع': 'ﻉﻊﻋﻌ',
+    'غ': 'ﻍﻏﻐ',
+    'ف': 'ﻑﻒﻓﻔ',
+    'ق': 'ﻕﻖﻗﻘ',
+    'ل': 'ﻝﻞﻟﻠ',
+    'م': 'ﻡﻢﻣﻤ',
+    'ن': 'ﻥﻦﻧﻨ',
+    'چ': 'ﭺﭻﭼﭽ',
+    'ڈ': 'ﮈﮉ',
+    'ڑ': 'ﮍﮌ',
+    'ژ': 'ﮋ',
+    'ک': 'ﮎﮏﮐﮑﻛك',
+    'گ': 'ﮒﮓﮔﮕ',
+    'ں': 'ﮞﮟ',
+    'و': 'ﻮﻭﻮ',
+    'ؤ': 'ﺅ',
+    'ھ': 'ﮪﮬﮭﻬﻫﮫ',
+    'ہ': 'ﻩﮦﻪﮧﮩﮨه',
+    'ۃ': 'ة',
+    'ء': 'ﺀ',
+    'ی': 'ﯼىﯽﻰﻱﻲﯾﯿي',
+    'ئ': 'ﺋﺌ',
+    'ے': 'ﮮﮯﻳﻴ',
+    '۰': '٠',
+    '۱': '١',
+    '۲': '٢',
+    '۳': '٣',
+    '۴': '٤',
+    '۵': '٥',
+    '۶': '٦',
+    '۷': '٧',
+    '۸': '٨',
+    '۹': '٩',
+    'لا': 'ﻻﻼ',
+    '': 'ـ',
+}
+
+# urduhack's normalize_combine_characters(): letter + combining mark -> precomposed letter
+COMBINE_URDU_CHARACTERS = {
+    '\u0627\u0653': '\u0622',
+    '\u0627\u0654': '\u0623',
+    '\u06d2\u0654': '\u06d3',
+}
+COMBINE_URDU_CHARACTERS_REGEX = re.compile('|'.join(COMBINE_URDU_CHARACTERS))
+
+def make_translator(mapping):
+    '''
+    Returns (str.translate() table, regex finding the chars it changes) for a char -> str mapping.
+    '''
+    return str.maketrans(mapping), re.compile('[%s]' % ''.join(map(re.escape, sorted(mapping))))
+
+class UrduNormalizer:
+    '''
+    Same output as urduhack's `normalize_combine_characters(normalize_characters(remove_diacritics(text)))`,
+    followed by the single-char replacements of `extra_map` (which must not touch any char of those steps).
+    '''
+    def __init__(self, extra_map=None):
+        mapping = dict.fromkeys(URDU_DIACRITICS, '')
+        for correct_character, variants in CORRECT_URDU_CHARACTERS.items():
+            mapping.update(dict.fromkeys(variants, correct_character))
+
+        if extra_map:
+            used_chars = set(mapping).union(*mapping.values(), *COMBINE_URDU_CHARACTERS, *COMBINE_URDU_CHARACTERS.values())
+            for key, value in extra_map.items():
+                if len(key) != 1 or key in used_chars or not used_chars.isdisjoint(value):
+                    raise ValueError(f"Cannot fuse the replacement of {key!r} with {value!r}")
+            mapping.update(extra_map)
+        self.table, self.regex = make_translator(mapping)
+
+    def normalize(self, text):
+        if self.regex.search(text):
+            text = text.translate(self.table)
+        if '\u0653' in text or '\u0654' in text:
+            text = COMBINE_URDU_CHARACTERS_REGEX.sub(lambda match: COMBINE_URDU_CHARACTERS[match.group(0)], text)
+        return text
+
+    def stream(self, chunks):
+        chunks = (chunk.translate(self.table) for chunk in chunks)
+        return stream_translate(chunks, iter_table_matches(COMBINE_URDU_CHARACTERS_REGEX, (COMBINE_URDU_CHARACTERS,)), 0, 2)
+
+# indicnlp's BaseNormalizer.normalize(), with the default options (including _normalize_punctuations())
+INDIC_COMMON_MAP = {
+    '\ufeff': '', '\ufffe': '', '\u2060': '', '\u00ad': '', # Byte order marks, word joiner, soft hyphen
+    '\u200b': ' ', '\u00a0': ' ', # Zero-width space, no-break space
+    '\u200c': '', '\u200d': '', # ZWNJ, ZWJ
+    '„': '"', '“': '"', '”': '"', '–': '-', '—': ' - ',
+    '´': "'", '‘': "'", '‚': "'", '’': "'", '…': '...',
+}
+
+DOUBLE_QUOTE_REGEX = re.compile("''")
+
+class IndicNormalizer:
+    '''
+    Base of the built-in equivalents of indicnlp's normalizers (with their default options).
+
+    Args:
+        script_map (dict): Single-char replacements of the script (nukta decompositions, danda...),
+            made after the common ones (none of them may produce a char replaced by the other)
+        script_range (str): Regex char range of the script, for the visarga correction
+        visarga (str): Visarga of the script, replacing ':' after a char of the script
+    '''
+    def __init__(self, script_map, script_range, visarga):
+        self.table, self.regex = make_translator({**INDIC_COMMON_MAP, **script_map})
+        self.visarga_regex = re.compile(f'([{script_range}]):')
+        self.visarga = visarga
+        self.visarga_replacement = '\\1' + visarga
+
+    def normalize(self, text):
+        if self.regex.search(text):
+            text = text.translate(self.table)
+        # After the quotes of INDIC_COMMON_MAP (nothing else produces any)
+        text = text.replace("''", '"')
+        if ':' in text:
+            text = self.visarga_regex.sub(self.visarga_replacement, text)
+        return text
+
+    def iter_visarga_matches(self, text, pos, last):
+        for match in self.visarga_regex.finditer(text, pos):
+            yield match.start(), match.end(), match.group(1) + self.visarga
+
+    def stream(self, chunks):
+        chunks = (chunk.translate(self.table) for chunk in chunks)
+        chunks = stream_translate(chunks, iter_table_matches(DOUBLE_QUOTE_REGEX, ({"''": '"'},)), 0, 2)
+        return stream_translate(chunks, self.iter_visarga_matches, 0, 2)
+
+DEVANAGARI_NUKTA = '\u093c'
+
+# indicnlp's DevanagariNormalizer.normalize(), after the common normalization
+DEVANAGARI_NORMALIZATION_MAP = {
+    '\u0972': '\u090f', # Marathi chandra a
+    '\u0929': '\u0928' + DEVANAGARI_NUKTA,
+    '\u0931': '\u0930' + DEVANAGARI_NUKTA,
+    '\u0934': '\u0933' + DEVANAGARI_NUKTA,
+    '\u0958': '\u0915' + DEVANAGARI_NUKTA,
+    '\u0959': '\u0916' + DEVANAGARI_NUKTA,
+    '\u095a': '\u0917' + DEVANAGARI_NUKTA,
+    '\u095b': '\u091c' + DEVANAGARI_NUKTA,
+    '\u095c': '\u0921' + DEVANAGARI_NUKTA,
+    '\u095d': '\u0922' + DEVANAGARI_NUKTA,
+    '\u095e': '\u092b' + DEVANAGARI_NUKTA,
+    '\u095f': '\u092f' + DEVANAGARI_NUKTA,
+    '|': '\u0964',
+}
+
+class DevanagariNormalizer(IndicNormalizer):
+    '''
+    Same output as `indicnlp.normalize.indic_normalize.DevanagariNormalizer().normalize()`.
+    '''
+    def __init__(self):
+        super().__init__(DEVANAGARI_NORMALIZATION_MAP, '\u0900-\u097f', '\u0903')
+
+GURMUKHI_NUKTA = '\u0a3c'
+
+# indicnlp's GurmukhiNormalizer: independent vowels written as vowel-bearer + vowel sign
+GURMUKHI_VOWELS_MAP = {
+    '\u0a05\u0a3e': '\u0a06',
+    '\u0a72\u0a3f': '\u0a07',
+    '\u0a72\u0a40': '\u0a08',
+    '\u0a73\u0a41': '\u0a09',
+    '\u0a73\u0a42': '\u0a0a',
+    '\u0a72\u0a47': '\u0a0f',
+    '\u0a05\u0a48': '\u0a10',
+    '\u0a73\u0a4b': '\u0a13',
+    '\u0a05\u0a4c': '\u0a14',
+}
+GURMUKHI_VOWELS_REGEX = re.compile('|'.join(GURMUKHI_VOWELS_MAP))
+
+# indicnlp's GurmukhiNormalizer.normalize(), after the common normalization
+GURMUKHI_NORMALIZATION_MAP = {
+    '\u0a33': '\u0a32' + GURMUKHI_NUKTA,
+    '\u0a36': '\u0a38' + GURMUKHI_NUKTA,
+    '\u0a59': '\u0a16' + GURMUKHI_NUKTA,
+    '\u0a5a': '\u0a17' + GURMUKHI_NUKTA,
+    '\u0a5b': '\u0a1c' + GURMUKHI_NUKTA,
+    '\u0a5e': '\u0a2b' + GURMUKHI_NUKTA,
+    '\u0a64': '\u0964',
+    '\u0a65': '\u0965',
+    '|': '\u0964',
+}
+
+class GurmukhiNormalizer(IndicNormalizer):
+    '''
+    Same output as `indicnlp.normalize.indic_normalize.GurmukhiNormalizer().normalize()`.
+    '''
+    def __init__(self):
+        super().__init__(GURMUKHI_NORMALIZATION_MAP, '\u0a00-\u0a7f', '\u0a03')
+
+    def normalize(self, text):
+        # Vowels are composed before the common normalization (which could join a bearer and a sign)
+        text = GURMUKHI_VOWELS_REGEX.sub(lambda match: GURMUKHI_VOWELS_MAP[match.group(0)], text)
+        return super().normalize(text)
+
+    def stream(self, chunks):
+        chunks = stream_translate(chunks, iter_table_matches(GURMUKHI_VOWELS_REGEX, (GURMUKHI_VOWELS_MAP,)), 0, 2)
+        return super().stream(chunks)
@@ -0,0 +1,122 @@
+'''
+Opt-in per-stage instrumentation of the rule-based converters:
+
+    with StageProfiler() as profiler:
+        script_convert(text, 'ur-PK', 'hi-IN')
+    print(profiler.report())
+
+While a profiler is active, every stage of the conversion pipelines (and the normalizers)
+records its wall time, calls, input/output lengths and, for table passes, match counts.
+A profiler only records the thread (or asyncio task) which entered it. When none is active,
+stages only pay for a lookup of `active_profiler`.
+'''
+import contextvars
+import functools
+import re
+import threading
+import time
+
+# The profiler recording the stages of the current context, see StageProfiler
+active_profiler = contextvars.ContextVar('active_profiler', default=None)
+
+class StageStats:
+    __slots__ = ('calls', 'seconds', 'input_chars', 'output_chars', 'matches')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.input_chars = 0
+        self.output_chars = 0
+        self.matches = 0
+
+def count_matches(matcher, text):
+    '''
+    Number of replacements a translation pass with `matcher` (regex or TrieMatcher) makes in `text`.
+    '''
+    if isinstance(matcher, re.Pattern):
+        return sum(1 for _ in matcher.finditer(text))
+    return matcher.count(text)
+
+class StageProfiler:
+    '''
+    Context manager recording the stages run while it is active, in `stats` (stage name -> StageStats).
+    Stages are named after the converter attributes they use, prefixed with their pipeline and position.
+    Only the stages run in the context which entered it are recorded (other threads and asyncio tasks
+    are not, unless they run in a copy of that context, see contextvars.copy_context()).
+
+    Args:
+        callback (callable): Also called as `callback(name, seconds, input, output, matches)` after each stage
+        count_matches (bool): Count the matches of table passes (which scans their input again, outside the timings)
+    '''
+    def __init__(self, callback=None, count_matches=True):
+        self.callback = callback
+        self.count_matches = count_matches
+        self.stats = {}
+        self.lock = threading.Lock()
+        self.tokens = []
+
+    def __enter__(self):
+        self.tokens.append(active_profiler.set(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        active_profiler.reset(self.tokens.pop())
+
+    def run(self, name, stage, text, matcher=None):
+        start = time.perf_counter()
+        output = stage(text)
+        seconds = time.perf_counter() - start
+        matches = count_matches(matcher, text) if matcher is not None and self.count_matches else 0
+
+        with self.lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = StageStats()
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.input_chars += len(text)
+            stats.output_chars += len(output)
+            stats.matches += matches
+        if self.callback:
+            self.callback(name, seconds, text, output, matches)
+        return output
+
+    def report(self):
+        '''
+        Returns a table of the stages, slowest first.
+        '''
+        width = max(map(len, self.stats), default=5)
+        lines = [f"{'stage':<{width}} {'calls':>9} {'seconds':>10} {'%':>6} {'in chars':>11} {'out chars':>11} {'matches':>9}"]
+        total = sum(stats.seconds for stats in self.stats.values()) or 1
+        for name, stats in sorted(self.stats.items(), key=lambda item: -item[1].seconds):
+            lines.append(f"{name:<{width}} {stats.calls:>9} {stats.seconds:>10.4f} {100*stats.seconds/total:>6.1f} "
+                         f"{stats.input_chars:>11} {stats.output_chars:>11} {stats.matches:>9}")
+        return '\n'.join(lines)
+
+    def counters(self, prefix='indo_xlit_stage'):
+        '''
+        Returns the stats as Prometheus-style counters, e.g. {'indo_xlit_stage_seconds_total{stage="..."}': 1.5}.
+        '''
+        counters = {}
+        for name, stats in self.stats.items():
+            label = '{stage="%s"}' % name.replace('\\', '\\\\').replace('"', '\\"')
+            for field in StageStats.__slots__:
+                counters[f'{prefix}_{field}_total{label}'] = getattr(stats, field)
+        return counters
+
+    def reset(self):
+        with self.lock:
+            self.stats = {}
+
+def profiled(method):
+    '''
+    Decorator recording a converter method `method(self, text, ...)` as a stage when profiling.
+    '''
+    name = method.__qualname__
+    @functools.wraps(method)
+    def wrapper(self, text, *args, **kwargs):
+        profiler = active_profiler.get()
+        if profiler is None:
+            return method(self, text, *args, **kwargs)
+        return profiler.run(name, lambda text: method(self, text, *args, **kwargs), text)
+    return wrapper
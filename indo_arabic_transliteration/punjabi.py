@@ -1,23 +1,39 @@
+from .brahmic import BrahmicTranslator
 from .hindustani import HindustaniTransliterator
+from .normalizers import DevanagariNormalizer, GurmukhiNormalizer
+from .str_mapper import get_translator
 
 class PunjabiTransliterator(HindustaniTransliterator):
-    def __init__(self):
-        super().__init__()
+    DIRECTION_ATTRIBUTES = {
+        'gurmukhi->shahmukhi': ('gurmukhi_normalizer', 'gurmukhi_to_devanagari', 'hindi_to_urdu_pipeline'),
+        'shahmukhi->gurmukhi': ('urdu_to_hindi_lexicon', 'urdu_to_hindi_pipeline', 'devanagari_to_gurmukhi'),
+    }
+    # The HindustaniTransliterator direction each direction goes through
+    HINDUSTANI_DIRECTIONS = {'gurmukhi->shahmukhi': 'hi->ur', 'shahmukhi->gurmukhi': 'ur->hi'}
 
-        from indicnlp.normalize.indic_normalize import GurmukhiNormalizer
-        self.gurmukhi_normalizer = GurmukhiNormalizer()
+    def __init__(self, directions=None):
+        # With `directions` (e.g. {'shahmukhi->gurmukhi'}), only the tables of those conversions are ever built
+        directions = self.get_directions(directions)
+        super().__init__(directions={self.HINDUSTANI_DIRECTIONS[direction] for direction in directions})
+        self.directions = directions
 
-        from aksharamukha.transliterate import process
-        self.aksharamukha_xlit = process
+        if 'gurmukhi->shahmukhi' in directions:
+            self.gurmukhi_normalizer = get_translator(GurmukhiNormalizer)
+            self.gurmukhi_to_devanagari = get_translator(BrahmicTranslator, 'Gurmukhi', 'Devanagari')
+        if 'shahmukhi->gurmukhi' in directions:
+            self.devanagari_to_gurmukhi = get_translator(BrahmicTranslator, 'Devanagari', 'Gurmukhi')
 
     def transliterate_from_gurmukhi_to_shahmukhi(self, text):
         text = self.gurmukhi_normalizer.normalize(text)
-        text = self.aksharamukha_xlit("Gurmukhi", "Devanagari", text)
+        text = self.gurmukhi_to_devanagari.translate(text)
         return self.transliterate_from_hindi_to_urdu(text)
 
     def transliterate_from_shahmukhi_to_gurmukhi(self, text):
         text = self.transliterate_from_urdu_to_hindi(text)
-        return self.aksharamukha_xlit("Devanagari", "Gurmukhi", text)
+        return self.transliterate_from_devanagari_to_gurmukhi(text)
+
+    def transliterate_from_devanagari_to_gurmukhi(self, text):
+        return self.devanagari_to_gurmukhi.translate(text)
 
     def __call__(self, text, src_lang, dest_lang, nativize=False):
         if src_lang == 'pa' and dest_lang == 'pnb':
@@ -31,20 +47,30 @@ class PunjabiTransliterator(HindustaniTransliterator):
 # -----------------------------
 
 class GujaratiTransliterator(HindustaniTransliterator):
-    def __init__(self):
-        super().__init__()
+    DIRECTION_ATTRIBUTES = {
+        'gujarati->urdu': ('gujarati_normalizer', 'gujarati_to_devanagari', 'hindi_to_urdu_pipeline'),
+        'urdu->gujarati': ('urdu_to_hindi_lexicon', 'urdu_to_hindi_pipeline', 'devanagari_to_gujarati'),
+    }
+    # The HindustaniTransliterator direction each direction goes through
+    HINDUSTANI_DIRECTIONS = {'gujarati->urdu': 'hi->ur', 'urdu->gujarati': 'ur->hi'}
 
-        from indicnlp.normalize.indic_normalize import DevanagariNormalizer
-        self.gujarati_normalizer = DevanagariNormalizer()
+    def __init__(self, directions=None):
+        # With `directions` (e.g. {'urdu->gujarati'}), only the tables of those conversions are ever built
+        directions = self.get_directions(directions)
+        super().__init__(directions={self.HINDUSTANI_DIRECTIONS[direction] for direction in directions})
+        self.directions = directions
 
-        from aksharamukha.transliterate import process
-        self.aksharamukha_xlit = process
+        if 'gujarati->urdu' in directions:
+            self.gujarati_normalizer = get_translator(DevanagariNormalizer)
+            self.gujarati_to_devanagari = get_translator(BrahmicTranslator, 'Gujarati', 'Devanagari')
+        if 'urdu->gujarati' in directions:
+            self.devanagari_to_gujarati = get_translator(BrahmicTranslator, 'Devanagari', 'Gujarati')
 
     def transliterate_from_gujarati_to_urdu(self, text):
         """Convert Gujarati script text to Urdu-Arabic"""
         text = self.gujarati_normalizer.normalize(text)
         # First convert Gujarati → Devanagari (if needed)
-        dev_text = self.aksharamukha_xlit("Gujarati", "Devanagari", text)
+        dev_text = self.gujarati_to_devanagari.translate(text)
         # Then Devanagari → Urdu
         return self.transliterate_from_hindi_to_urdu(dev_text)
 
@@ -53,7 +79,10 @@ class GujaratiTransliterator(HindustaniTransliterator):
         # First convert Urdu → Devanagari
         dev_text = self.transliterate_from_urdu_to_hindi(text)
         # Then Devanagari → Gujarati
-        return self.aksharamukha_xlit("Devanagari", "Gujarati", dev_text)
+        return self.transliterate_from_devanagari_to_gujarati(dev_text)
+
+    def transliterate_from_devanagari_to_gujarati(self, text):
+        return self.devanagari_to_gujarati.translate(text)
 
     def __call__(self, text, src_lang, dest_lang, nativize=False):
         if src_lang == 'gu' and dest_lang == 'ur':
@@ -1,4 +1,14 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from .sangam_cache import DEFAULT_CACHE_PATH, OfflineCacheMiss, SangamCache
 
 BASE_URL = "http://sangam.learnpunjabi.org/SindhiTransliteration.asmx/"
 
@@ -20,7 +30,50 @@ ENDPOINTS = {
     ('gu-PK', 'gu-IN'): BASE_URL + 'Urdu2Hindi',  # Urdu→Gujarati via Urdu→Devanagari
 }
 
-def online_transliterate(text: str, from_script: str, to_script: str, retry_attempts=5) -> str:
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 30
+
+def get_endpoint(from_script: str, to_script: str) -> str:
+    try:
+        return ENDPOINTS[(from_script, to_script)]
+    except KeyError:
+        raise ValueError(f"Unsupported conversion from {from_script} to {to_script}")
+
+def get_backoff_delay(attempt: int, base_delay: float = RETRY_BASE_DELAY, max_delay: float = RETRY_MAX_DELAY) -> float:
+    """
+    Exponential backoff with full jitter: a random delay (in seconds) before retrying for the `attempt`-th time (from 0).
+    """
+    return random.uniform(0, min(max_delay, base_delay * 2**attempt))
+
+# Used by online_transliterate() when no `cache` is passed, see enable_cache()
+_default_cache = None
+
+def enable_cache(path: str = DEFAULT_CACHE_PATH, max_entries: int = 1000000, ttl: float = None, offline: bool = False) -> SangamCache:
+    """
+    Remember the responses of the SANGAM API in a persistent cache, used by all later
+    `online_transliterate()` calls.
+
+    Args:
+        path (str): SQLite database file
+        max_entries (int): Maximum number of responses kept (least recently used ones are evicted first)
+        ttl (float): Time (in seconds) after which a response is fetched again. Defaults to never.
+        offline (bool): Only read from the cache, never hitting the network (misses raise OfflineCacheMiss)
+
+    Returns:
+        SangamCache: The cache in use
+    """
+    global _default_cache
+    disable_cache()
+    _default_cache = SangamCache(path, max_entries, ttl, offline)
+    return _default_cache
+
+def disable_cache() -> None:
+    global _default_cache
+    if _default_cache is not None:
+        _default_cache.close()
+        _default_cache = None
+
+def online_transliterate(text: str, from_script: str, to_script: str, retry_attempts=5, cache: SangamCache = None) -> str:
     """
     Transliterate the given `text` between required scripts using SANGAM API.
 
@@ -28,26 +81,213 @@ def online_transliterate(text: str, from_script: str, to_script: str, retry_atte
         text (str): Text to be converted
         from_script (str): Source script (e.g., 'gu-IN', 'gu-PK')
         to_script (str): Target script (e.g., 'gu-PK', 'gu-IN')
+        cache (SangamCache): Cache of responses to use. Defaults to the one set by enable_cache(), if any.
 
     Returns:
         str: Transliterated text from SANGAM server
     """
-    try:
-        api_url = ENDPOINTS[(from_script, to_script)]
-    except KeyError:
-        raise ValueError(f"Unsupported conversion from {from_script} to {to_script}")
+    api_url = get_endpoint(from_script, to_script)
+    if cache is None:
+        cache = _default_cache
+    if cache is not None:
+        output = cache.get(api_url, text)
+        if output is not None:
+            return output
+        if cache.offline:
+            raise OfflineCacheMiss(f"No cached response from {api_url} for: {text!r}")
 
     for i in range(retry_attempts):
         try:
             response = requests.post(api_url, json={'input': text}, timeout=5)
-            return response.json()['d']
+            output = response.json()['d']
+            if cache is not None:
+                cache.set(api_url, text, output)
+            return output
         except (requests.exceptions.Timeout, KeyError):
             if i == retry_attempts - 1:
                 raise
-            continue
+            time.sleep(get_backoff_delay(i))
 
     raise requests.exceptions.Timeout("Failed to get response after multiple attempts.")
 
+# Errors after which a request is retried by AsyncSangamClient
+RETRY_EXCEPTIONS = (requests.exceptions.Timeout, requests.exceptions.ConnectionError, KeyError)
+
+# Joins the texts packed in one request (see AsyncSangamClient)
+PACK_SEPARATOR = '\n'
+
+class AsyncSangamClient:
+    '''
+    asyncio client for the SANGAM API, over a shared pool of keep-alive connections.
+
+    At most `concurrency` requests are in flight, started at most `rate_limit` times per second
+    (if given). Failed requests are retried with exponential backoff and jitter. With `pack_chars`,
+    short texts are joined by newlines into requests of up to `pack_chars` chars (falling back to
+    one request per text if the response does not have as many lines).
+    '''
+    def __init__(self, concurrency=8, rate_limit=None, retry_attempts=5, timeout=5, pack_chars=0, cache=None):
+        self.concurrency = concurrency
+        self.rate_limit = rate_limit
+        self.retry_attempts = retry_attempts
+        self.timeout = timeout
+        self.pack_chars = pack_chars
+        self.cache = cache
+
+        # `requests` is blocking, so requests run on a thread pool
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.executor = ThreadPoolExecutor(concurrency, thread_name_prefix='sangam')
+
+        self.rate_lock = threading.Lock()
+        self.next_request_time = 0.0
+
+    def get_cache(self):
+        return self.cache if self.cache is not None else _default_cache
+
+    def get_cached(self, api_url, text):
+        cache = self.get_cache()
+        if cache is None:
+            return None
+        output = cache.get(api_url, text)
+        if output is None and cache.offline:
+            raise OfflineCacheMiss(f"No cached response from {api_url} for: {text!r}")
+        return output
+
+    async def wait_rate_limit(self):
+        if not self.rate_limit:
+            return
+        with self.rate_lock:
+            now = time.monotonic()
+            start = max(now, self.next_request_time)
+            self.next_request_time = start + 1 / self.rate_limit
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    def post(self, api_url, text):
+        response = self.session.post(api_url, json={'input': text}, timeout=self.timeout)
+        return response.json()['d']
+
+    async def request(self, api_url, text):
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.retry_attempts):
+            await self.wait_rate_limit()
+            try:
+                return await loop.run_in_executor(self.executor, self.post, api_url, text)
+            except RETRY_EXCEPTIONS:
+                if attempt == self.retry_attempts - 1:
+                    raise
+                await asyncio.sleep(get_backoff_delay(attempt))
+
+    def pack(self, texts):
+        packs = deque()
+        pack, pack_len = [], 0
+        for text in texts:
+            if PACK_SEPARATOR in text or len(text) >= self.pack_chars:
+                packs.append([text])
+                continue
+            if pack and pack_len + len(PACK_SEPARATOR) + len(text) > self.pack_chars:
+                packs.append(pack)
+                pack, pack_len = [], 0
+            pack_len += len(text) + (len(PACK_SEPARATOR) if pack else 0)
+            pack.append(text)
+        if pack:
+            packs.append(pack)
+        return packs
+
+    async def convert_pack(self, api_url, pack):
+        if len(pack) > 1:
+            outputs = (await self.request(api_url, PACK_SEPARATOR.join(pack))).split(PACK_SEPARATOR)
+            if len(outputs) == len(pack):
+                return outputs
+        return [await self.request(api_url, text) for text in pack]
+
+    async def transliterate(self, text: str, from_script: str, to_script: str) -> str:
+        api_url = get_endpoint(from_script, to_script)
+        output = self.get_cached(api_url, text)
+        if output is None:
+            output = await self.request(api_url, text)
+            cache = self.get_cache()
+            if cache is not None:
+                cache.set(api_url, text, output)
+        return output
+
+    async def transliterate_many(self, texts, from_script: str, to_script: str) -> list:
+        '''
+        Converts the texts (each distinct one only once), returning the outputs in input order.
+        '''
+        api_url = get_endpoint(from_script, to_script)
+        texts = list(texts)
+        outputs = dict.fromkeys(texts)
+        for text in outputs:
+            outputs[text] = self.get_cached(api_url, text)
+        packs = self.pack(text for text, output in outputs.items() if output is None)
+        cache = self.get_cache()
+
+        async def worker():
+            while packs:
+                pack = packs.popleft()
+                for text, output in zip(pack, await self.convert_pack(api_url, pack)):
+                    outputs[text] = output
+                    if cache is not None:
+                        cache.set(api_url, text, output)
+
+        await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(packs)))))
+        return [outputs[text] for text in texts]
+
+    def close(self):
+        self.executor.shutdown()
+        self.session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
+def get_shared_client() -> AsyncSangamClient:
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = AsyncSangamClient()
+        return _shared_client
+
+async def async_online_transliterate(text: str, from_script: str, to_script: str) -> str:
+    """
+    Same as `online_transliterate()`, for asyncio code. Concurrent calls share a pool of
+    keep-alive connections (see AsyncSangamClient for more control).
+    """
+    return await get_shared_client().transliterate(text, from_script, to_script)
+
+def online_transliterate_many(texts, from_script: str, to_script: str, concurrency: int = 8, rate_limit: float = None,
+                              retry_attempts: int = 5, pack_chars: int = 0, cache: SangamCache = None) -> list:
+    """
+    Transliterate many texts using SANGAM API, with up to `concurrency` requests in flight.
+
+    Args:
+        texts (iterable of str): Texts to be converted
+        from_script (str): Source script (e.g., 'gu-IN', 'gu-PK')
+        to_script (str): Target script (e.g., 'gu-PK', 'gu-IN')
+        concurrency (int): Maximum number of simultaneous requests
+        rate_limit (float): Maximum number of requests started per second. Defaults to no limit.
+        retry_attempts (int): Attempts per request, with exponential backoff in-between
+        pack_chars (int): If set, short texts are sent together, in requests of up to this many chars
+        cache (SangamCache): Cache of responses to use. Defaults to the one set by enable_cache(), if any.
+
+    Returns:
+        list of str: Transliterated texts, in input order
+    """
+    get_endpoint(from_script, to_script)
+    client = AsyncSangamClient(concurrency, rate_limit, retry_attempts, pack_chars=pack_chars, cache=cache)
+    try:
+        return asyncio.run(client.transliterate_many(texts, from_script, to_script))
+    finally:
+        client.close()
+
 # Alias for easier use
 convert = online_transliterate
 
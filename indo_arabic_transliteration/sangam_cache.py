@@ -0,0 +1,132 @@
+import os
+import pathlib
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_PATH = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+                                  'indo_arabic_transliteration', 'sangam.sqlite3')
+
+# Access times of cache hits are written in batches of this size (see SangamCache.flush)
+ACCESS_BATCH_SIZE = 1000
+# Eviction runs every EVICT_INTERVAL inserts, or once max_entries is exceeded by EVICT_HEADROOM (a fraction of it)
+EVICT_INTERVAL = 1000
+EVICT_HEADROOM = 0.01
+
+class OfflineCacheMiss(LookupError):
+    '''
+    Raised in offline mode for texts which are not in the cache.
+    '''
+
+class SangamCache:
+    '''
+    Persistent (SQLite) cache of Sangam API responses, keyed by (endpoint, text).
+
+    Args:
+        path (str): Database file (created if missing, unless `offline`)
+        max_entries (int): Once exceeded (by EVICT_HEADROOM), the least recently used entries are evicted
+        ttl (float): Entries older than `ttl` seconds are ignored and evicted (None: never expire)
+        offline (bool): Open the database read-only; lookups never fall back to the network
+    '''
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=1000000, ttl=None, offline=False):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.offline = offline
+        self.lock = threading.Lock()
+        # (endpoint, text) -> last access time, not yet written to the database
+        self.accessed = {}
+        self.inserts = 0
+
+        if offline:
+            self.db = sqlite3.connect(pathlib.Path(path).absolute().as_uri() + '?mode=ro', uri=True, check_same_thread=False)
+        else:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            with self.db:
+                self.db.execute('CREATE TABLE IF NOT EXISTS responses (endpoint TEXT, input TEXT, output TEXT, created REAL, accessed REAL, PRIMARY KEY (endpoint, input))')
+                self.db.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+                self.db.execute('CREATE INDEX IF NOT EXISTS responses_created ON responses (created)')
+            (self.count,) = self.db.execute('SELECT COUNT(*) FROM responses').fetchone()
+
+    def get(self, endpoint, text):
+        '''
+        Returns the cached output for `text`, or None if missing (or expired).
+        '''
+        now = time.time()
+        with self.lock:
+            row = self.db.execute('SELECT output, created FROM responses WHERE endpoint = ? AND input = ?', (endpoint, text)).fetchone()
+            if row is None or (self.ttl is not None and now - row[1] > self.ttl):
+                return None
+            if not self.offline:
+                self.accessed[endpoint, text] = now
+                if len(self.accessed) >= ACCESS_BATCH_SIZE:
+                    with self.db:
+                        self._flush()
+        return row[0]
+
+    def set(self, endpoint, text, output):
+        if self.offline:
+            return
+        now = time.time()
+        with self.lock, self.db:
+            self.accessed.pop((endpoint, text), None)
+            if self.db.execute('INSERT OR IGNORE INTO responses VALUES (?, ?, ?, ?, ?)', (endpoint, text, output, now, now)).rowcount:
+                self.count += 1
+            else:
+                self.db.execute('UPDATE responses SET output = ?, created = ?, accessed = ? WHERE endpoint = ? AND input = ?', (output, now, now, endpoint, text))
+            self.inserts += 1
+            if self.inserts >= EVICT_INTERVAL or (self.max_entries is not None and self.count > self.max_entries * (1 + EVICT_HEADROOM)):
+                self._evict(now)
+
+    def _flush(self):
+        if self.accessed:
+            self.db.executemany('UPDATE responses SET accessed = ? WHERE endpoint = ? AND input = ?',
+                                [(accessed, endpoint, text) for (endpoint, text), accessed in self.accessed.items()])
+            self.accessed.clear()
+
+    def _evict(self, now):
+        self._flush()
+        if self.ttl is not None:
+            self.db.execute('DELETE FROM responses WHERE created < ?', (now - self.ttl,))
+        (self.count,) = self.db.execute('SELECT COUNT(*) FROM responses').fetchone()
+        if self.max_entries is not None and self.count > self.max_entries:
+            self.db.execute('DELETE FROM responses WHERE rowid IN (SELECT rowid FROM responses ORDER BY accessed LIMIT ?)', (self.count - self.max_entries,))
+            self.count = self.max_entries
+        self.inserts = 0
+
+    def flush(self):
+        '''
+        Writes the pending access times of cache hits (also done on eviction and on close).
+        '''
+        if self.offline:
+            return
+        with self.lock, self.db:
+            self._flush()
+
+    def evict(self):
+        '''
+        Removes the expired entries, and the least recently used ones beyond `max_entries`.
+        '''
+        if self.offline:
+            return
+        with self.lock, self.db:
+            self._evict(time.time())
+
+    def clear(self):
+        if self.offline:
+            return
+        with self.lock, self.db:
+            self.db.execute('DELETE FROM responses')
+            self.accessed.clear()
+            self.count = 0
+
+    def __len__(self):
+        with self.lock:
+            return self.db.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def close(self):
+        self.flush()
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,361 @@
+'''
+Local HTTP transliteration service (stdlib asyncio, HTTP/1.1 with keep-alive):
+
+    indo-xlit-server --port 8080 --workers 4 --max-delay-ms 2
+
+    POST /convert  {"text": "...", "from": "ur-PK", "to": "hi-IN"} -> {"output": "..."}
+                   ("texts": [...] -> "outputs": [...]; "method": "ml" for the Machine-Learning models)
+    GET  /health   Liveness
+    GET  /ready    Readiness: 200 once every worker has loaded its converters (503 before)
+    GET  /metrics  Prometheus-style counters: requests, texts, chars, batches, errors and latencies per pair
+
+Concurrent requests for the same pair are coalesced into micro-batches: a batch is dispatched
+to the worker pool when it reaches `--max-batch-size` texts, or `--max-delay-ms` after its first
+request, whichever comes first. Each worker process loads its converters once, when it starts.
+'''
+import argparse
+import asyncio
+import json
+import os
+import signal
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from . import ml_based, mapper
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+MAX_BODY_SIZE = 16 * 1024 * 1024
+
+STATUS_REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable',
+}
+
+def _init_worker(pairs, ml_pairs):
+    mapper.warmup(pairs)
+    for pair in ml_pairs:
+        ml_based.get_model(*pair)
+
+def _ping():
+    time.sleep(0.01) # Leaves the next task to another worker
+    return os.getpid()
+
+def convert_batch(method, from_script, to_script, texts):
+    if method == 'ml':
+        return ml_based.ml_transliterate_batch(texts, from_script, to_script)
+    return list(mapper.script_convert_batch(texts, from_script, to_script, batch_size=len(texts)))
+
+class MicroBatcher:
+    '''
+    Coalesces the texts submitted concurrently into batches, run by `dispatch(texts)` (a coroutine function
+    returning their outputs): a batch is dispatched once it has `max_batch_size` texts, or `max_delay` seconds
+    after its first text.
+    '''
+    def __init__(self, dispatch, max_delay, max_batch_size):
+        self.dispatch = dispatch
+        self.max_delay = max_delay
+        self.max_batch_size = max_batch_size
+        self.pending = [] # (texts, future) of the requests waiting for the next batch
+        self.pending_texts = 0
+        self.timer = None
+        self.batches = self.batch_texts = 0
+
+    async def submit(self, texts):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((texts, future))
+        self.pending_texts += len(texts)
+        if self.pending_texts >= self.max_batch_size:
+            self.flush()
+        elif self.timer is None:
+            self.timer = loop.call_later(self.max_delay, self.flush)
+        return await future
+
+    def flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        batch, self.pending, self.pending_texts = self.pending, [], 0
+        if batch:
+            asyncio.ensure_future(self.run(batch))
+
+    async def run(self, batch):
+        texts = [text for request_texts, _ in batch for text in request_texts]
+        self.batches += 1
+        self.batch_texts += len(texts)
+        try:
+            outputs = await self.dispatch(texts)
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        start = 0
+        for request_texts, future in batch:
+            if not future.done():
+                future.set_result(outputs[start:start+len(request_texts)])
+            start += len(request_texts)
+
+def format_labels(labels):
+    return '{%s}' % ','.join('%s="%s"' % (name, str(value).replace('\\', '\\\\').replace('"', '\\"')) for name, value in labels)
+
+class ServerMetrics:
+    '''
+    Request counters and latency histograms, per (method, pair). Only updated from the event loop.
+    '''
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.requests, self.errors, self.texts, self.chars = Counter(), Counter(), Counter(), Counter()
+        self.latency_buckets = defaultdict(lambda: [0] * len(LATENCY_BUCKETS))
+        self.latency_sum = Counter()
+
+    def observe(self, key, texts, seconds, error=False):
+        self.requests[key] += 1
+        self.texts[key] += len(texts)
+        self.chars[key] += sum(map(len, texts))
+        self.latency_sum[key] += seconds
+        buckets = self.latency_buckets[key]
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                buckets[index] += 1
+        if error:
+            self.errors[key] += 1
+
+    def render(self, batchers, ready, prefix='indo_xlit'):
+        uptime = time.perf_counter() - self.start
+        lines = [
+            f'{prefix}_server_uptime_seconds {uptime:.3f}',
+            f'{prefix}_server_ready {int(ready)}',
+            f'{prefix}_server_texts_per_second {sum(self.texts.values()) / uptime:.3f}',
+        ]
+        for key in sorted(self.requests):
+            method, from_script, to_script = key
+            labels = [('method', method), ('pair', f'{from_script}:{to_script}')]
+            label = format_labels(labels)
+            lines.append(f'{prefix}_requests_total{label} {self.requests[key]}')
+            lines.append(f'{prefix}_request_errors_total{label} {self.errors[key]}')
+            lines.append(f'{prefix}_texts_total{label} {self.texts[key]}')
+            lines.append(f'{prefix}_chars_total{label} {self.chars[key]}')
+            lines.append(f'{prefix}_batches_total{label} {batchers[key].batches}')
+            lines.append(f'{prefix}_batch_texts_total{label} {batchers[key].batch_texts}')
+            for bound, count in zip(LATENCY_BUCKETS, self.latency_buckets[key]):
+                lines.append(f'{prefix}_request_seconds_bucket{format_labels(labels + [("le", bound)])} {count}')
+            lines.append(f'{prefix}_request_seconds_bucket{format_labels(labels + [("le", "+Inf")])} {self.requests[key]}')
+            lines.append(f'{prefix}_request_seconds_sum{label} {self.latency_sum[key]:.6f}')
+            lines.append(f'{prefix}_request_seconds_count{label} {self.requests[key]}')
+        return '\n'.join(lines) + '\n'
+
+class TransliterationServer:
+    '''
+    The HTTP service (see the module docstring).
+
+    Args:
+        pairs (iterable): Rule-based pairs served, warmed up in every worker. Defaults to all the pairs in mapper.DELEGATES.
+        ml_pairs (iterable): Machine-Learning pairs served. Defaults to all the pairs in ml_based.MODEL_LANGUAGES.
+        warm_ml (bool): Also load the models of `ml_pairs` in every worker when it starts (otherwise on first use)
+        workers (int): Number of worker processes (defaults to the number of CPUs). 0 converts in a thread of the server process.
+        max_delay (float): Seconds a request may wait for others to join its batch
+        max_batch_size (int): Number of texts which triggers a batch right away
+    '''
+    def __init__(self, pairs=None, ml_pairs=None, warm_ml=False, workers=None, max_delay=0.002, max_batch_size=256):
+        self.pairs = [tuple(pair) for pair in (mapper.DELEGATES if pairs is None else pairs)]
+        self.ml_pairs = [tuple(pair) for pair in (ml_based.MODEL_LANGUAGES if ml_pairs is None else ml_pairs)]
+        for from_script, to_script in self.pairs:
+            mapper.get_delegate(from_script, to_script)
+        for from_script, to_script in self.ml_pairs:
+            if (from_script, to_script) not in ml_based.MODEL_LANGUAGES:
+                raise ValueError(f"Unsupported conversion from {from_script} to {to_script}")
+        if max_delay < 0 or max_batch_size < 1:
+            raise ValueError("max_delay should be positive, and max_batch_size at least 1")
+        self.warm_ml = warm_ml
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_delay = max_delay
+        self.max_batch_size = max_batch_size
+
+        self.metrics = ServerMetrics()
+        self.batchers = {}
+        for method, pairs in (('rules', self.pairs), ('ml', self.ml_pairs)):
+            for from_script, to_script in pairs:
+                key = (method, from_script, to_script)
+                self.batchers[key] = MicroBatcher(self.make_dispatch(key), max_delay, max_batch_size)
+        self.executor = self.server = self.warming = None
+
+    def make_dispatch(self, key):
+        async def dispatch(texts):
+            return await asyncio.get_running_loop().run_in_executor(self.executor, convert_batch, *key, texts)
+        return dispatch
+
+    async def warm_up(self):
+        # Until every worker has run a task, i.e. started and loaded its converters
+        loop = asyncio.get_running_loop()
+        pids = set()
+        while len(pids) < max(self.workers, 1):
+            pids.update(await asyncio.gather(*[loop.run_in_executor(self.executor, _ping) for _ in range(max(self.workers, 1))]))
+        return pids
+
+    @property
+    def ready(self):
+        return self.warming is not None and self.warming.done() and not self.warming.cancelled() and self.warming.exception() is None
+
+    async def start(self, host='127.0.0.1', port=8080):
+        initargs = (self.pairs, self.ml_pairs if self.warm_ml else [])
+        if self.workers:
+            self.executor = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=initargs)
+        else:
+            self.executor = ThreadPoolExecutor(1, initializer=_init_worker, initargs=initargs)
+        self.warming = asyncio.ensure_future(self.warm_up())
+        self.server = await asyncio.start_server(self.handle_connection, host, port)
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.warming is not None and not self.warming.done():
+            self.warming.cancel()
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                parts = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                if len(parts) != 3 or not headers.get('content-length', '0').isdigit():
+                    await self.respond(writer, 400, {'error': 'Malformed request'}, keep_alive=False)
+                    break
+                method, target, version = parts
+                length = int(headers.get('content-length', '0'))
+                if length > MAX_BODY_SIZE:
+                    await self.respond(writer, 413, {'error': f'Request bodies are limited to {MAX_BODY_SIZE} bytes'}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                status, payload = await self.route(method, target.split('?', 1)[0], body)
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, payload, keep_alive):
+        if isinstance(payload, str):
+            body, content_type = payload.encode('utf-8'), 'text/plain; version=0.0.4; charset=utf-8'
+        else:
+            body, content_type = json.dumps(payload, ensure_ascii=False).encode('utf-8'), 'application/json; charset=utf-8'
+        head = (f'HTTP/1.1 {status} {STATUS_REASONS[status]}\r\nContent-Type: {content_type}\r\n'
+                f'Content-Length: {len(body)}\r\nConnection: {"keep-alive" if keep_alive else "close"}\r\n\r\n')
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    async def route(self, method, path, body):
+        routes = {
+            '/convert': ('POST', lambda: self.handle_convert(body)),
+            '/health': ('GET', self.handle_health),
+            '/ready': ('GET', self.handle_ready),
+            '/metrics': ('GET', self.handle_metrics),
+        }
+        if path not in routes:
+            return 404, {'error': f'No such endpoint: {path}'}
+        allowed_method, handler = routes[path]
+        if method != allowed_method:
+            return 405, {'error': f'{path} expects {allowed_method}'}
+        try:
+            return await handler()
+        except Exception as error:
+            # Still answer (and keep the connection usable) on unexpected errors
+            return 500, {'error': repr(error)}
+
+    async def handle_health(self):
+        return 200, {'status': 'ok'}
+
+    async def handle_ready(self):
+        if self.ready:
+            return 200, {'status': 'ready', 'workers': len(set(self.warming.result()))}
+        if self.warming is not None and self.warming.done() and not self.warming.cancelled():
+            return 503, {'status': 'failed', 'error': repr(self.warming.exception())}
+        return 503, {'status': 'warming up'}
+
+    async def handle_metrics(self):
+        return 200, self.metrics.render(self.batchers, self.ready)
+
+    async def handle_convert(self, body):
+        try:
+            request = json.loads(body)
+            key = (request.get('method', 'rules'), request['from'], request['to'])
+            texts = request['texts'] if 'texts' in request else [request['text']]
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return 400, {'error': 'Expected a JSON object with "text" (or "texts"), "from" and "to"'}
+        if not all(isinstance(field, str) for field in key):
+            return 400, {'error': '"from", "to" and "method" should be strings'}
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            return 400, {'error': '"text" should be a string, and "texts" a list of strings'}
+        batcher = self.batchers.get(key)
+        if batcher is None:
+            return 400, {'error': f"Unsupported conversion from {key[1]} to {key[2]} (method: {key[0]})"}
+
+        start = time.perf_counter()
+        try:
+            outputs = await batcher.submit(texts) if texts else []
+        except Exception as error:
+            self.metrics.observe(key, texts, time.perf_counter() - start, error=True)
+            return 500, {'error': repr(error)}
+        self.metrics.observe(key, texts, time.perf_counter() - start)
+        return 200, {'outputs': outputs} if 'texts' in request else {'output': outputs[0]}
+
+def parse_pairs(pairs):
+    return None if pairs is None else [tuple(pair.split(':')) for pair in pairs]
+
+async def serve(server, host, port):
+    await server.start(host, port)
+    serving = asyncio.ensure_future(server.server.serve_forever())
+    # Stop cleanly (with the worker processes) on SIGTERM/SIGINT
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(signal_number, serving.cancel)
+        except NotImplementedError: # Windows
+            pass
+    try:
+        await serving
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await server.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='indo-xlit-server', description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, help='Number of worker processes (default: number of CPUs, 0: none)')
+    parser.add_argument('--pairs', nargs='*', help='Rule-based pairs served, as FROM:TO (default: all)')
+    parser.add_argument('--ml-pairs', nargs='*', help='Machine-Learning pairs served, as FROM:TO (default: all)')
+    parser.add_argument('--warm-ml', action='store_true', help='Load the models when the workers start')
+    parser.add_argument('--max-delay-ms', type=float, default=2.0, help='Latency window of the micro-batches (default: 2)')
+    parser.add_argument('--max-batch-size', type=int, default=256, help='Number of texts dispatched right away (default: 256)')
+    args = parser.parse_args(argv)
+
+    try:
+        server = TransliterationServer(parse_pairs(args.pairs), parse_pairs(args.ml_pairs), args.warm_ml, args.workers,
+                                       args.max_delay_ms / 1000, args.max_batch_size)
+    except ValueError as error:
+        parser.exit(2, f'indo-xlit-server: {error}\n')
+    try:
+        asyncio.run(serve(server, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,9 @@
-import re
-import pandas as pd
+from types import MappingProxyType
+
 from .base import BaseIndoArabicTransliterator
-from .str_mapper import StringTranslator
+from .common import devanagari_nuqta_consonants_simplifier
+from .str_mapper import RegexRuleTranslator, StringTranslator, TranslatorPipeline, char_local, get_shared, get_translator
+from .tables import load_table
 
 URDU_TO_SINDHI = {
     'ی': 'ي',
@@ -9,6 +11,10 @@ URDU_TO_SINDHI = {
 }
 sindhi_postprocessor = str.maketrans(URDU_TO_SINDHI)
 
+@char_local
+def nativize_sindhi(text):
+    return text.translate(sindhi_postprocessor)
+
 SINDHI_PREPROCESS_MAP = {
     # Lazy people write like these
     ' ء ': ' ۽ ',
@@ -25,97 +31,161 @@ SINDHI_PREPROCESS_MAP = {
 }
 sindhi_preprocessor = StringTranslator(SINDHI_PREPROCESS_MAP)
 
+# Each list is applied in one scan, after the previous one (see RegexRuleTranslator),
+# paired with its (lookbehind, lookahead) window
+SINDHI_NORMALIZE_RULES = [
+    ([
+        (r'ھ(?=\w)', 'ه'),
+        (r'(?<=[^ڙجگ])ھ', 'ه'), # Except final {گھ, جھ, ڙھ}, all other do-chasmi endings can be converted to Arabic he
+
+        # Ensure the isolated characters have space around them
+        (r'\s۾[^\w ]', lambda text: ' ۾ ' + text[-1]),
+    ], (1, 3)),
+    ([
+        (r'\s۽[^\w ]', lambda text: ' ۽ ' + text[-1]),
+    ], (0, 3)),
+]
+DEVANAGARI_SINDHI_NORMALIZE_RULES = [
+    ([(r'\sमें\s', ' में ')], (0, 5)),
+    ([(r'\sऐं\s', ' ऐं ')], (0, 4)),
+]
+
 CONSONANT_MAP_FILES = ['sindhi_consonants.csv']
 ADDITIONAL_FINAL_MAP_FILES = ['sindhi_final.csv']
 ISOLATED_MAP_FILES = ['sindhi_isolated.csv']
 
+def load_sindhi_maps(data_dir, final_map, cleanup_map):
+    '''
+    Returns the (read-only) map of the isolated letters, and the final and cleanup maps extended with the Sindhi letters.
+    '''
+    isolated_sindhi_to_devanagari_map = {}
+    final_map, cleanup_map = dict(final_map), dict(cleanup_map)
+
+    for map_file in ISOLATED_MAP_FILES:
+        for sindhi_letter, roman_letter, devanagari_letter, *_ in load_table(data_dir, map_file):
+            isolated_sindhi_to_devanagari_map[' '+sindhi_letter+' '] = ' '+devanagari_letter+' '
+            cleanup_map[sindhi_letter] = devanagari_letter
+    
+    for map_file in ADDITIONAL_FINAL_MAP_FILES:
+        for arabic_letter, roman_letter, devanagari_letter, *_ in load_table(data_dir, map_file):
+            final_map[arabic_letter] = devanagari_letter
+    
+    return MappingProxyType(isolated_sindhi_to_devanagari_map), MappingProxyType(final_map), MappingProxyType(cleanup_map)
+
+sindhi_normalizers = [RegexRuleTranslator(rules, window) for rules, window in SINDHI_NORMALIZE_RULES]
+devanagari_sindhi_normalizers = [RegexRuleTranslator(rules, window) for rules, window in DEVANAGARI_SINDHI_NORMALIZE_RULES]
+
 
 class SindhiTransliterator(BaseIndoArabicTransliterator):
-    def __init__(self):
+    DIRECTION_ATTRIBUTES = {
+        'sindhi->devanagari': ('sindhi_to_devanagari_pipeline',),
+        'devanagari->sindhi': ('devanagari_to_sindhi_pipeline',),
+    }
+
+    def __init__(self, compile_pipeline=False, directions=None):
         super().__init__(CONSONANT_MAP_FILES)
-        self.isolated_sindhi_to_devanagari_map = {}
+        # With `directions` (e.g. {'sindhi->devanagari'}), only the tables of those conversions are ever built
+        self.directions = self.get_directions(directions)
+        self.isolated_sindhi_to_devanagari_map, self.final_arabic_to_devanagari_map, self.arabic_to_devanagari_cleanup_pass = get_shared(
+            ('sindhi_maps', self.data_dir, tuple(CONSONANT_MAP_FILES)),
+            lambda: load_sindhi_maps(self.data_dir, self.final_arabic_to_devanagari_map, self.arabic_to_devanagari_cleanup_pass))
         
-        for map_file in ISOLATED_MAP_FILES:
-            df = pd.read_csv(self.data_dir+map_file, header=None)
-            for i in df.columns:
-                sindhi_letter, roman_letter, devanagari_letter = str(df[i][0]).strip(), str(df[i][1]).strip(), str(df[i][2]).strip()
-                self.isolated_sindhi_to_devanagari_map[' '+sindhi_letter+' '] = ' '+devanagari_letter+' '
-                self.arabic_to_devanagari_cleanup_pass[sindhi_letter] = devanagari_letter
-        
-        for map_file in ADDITIONAL_FINAL_MAP_FILES:
-            df = pd.read_csv(self.data_dir+map_file, header=None)
-            for i in df.columns:
-                arabic_letter, roman_letter, devanagari_letter = str(df[i][0]).strip(), str(df[i][1]).strip(), str(df[i][2]).strip()
-                self.final_arabic_to_devanagari_map[arabic_letter] = devanagari_letter
-        
-        self.isolated_sindhi_to_devanagari_converter = StringTranslator(self.isolated_sindhi_to_devanagari_map)
-        self.final_arabic_to_devanagari_converter = StringTranslator(self.final_arabic_to_devanagari_map, match_final_only=True)
-        self.arabic_to_devanagari_final_cleanup = StringTranslator(self.arabic_to_devanagari_cleanup_pass)
-    
-    def arabic_normalize(self, text):
-        text = super().arabic_normalize(text)
-        text = text.replace('ے', 'ی')
-        text = sindhi_preprocessor.translate(text)
-        text = re.sub(r"ھ\B", "ه", text)
-        text = re.sub('([^ڙجگ])ھ', r'\1ه', text) # Except final {گھ, جھ, ڙھ}, all other do-chasmi endings can be converted to Arabic he
+        self.isolated_sindhi_to_devanagari_converter = get_translator(StringTranslator, self.isolated_sindhi_to_devanagari_map)
+        self.final_arabic_to_devanagari_converter = get_translator(StringTranslator, self.final_arabic_to_devanagari_map, match_final_only=True)
+        self.arabic_to_devanagari_final_cleanup = get_translator(StringTranslator, self.arabic_to_devanagari_cleanup_pass)
+        self.sindhi_normalizers = sindhi_normalizers
+        self.devanagari_sindhi_normalizers = devanagari_sindhi_normalizers
 
-        # Ensure the isolated characters have space around them
-        text = re.sub(r"\s۾([^\w ])", r" ۾ \1", text)
-        text = re.sub(r"\s۽([^\w ])", r" ۽ \1", text)
-        return text
+        # With `compile_pipeline`, independent passes are fused into fewer scans (same output)
+        if 'sindhi->devanagari' in self.directions:
+            self.sindhi_to_devanagari_pipeline = TranslatorPipeline(self.get_sindhi_to_devanagari_stages(), fuse=compile_pipeline, name='sindhi_to_devanagari', owner=self)
+        if 'devanagari->sindhi' in self.directions:
+            self.devanagari_to_sindhi_pipeline = TranslatorPipeline(self.get_devanagari_to_sindhi_stages(), fuse=compile_pipeline, name='devanagari_to_sindhi', owner=self)
+    
+    def get_arabic_normalize_stages(self):
+        return super().get_arabic_normalize_stages() + [
+            char_local(lambda text: text.replace('ے', 'ی')),
+            sindhi_preprocessor.translate,
+            *[normalizer.translate for normalizer in self.sindhi_normalizers],
+        ]
     
+    def get_sindhi_to_devanagari_stages(self):
+        return [
+            (self.isolated_sindhi_to_devanagari_converter, False),
+            (self.initial_arabic_to_devanagari_converter, False),
+
+            # Convert Hamza-combos first, then remaining hamza
+            (self.hamza_combo_to_devanagari_converter, False),
+            (self.hamza_to_devanagari_converter, False),
+
+            (self.arabic_to_devanagari_converter_pass1, False),
+            (self.final_arabic_to_devanagari_converter, False),
+            char_local(lambda text: text.replace('ھ', 'ه')), # Now convert Urdu do-chashmi he into Arabic he
+            (self.arabic_to_devanagari_converter_pass2, False),
+            (self.arabic_to_devanagari_final_cleanup, False),
+            self.devanagari_postprocessor.translate, #  (جمهوریه) जमहवरयह -> जमहोरयह
+            self.devanagari_postprocessor.translate, # जमहोरयह -> जमहोरीह
+        ]
+
     def transliterate_from_sindhi_to_devanagari(self, text, nativize=False):
         text = self.arabic_normalize(text)
-        text = self.isolated_sindhi_to_devanagari_converter.translate(text)
-        text = self.initial_arabic_to_devanagari_converter.translate(text)
-
-        # Convert Hamza-combos first, then remaining hamza
-        text = self.hamza_combo_to_devanagari_converter.translate(text)
-        text = self.hamza_to_devanagari_converter.translate(text)
-
-        text = self.arabic_to_devanagari_converter_pass1.translate(text)
-        text = self.final_arabic_to_devanagari_converter.translate(text)
-        text = text.replace('ھ', 'ه') # Now convert Urdu do-chashmi he into Arabic he
-        text = self.arabic_to_devanagari_converter_pass2.translate(text)
-        text = self.arabic_to_devanagari_final_cleanup.translate(text)
-        text = self.devanagari_postprocessor.translate(text) #  (جمهوریه) जमहवरयह -> जमहोरयह
-        text = self.devanagari_postprocessor.translate(text) # जमहोरयह -> जमहोरीह
+        text = self.sindhi_to_devanagari_pipeline(text)
         if nativize:
             text = self.devanagari_nativize(text)
         return text
     
+    def get_devanagari_normalize_stages(self, abjadify_initial_vowels=False, drop_virama=False):
+        return super().get_devanagari_normalize_stages(abjadify_initial_vowels, drop_virama) + [
+            normalizer.translate for normalizer in self.devanagari_sindhi_normalizers
+        ]
+
     def devanagari_normalize(self, text, abjadify_initial_vowels=False, drop_virama=False):
-        text = super().devanagari_normalize(text, abjadify_initial_vowels, drop_virama)
-        text = re.sub(r"\sमें\s", " में ", text)
-        text = re.sub(r"\sऐं\s", " ऐं ", text)
-        return text
+        return super().devanagari_normalize(text, abjadify_initial_vowels, drop_virama)
     
-    def devanagari_remove_short_vowels(self, text):
-        text = super().devanagari_remove_short_vowels(text)
-        text = text.replace('े', 'ी') # Arabic-Sindhi (unfortunately) doesnot have bari ye
-        return text
+    def get_devanagari_remove_short_vowels_stages(self):
+        return super().get_devanagari_remove_short_vowels_stages() + [
+            char_local(lambda text: text.replace('े', 'ी')), # Arabic-Sindhi (unfortunately) doesnot have bari ye
+        ]
+
+    def get_devanagari_to_sindhi_stages(self):
+        return [
+            self.devanagari_initial_e_patcher.translate, # Patch: ए is present in both hamza and initial vowels, so handle first
+            (self.isolated_sindhi_to_devanagari_converter, True),
+
+            # Convert Devanagari-Hamza first, then hamza-combos
+            (self.hamza_to_devanagari_converter, True),
+            (self.hamza_combo_to_devanagari_converter, True),
+
+            (self.arabic_to_devanagari_converter_pass1, True),
+            *self.get_devanagari_remove_short_vowels_stages(), # Running it now since previous pass could have handled some short vowels (hamza_combos)
+            char_local(lambda text: text.replace('ा', 'ا')), # Regex finds 'ा' as a \b unfortunately. So a quick hack to avoid those confusions
+            (self.final_arabic_to_devanagari_converter, True),
+            char_local(lambda text: text.replace('ी', 'ی').replace('ो', 'و').replace('े', 'ی')), # In-case anything remains, should never happen tho
+            (self.initial_arabic_to_devanagari_converter, True),
+            char_local(lambda text: text.replace("ओ", "ؤ")),
+            (self.arabic_to_devanagari_converter_pass2, True),
+            (self.arabic_to_devanagari_final_cleanup, True),
+        ]
 
     def transliterate_from_devanagari_to_sindhi(self, text, nativize=False):
         text = self.devanagari_normalize(text)
-        text = re.sub('((^|[^\u0900-\u0963\u0972-\u097f]))ए', '\\1ای', text) # Patch: ए is present in both hamza and initial vowels, so handle first
-        text = self.isolated_sindhi_to_devanagari_converter.reverse_translate(text)
-
-        # Convert Devanagari-Hamza first, then hamza-combos
-        text = self.hamza_to_devanagari_converter.reverse_translate(text)
-        text = self.hamza_combo_to_devanagari_converter.reverse_translate(text)
-
-        text = self.arabic_to_devanagari_converter_pass1.reverse_translate(text)
-        text = self.devanagari_remove_short_vowels(text) # Running it now since previous pass could have handled some short vowels (hamza_combos)
-        text = text.replace('ा', 'ا') # Regex finds 'ा' as a \b unfortunately. So a quick hack to avoid those confusions
-        text = self.final_arabic_to_devanagari_converter.reverse_translate(text)
-        text = text.replace('ी', 'ی').replace('ो', 'و').replace('े', 'ی') # In-case anything remains, should never happen tho
-        text = self.initial_arabic_to_devanagari_converter.reverse_translate(text)
-        text = text.replace("ओ", "ؤ")
-        text = self.arabic_to_devanagari_converter_pass2.reverse_translate(text)
-        text = self.arabic_to_devanagari_final_cleanup.reverse_translate(text)
+        text = self.devanagari_to_sindhi_pipeline(text)
         if nativize:
-            text = text.translate(sindhi_postprocessor)
+            text = nativize_sindhi(text)
         return text
+
+    # Whole conversions as pipeline stages, for TranslatorPipeline.stream() (see mapper.script_convert_stream())
+    def get_sindhi_to_devanagari_stream_stages(self, nativize=False):
+        stages = [*self.get_arabic_normalize_stages(), self.sindhi_to_devanagari_pipeline]
+        if nativize:
+            stages.append(devanagari_nuqta_consonants_simplifier.translate)
+        return stages
+
+    def get_devanagari_to_sindhi_stream_stages(self, nativize=False):
+        stages = [*self.get_devanagari_normalize_stages(), self.devanagari_to_sindhi_pipeline]
+        if nativize:
+            stages.append(nativize_sindhi)
+        return stages
     
     def __call__(self, text, src_lang, dest_lang, nativize=False):
         if dest_lang == 'sd':
@@ -165,8 +235,8 @@ class GujaratiTransliterator(BaseIndoArabicTransliterator):
 
         # Optional: Load post-processing mappings
         try:
-            postprocess_df = pd.read_csv(os.path.join(self.data_dir, 'gujarati/postprocess.csv'), header=None)
-            self.gujarati_postprocess_map = {str(row[0]).strip(): str(row[1]).strip() for _, row in postprocess_df.iterrows()}
+            postprocess_table = load_table(self.data_dir, 'gujarati/postprocess.csv')
+            self.gujarati_postprocess_map = dict(zip(postprocess_table[0], postprocess_table[1]))
             self.gujarati_postprocessor = StringTranslator(self.gujarati_postprocess_map)
         except FileNotFoundError:
             self.gujarati_postprocessor = StringTranslator({})
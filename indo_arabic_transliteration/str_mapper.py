@@ -1,4 +1,68 @@
 import re
+import threading
+from collections.abc import Mapping
+from functools import cached_property
+from itertools import chain
+from types import MappingProxyType
+
+from . import profiling
+
+BACKENDS = ('regex', 'trie')
+DEFAULT_BACKEND = 'regex'
+
+def set_default_backend(backend):
+    '''
+    Select the matching backend used by StringTranslator objects constructed from now on.
+    '''
+    global DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+    DEFAULT_BACKEND = backend
+
+# Process-wide registry of shared (immutable) translators and tables, see get_shared()
+_registry = {}
+_registry_lock = threading.RLock()
+
+def freeze(value):
+    '''
+    Returns a hashable equivalent of `value` (nested dicts, lists, tuples and sets), to be used as a registry key.
+    '''
+    if isinstance(value, Mapping):
+        # Flat (key, value, key, value, ...) tuple, to keep the registry keys small
+        return (Mapping, tuple(chain.from_iterable((key, freeze(item)) for key, item in value.items())))
+    if isinstance(value, (list, tuple)):
+        return tuple(map(freeze, value))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    return value
+
+def get_shared(key, build):
+    '''
+    Returns the object registered under `key`, registering `build()` first if there is none.
+    Registered objects are shared by every converter of the process, so they must never be mutated.
+    '''
+    shared = _registry.get(key)
+    if shared is None:
+        with _registry_lock:
+            shared = _registry.get(key)
+            if shared is None:
+                shared = _registry[key] = build()
+    return shared
+
+def get_translator(translator_class, *args, **kwargs):
+    '''
+    Returns a shared `translator_class(*args, **kwargs)`: translators built from equal arguments
+    (and with the same backend) are built once per process, whichever converter asks for them.
+    '''
+    key = (translator_class, freeze(args), freeze(sorted(kwargs.items())), kwargs.get('backend') or DEFAULT_BACKEND)
+    return get_shared(key, lambda: translator_class(*args, **kwargs))
+
+def clear_registry():
+    '''
+    Forgets the shared translators (converters constructed afterwards build new ones).
+    '''
+    with _registry_lock:
+        _registry.clear()
 
 def sort_dict_by_descending_length(input_dict):
     output_dict = {}
@@ -6,34 +70,598 @@ def sort_dict_by_descending_length(input_dict):
         output_dict[k] = input_dict[k]
     return output_dict
 
-def get_regex_matcher_from_array(array, match_initial_only=False, match_final_only=False, boundary_regex=r'\b'):
+def get_regex_str_from_array(array, match_initial_only=False, match_final_only=False, boundary_regex=r'\b'):
     regex_str = '|'.join(map(re.escape, array))
     if match_initial_only:
         regex_str = boundary_regex + regex_str.replace('|', '|'+boundary_regex)
     if match_final_only:
         regex_str = regex_str.replace('|', boundary_regex+'|') + boundary_regex
-    return re.compile(regex_str)
+    return regex_str
+
+def get_regex_matcher_from_array(array, match_initial_only=False, match_final_only=False, boundary_regex=r'\b'):
+    return re.compile(get_regex_str_from_array(array, match_initial_only, match_final_only, boundary_regex))
+
+_TRIE_END = None
+
+class TrieMatcher:
+    '''
+    Character-trie equivalent of the alternation built by get_regex_matcher_from_array().
+    Like the regex, the earliest key (in array order) matching at a position wins,
+    which is the longest key when the array is sorted by descending length.
+
+    Further key groups can be added with add_group(); their keys rank after all the
+    keys of earlier groups, like `(group0)|(group1)|...` would in a regex.
+    '''
+    def __init__(self, array, match_initial_only=False, match_final_only=False, boundary_regex=r'\b'):
+        self.root = {}
+        self.groups = []
+        self.size = 0
+        self.add_group(array, match_initial_only, match_final_only, boundary_regex)
+
+    def add_group(self, array, match_initial_only=False, match_final_only=False, boundary_regex=r'\b'):
+        group = len(self.groups)
+        self.groups.append((match_initial_only, match_final_only, re.compile(boundary_regex)))
+        for priority, key in enumerate(array, self.size):
+            node = self.root
+            for char in key:
+                node = node.setdefault(char, {})
+            node.setdefault(_TRIE_END, []).append((priority, group))
+        self.size += len(array)
+        # Jump straight to characters which can start a key
+        self.starts = re.compile('[%s]' % ''.join(map(re.escape, sorted(self.root))))
+
+    def match_end(self, text, pos):
+        '''
+        Returns (end index, group) of the winning key starting at `pos`, or (-1, None) if none matches.
+        '''
+        groups = self.groups
+        node, end, best_priority, best_group = self.root, -1, None, None
+        for i in range(pos, len(text)):
+            node = node.get(text[i])
+            if node is None:
+                break
+            candidates = node.get(_TRIE_END)
+            if candidates is None:
+                continue
+            for priority, group in candidates:
+                if best_priority is not None and priority > best_priority:
+                    break
+                match_initial_only, match_final_only, boundary = groups[group]
+                if match_initial_only and not boundary.match(text, pos):
+                    continue
+                if match_final_only and not boundary.match(text, i+1):
+                    continue
+                end, best_priority, best_group = i+1, priority, group
+                break
+        return end, best_group
+
+    def sub(self, tables, text):
+        '''
+        Replaces every match using `tables[group]` of the group the matched key belongs to.
+        '''
+        pieces = []
+        last = pos = 0
+        search = self.starts.search
+        while True:
+            start = search(text, pos)
+            if start is None:
+                break
+            pos = start.start()
+            end, group = self.match_end(text, pos)
+            if end < 0:
+                pos += 1
+                continue
+            pieces.append(text[last:pos])
+            pieces.append(tables[group][text[pos:end]])
+            last = pos = end
+        if not last:
+            return text
+        pieces.append(text[last:])
+        return ''.join(pieces)
+
+    def finditer(self, text, pos=0):
+        '''
+        Yields the (start, end, group) of the keys sub() would replace, from `pos` on.
+        '''
+        search = self.starts.search
+        while True:
+            start = search(text, pos)
+            if start is None:
+                return
+            pos = start.start()
+            end, group = self.match_end(text, pos)
+            if end < 0:
+                pos += 1
+            else:
+                yield pos, end, group
+                pos = end
+
+    def count(self, text):
+        '''
+        Returns the number of replacements sub() would make.
+        '''
+        count = pos = 0
+        search = self.starts.search
+        while True:
+            start = search(text, pos)
+            if start is None:
+                return count
+            pos = start.start()
+            end, _ = self.match_end(text, pos)
+            if end < 0:
+                pos += 1
+            else:
+                count += 1
+                pos = end
+
+def get_trie_matcher_from_array(array, match_initial_only=False, match_final_only=False, boundary_regex=r'\b'):
+    return TrieMatcher(array, match_initial_only, match_final_only, boundary_regex)
+
+def replace_spans(text, spans):
+    '''
+    Replaces the given (start, end, replacement) spans of `text` (sorted, non-overlapping).
+    '''
+    pieces = []
+    last = 0
+    for start, end, replacement in spans:
+        pieces.append(text[last:start])
+        pieces.append(replacement)
+        last = end
+    if not last:
+        return text
+    pieces.append(text[last:])
+    return ''.join(pieces)
+
+def iter_table_matches(matcher, tables):
+    '''
+    Returns `iter_matches(text, pos, last)` for a scan replacing the keys found by `matcher` (a regex
+    or TrieMatcher) with their value in `tables[group]` (a regex without groups uses `tables[0]`).
+    '''
+    if isinstance(matcher, TrieMatcher):
+        def iter_matches(text, pos, last):
+            for start, end, group in matcher.finditer(text, pos):
+                yield start, end, tables[group][text[start:end]]
+    else:
+        def iter_matches(text, pos, last):
+            for match in matcher.finditer(text, pos):
+                yield match.start(), match.end(), tables[(match.lastindex or 1)-1][match.group(0)]
+    return iter_matches
+
+def stream_translate(chunks, iter_matches, lookbehind, lookahead):
+    '''
+    Runs a scan over the concatenation of the `chunks` (str), yielding its output incrementally,
+    while holding back only the text whose replacement is not decided yet.
+
+    The scan is given by `iter_matches(text, pos, last)`, which yields the (start, end, replacement)
+    of the spans it replaces from `pos` on (in order, none of them consuming text before `last`,
+    the end of the previous one). Whether a span starts at some position must only depend on the
+    `lookbehind` chars before it and the `lookahead` chars from it (span and right context included).
+    '''
+    lookbehind = max(lookbehind, 1) # Also keeps `^` from matching at the start of a kept context
+    buffer = ''
+    pos = last = 0 # First undecided position, end of the last replaced span
+    for chunk in chain(chunks, [None]):
+        if chunk is None:
+            safe = len(buffer)
+        else:
+            buffer += chunk
+            safe = len(buffer) - lookahead
+            if safe <= pos:
+                continue
+
+        pieces = []
+        for start, end, replacement in iter_matches(buffer, pos, last):
+            if start >= safe:
+                break
+            pieces.append(buffer[pos:start])
+            pieces.append(replacement)
+            pos = last = end
+        end = max(pos, safe)
+        pieces.append(buffer[pos:end])
+        output = ''.join(pieces)
+        if output:
+            yield output
+
+        keep = max(end - lookbehind, 0)
+        buffer = buffer[keep:]
+        pos, last = end - keep, max(last - keep, 0)
+
+def get_table_window(translation_dict, match_initial_only, match_final_only):
+    '''
+    Returns the (lookbehind, lookahead) of a translation pass, for stream_translate().
+    Boundaries are assumed to look at a single char on each side, like `\\b`.
+    '''
+    if '' in translation_dict:
+        raise ValueError("Cannot stream a translation with an empty key")
+    return int(match_initial_only), max(map(len, translation_dict), default=0) + int(match_final_only)
+
+def char_local(stage):
+    '''
+    Marks a pipeline stage as converting each char on its own (like str.translate()),
+    so that it can be streamed by converting each chunk independently.
+    '''
+    stage.char_local = True
+    return stage
 
 class StringTranslator:
     '''
     A re-implementation of str.maketrans() to support multi-letter keys.
     More details: https://stackoverflow.com/q/63230213
+
+    `backend` picks the matching engine ('regex' or 'trie'); both give identical output.
+    Maps with an empty key (or no keys at all) always use the regex backend.
+
+    `reverse_overrides` replaces (or adds) entries of the reverse map, for values which several keys map to.
+
+    The matchers (and the reverse map) are only built on first use, so that a translator used in
+    one direction never pays for the other. Translators are immutable (their maps are read-only),
+    so that they can be shared (see get_translator()): `translation_dict` must not be modified afterwards.
     '''
-    def __init__(self, translation_dict, sort_by_descending_key_length=True, match_initial_only=False, match_final_only=False, boundary_regex=r'\b', support_back_translation=True):
+    def __init__(self, translation_dict, sort_by_descending_key_length=True, match_initial_only=False, match_final_only=False, boundary_regex=r'\b', support_back_translation=True, backend=None, reverse_overrides=None):
 
-        self.translation_dict = translation_dict
+        table = dict(translation_dict)
         if sort_by_descending_key_length:
-            self.translation_dict = sort_dict_by_descending_length(self.translation_dict)
-        self.regex = get_regex_matcher_from_array(self.translation_dict, match_initial_only, match_final_only, boundary_regex)
+            table = sort_dict_by_descending_length(table)
+        self.translation_dict = MappingProxyType(table)
+        self.tables = (table,)
+        self.sort_by_descending_key_length = sort_by_descending_key_length
+        self.match_initial_only = match_initial_only
+        self.match_final_only = match_final_only
+        self.boundary_regex = boundary_regex
+        self.backend = backend or DEFAULT_BACKEND
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {self.backend!r}, expected one of {BACKENDS}")
+        self.replace = lambda match: table[match.group(0)]
+
+        # The reverse map is built from the map as given: the last key of a value wins
+        self.reverse_source = translation_dict if support_back_translation else None
+        self.reverse_overrides = reverse_overrides
+
+    def get_matcher(self, array, match_initial_only, match_final_only, boundary_regex):
+        if self.backend == 'trie' and array and '' not in array:
+            return get_trie_matcher_from_array(array, match_initial_only, match_final_only, boundary_regex)
+        return get_regex_matcher_from_array(array, match_initial_only, match_final_only, boundary_regex)
+
+    @cached_property
+    def regex(self):
+        return self.get_matcher(self.tables[0], self.match_initial_only, self.match_final_only, self.boundary_regex)
+
+    @cached_property
+    def reverse_tables(self):
+        if self.reverse_source is None:
+            raise AttributeError("Back translation is not supported by this StringTranslator")
+        reverse_table = {value: key for key, value in self.reverse_source.items()}
+        reverse_table.update(self.reverse_overrides or {})
+        if self.sort_by_descending_key_length:
+            reverse_table = sort_dict_by_descending_length(reverse_table)
+        return (reverse_table,)
 
-        if support_back_translation:
-            self.reverse_translation_dict = {value: key for key, value in translation_dict.items()}
-            if sort_by_descending_key_length:
-                self.reverse_translation_dict = sort_dict_by_descending_length(self.reverse_translation_dict)
-            self.reverse_regex = get_regex_matcher_from_array(self.reverse_translation_dict, match_initial_only, match_final_only, boundary_regex)
+    @cached_property
+    def reverse_translation_dict(self):
+        return MappingProxyType(self.reverse_tables[0])
+
+    @cached_property
+    def reverse_regex(self):
+        return self.get_matcher(self.reverse_tables[0], self.match_initial_only, self.match_final_only, self.boundary_regex)
+
+    @cached_property
+    def reverse_replace(self):
+        reverse_table = self.reverse_tables[0]
+        return lambda match: reverse_table[match.group(0)]
+
+    def translate(self, text):
+        if isinstance(self.regex, TrieMatcher):
+            return self.regex.sub(self.tables, text)
+        return self.regex.sub(self.replace, text)
+
+    def reverse_translate(self, text):
+        if isinstance(self.reverse_regex, TrieMatcher):
+            return self.reverse_regex.sub(self.reverse_tables, text)
+        return self.reverse_regex.sub(self.reverse_replace, text)
+
+    def stream(self, chunks, reverse=False):
+        '''
+        Same as translate() (or reverse_translate()) over the concatenation of `chunks`, yielded incrementally.
+        '''
+        matcher, table = (self.reverse_regex, self.reverse_translation_dict) if reverse else (self.regex, self.translation_dict)
+        window = get_table_window(table, self.match_initial_only, self.match_final_only)
+        return stream_translate(chunks, iter_table_matches(matcher, (table,)), *window)
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+def can_fuse_passes(earlier, later):
+    '''
+    Checks whether running the translation pass `earlier` and then `later` gives the same
+    output as a single scan which tries `earlier`'s keys before `later`'s at every position.
+    A pass is a tuple (table, match_initial_only, match_final_only, boundary_regex).
+    '''
+    table, _, _, _ = earlier
+    later_table, later_initial, later_final, later_boundary = later
+    if not table or not later_table or '' in table or '' in later_table:
+        return False
+
+    # Outputs of `earlier` must never feed keys of `later`
+    later_chars = {char for key in later_table for char in key}
+    for value in table.values():
+        if not value or not later_chars.isdisjoint(value):
+            return False
+
+    # `later` sees the boundaries of the original text, so replacements must preserve them
+    if later_initial or later_final:
+        if later_boundary != r'\b':
+            return False
+        for key, value in table.items():
+            if _is_word_char(key[0]) != _is_word_char(value[0]) or _is_word_char(key[-1]) != _is_word_char(value[-1]):
+                return False
+
+    # No key of one pass may partially overlap a key of the other, or contain a key of `earlier`
+    later_substrings = {key[i:j] for key in later_table for i in range(len(key)) for j in range(i+1, len(key)+1)}
+    later_prefixes = {key[:i] for key in later_table for i in range(1, len(key))}
+    prefixes = {key[:i] for key in table for i in range(1, len(key))}
+    for key in table:
+        if key in later_substrings or any(key[i:] in later_prefixes for i in range(1, len(key))):
+            return False
+    for key in later_table:
+        if any(key[i:] in prefixes for i in range(1, len(key))):
+            return False
+    return True
+
+class FusedTranslator:
+    '''
+    Applies several translation passes (which satisfy can_fuse_passes() pairwise) in one scan.
+    '''
+    def __init__(self, passes, backend=None):
+        self.passes = passes
+        self.tables = tuple(dict(table) for table, _, _, _ in passes)
+        self.backend = backend or DEFAULT_BACKEND
+        if self.backend == 'trie':
+            self.regex = get_trie_matcher_from_array(*passes[0])
+            for translation_pass in passes[1:]:
+                self.regex.add_group(*translation_pass)
+        else:
+            self.regex = re.compile('|'.join('(%s)' % get_regex_str_from_array(*translation_pass) for translation_pass in passes))
+
+    def __call__(self, text):
+        if isinstance(self.regex, TrieMatcher):
+            return self.regex.sub(self.tables, text)
+        return self.regex.sub(lambda match: self.tables[match.lastindex-1][match.group(0)], text)
+
+    def stream(self, chunks):
+        windows = [get_table_window(table, initial, final) for table, initial, final, _ in self.passes]
+        return stream_translate(chunks, iter_table_matches(self.regex, self.tables), *map(max, zip(*windows)))
+
+def get_stage_name(stage, owner_attributes):
+    if isinstance(stage, tuple):
+        translator, reverse = stage
+        return owner_attributes.get(id(translator), type(translator).__name__) + ('.reverse_translate' if reverse else '.translate')
+    owner = getattr(stage, '__self__', None)
+    if owner is not None and id(owner) in owner_attributes:
+        return owner_attributes[id(owner)] + '.' + stage.__name__
+    return getattr(stage, '__name__', type(stage).__name__)
+
+def get_stage_stream(stage):
+    '''
+    Returns a function streaming a pipeline stage (see TranslatorPipeline.stream()).
+    '''
+    if isinstance(stage, tuple):
+        translator, reverse = stage
+        return lambda chunks: translator.stream(chunks, reverse)
+    if getattr(stage, 'char_local', False):
+        return lambda chunks: map(stage, chunks)
+    if hasattr(stage, 'stream'):
+        return stage.stream
+    owner = getattr(stage, '__self__', None)
+    if hasattr(owner, 'stream') and stage.__name__ in ('translate', 'reverse_translate', 'normalize'):
+        if stage.__name__ == 'reverse_translate':
+            return lambda chunks: owner.stream(chunks, reverse=True)
+        return owner.stream
+    raise ValueError(f"Stage {get_stage_name(stage, {})} cannot be streamed")
+
+class TranslatorPipeline:
+    '''
+    Runs an ordered list of stages on a text. A stage is either a callable, or a
+    (StringTranslator, reverse) pair denoting its translate() or reverse_translate() pass.
+
+    With `fuse=True`, consecutive translator passes are analysed once here and merged into
+    a single scan wherever that provably gives the same output as running them one by one.
+
+    Stages are named (for profiling) after the attributes of `owner` they use, prefixed with `name`.
+    '''
+    def __init__(self, stages, fuse=True, name='pipeline', owner=None):
+        self.name = name
+        owner_attributes = {id(value): attribute for attribute, value in vars(owner).items()} if owner is not None else {}
+        self.stages = []
+        self.stage_names = []
+        self.stage_matchers = []
+        group, group_backend = [], None
+        for stage in stages:
+            if callable(stage):
+                self._flush(group, group_backend)
+                group = []
+                self._append(stage, get_stage_name(stage, owner_attributes), None)
+                continue
+
+            translator, reverse = stage
+            if reverse:
+                translation_pass = (translator.reverse_translation_dict, translator.match_initial_only, translator.match_final_only, translator.boundary_regex)
+                run, matcher = translator.reverse_translate, translator.reverse_regex
+            else:
+                translation_pass = (translator.translation_dict, translator.match_initial_only, translator.match_final_only, translator.boundary_regex)
+                run, matcher = translator.translate, translator.regex
+            stage_name = get_stage_name(stage, owner_attributes)
+
+            if fuse and group and translator.backend == group_backend and all(can_fuse_passes(earlier[0], translation_pass) for earlier in group):
+                group.append((translation_pass, run, stage_name, matcher))
+            else:
+                self._flush(group, group_backend)
+                group, group_backend = [(translation_pass, run, stage_name, matcher)], translator.backend
+        self._flush(group, group_backend)
+
+    def _append(self, stage, stage_name, matcher):
+        self.stages.append(stage)
+        self.stage_names.append(f'{self.name}[{len(self.stage_names)}] {stage_name}')
+        self.stage_matchers.append(matcher)
+
+    def _flush(self, group, backend):
+        if len(group) == 1:
+            _, run, stage_name, matcher = group[0]
+            self._append(run, stage_name, matcher)
+        elif group:
+            fused = get_translator(FusedTranslator, [translation_pass for translation_pass, _, _, _ in group], backend)
+            self._append(fused, '+'.join(stage_name for _, _, stage_name, _ in group), fused.regex)
+
+    @property
+    def num_scans(self):
+        return len(self.stages)
+
+    def stream(self, chunks):
+        '''
+        Same as calling the pipeline on the concatenation of `chunks` (str), yielding the output incrementally.
+        Every stage holds back only the few chars at chunk edges which its next replacements may depend on,
+        so memory use does not grow with the input.
+        '''
+        for stage_stream in [get_stage_stream(stage) for stage in self.stages]:
+            chunks = stage_stream(chunks)
+        return chunks
+
+    def __call__(self, text):
+        profiler = profiling.active_profiler.get()
+        if profiler is not None:
+            for stage, stage_name, matcher in zip(self.stages, self.stage_names, self.stage_matchers):
+                text = profiler.run(stage_name, stage, text, matcher)
+            return text
+        for stage in self.stages:
+            text = stage(text)
+        return text
+
+class ContextRuleTranslator:
+    '''
+    Rewrites `middle + right` only when surrounded by context strings: `left + middle + right`
+    becomes `left + middle_map[middle] + right`, for any `left`, `right` in `context`.
+    Gives the same output as a StringTranslator over every such 3-part key, but without
+    materialising the len(context)² keys: a match is located by its middle part, and the
+    contexts are checked by set lookups around it.
+    '''
+    def __init__(self, context, middle_map, support_back_translation=True):
+        self.context = frozenset(context)
+        self.max_context_length = max(map(len, self.context))
+        self.translation_dict = MappingProxyType(sort_dict_by_descending_length(middle_map))
+        self.regex = self.get_middle_matcher(self.translation_dict)
+        self.reverse_source = middle_map if support_back_translation else None
+
+    # The reverse map and matcher are built on first use (see StringTranslator)
+    @cached_property
+    def reverse_translation_dict(self):
+        if self.reverse_source is None:
+            raise AttributeError("Back translation is not supported by this ContextRuleTranslator")
+        return MappingProxyType(sort_dict_by_descending_length({value: key for key, value in self.reverse_source.items()}))
+
+    @cached_property
+    def reverse_regex(self):
+        return self.get_middle_matcher(self.reverse_translation_dict)
+
+    def get_middle_matcher(self, middle_map):
+        starts = {middle[0] for middle in middle_map}
+        if any(not starts.isdisjoint(context) for context in self.context):
+            raise ValueError("Context strings must not contain the first letter of any middle key")
+        return re.compile('[%s]' % ''.join(map(re.escape, sorted(starts))))
+
+    def iter_matches(self, regex, middle_map, text, pos=0, last=0):
+        '''
+        Yields the (start, end, replacement) spans of the rewrites, for middles found from `pos` on,
+        whose left context does not start before `last`. The right contexts are part of the spans.
+        '''
+        context, max_context_length = self.context, self.max_context_length
+        for middle_start in regex.finditer(text, pos):
+            pos = middle_start.start()
+            # Leftmost start wins, then the longest key, like in a regex alternation
+            for start in range(max(last, pos-max_context_length), pos):
+                if text[start:pos] not in context:
+                    continue
+                end, middle_end, replacement = -1, -1, None
+                for middle, value in middle_map.items():
+                    if not text.startswith(middle, pos):
+                        continue
+                    right = pos + len(middle)
+                    for right_end in range(min(len(text), right+max_context_length), right, -1):
+                        if text[right:right_end] in context:
+                            if right_end > end:
+                                end, middle_end, replacement = right_end, right, value
+                            break
+                if end < 0:
+                    continue
+                yield pos, end, replacement + text[middle_end:end]
+                last = end
+                break
 
     def translate(self, text):
-        return self.regex.sub(lambda match: self.translation_dict[match.group(0)], text)
+        return replace_spans(text, self.iter_matches(self.regex, self.translation_dict, text))
 
     def reverse_translate(self, text):
-        return self.reverse_regex.sub(lambda match: self.reverse_translation_dict[match.group(0)], text)
+        return replace_spans(text, self.iter_matches(self.reverse_regex, self.reverse_translation_dict, text))
+
+    def stream(self, chunks, reverse=False):
+        '''
+        Same as translate() (or reverse_translate()) over the concatenation of `chunks`, yielded incrementally.
+        '''
+        regex, middle_map = (self.reverse_regex, self.reverse_translation_dict) if reverse else (self.regex, self.translation_dict)
+        iter_matches = lambda text, pos, last: self.iter_matches(regex, middle_map, text, pos, last)
+        lookahead = max(map(len, middle_map)) + self.max_context_length
+        return stream_translate(chunks, iter_matches, self.max_context_length, lookahead)
+
+class RegexRuleTranslator:
+    '''
+    Applies an ordered list of context rules in a single scan. A rule is a pair (pattern, replacement):
+    `pattern` is a regex without capturing groups (contexts which are kept go in lookarounds), and
+    `replacement` is a string, a dict (indexed by the matched text) or a function of the matched text.
+    At each position, the first rule which matches wins, like in a regex alternation.
+
+    The rules of one translator form a phase: they must give the same output as running them one
+    after the other, i.e. no rule may create or consume the context of a later one.
+    Rules which do feed each other go in separate translators, applied in turn.
+
+    To be streamed, the rules need their `window` (lookbehind, lookahead): the number of chars
+    before a match, and from its start on (match and lookahead included), which decide it.
+    '''
+    def __init__(self, rules, window=None):
+        self.rules = list(rules)
+        self.window = window
+        self.replacements = []
+        for pattern, replacement in self.rules:
+            if re.compile(pattern).groups:
+                raise ValueError(f"Rule pattern {pattern!r} must not have capturing groups")
+            if isinstance(replacement, str):
+                replacement = (lambda value: lambda text: value)(replacement)
+            elif isinstance(replacement, dict):
+                replacement = replacement.__getitem__
+            self.replacements.append(replacement)
+        if len(self.rules) == 1:
+            # A single rule needs no group to tell which rule matched (and scans faster without)
+            self.regex = re.compile(self.rules[0][0])
+        else:
+            self.regex = re.compile('|'.join('(%s)' % pattern for pattern, _ in self.rules))
+
+    def replace(self, match):
+        return self.replacements[(match.lastindex or 1)-1](match.group(0))
+
+    def translate(self, text):
+        return self.regex.sub(self.replace, text)
+
+    def iter_matches(self, text, pos, last):
+        for match in self.regex.finditer(text, pos):
+            yield match.start(), match.end(), self.replace(match)
+
+    def stream(self, chunks):
+        '''
+        Same as translate() over the concatenation of `chunks`, yielded incrementally.
+        '''
+        if self.window is None:
+            raise ValueError("Rules without a declared window cannot be streamed")
+        return stream_translate(chunks, self.iter_matches, *self.window)
+
+def get_keys_regex_str(translation_dict):
+    '''
+    Returns a (non-capturing) regex matching any key of `translation_dict`, longest first.
+    '''
+    return '(?:%s)' % get_regex_str_from_array(sort_dict_by_descending_length(translation_dict))
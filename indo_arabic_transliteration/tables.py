@@ -0,0 +1,187 @@
+'''
+Loader for the mapping tables in `data/`.
+
+Each CSV file holds one letter per column: Arabic script, romanization, Devanagari (and
+optionally other scripts) in successive rows. Lexicon files (`*_lexicon.tsv`) hold one
+whole-word override per line: `word<TAB>replacement` (lines starting with `#` are comments).
+The parsed tables and lexicons of a data directory are compiled into a single versioned
+artifact, which is loaded with one read. It is stored in the user cache directory
+(`$INDO_XLIT_CACHE_DIR`, else `$XDG_CACHE_HOME/indo_arabic_transliteration` or
+`~/.cache/indo_arabic_transliteration`), named after the hash of the data files' contents,
+so that it is rebuilt whenever a data file changes. The package files are never written.
+The converters build their dicts and matchers from these tables. To (re)build it explicitly:
+
+    python -m indo_arabic_transliteration.tables [data_dir]
+'''
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+
+TABLES_FORMAT_VERSION = 4
+DEFAULT_DATA_DIR = os.path.dirname(__file__) + '/data/'
+
+# Cells which pandas.read_csv() reads as NaN by default (and hence become 'nan' after str())
+NA_VALUES = {
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+}
+
+_compiled_tables = {}
+_compiled_tables_lock = threading.Lock()
+
+def list_data_files(data_dir, extension):
+    data_files = []
+    for root, _, files in os.walk(data_dir):
+        for file_name in files:
+            if file_name.endswith(extension):
+                data_files.append(os.path.relpath(os.path.join(root, file_name), data_dir).replace(os.sep, '/'))
+    return sorted(data_files)
+
+def list_csv_files(data_dir):
+    return list_data_files(data_dir, '.csv')
+
+def list_lexicon_files(data_dir):
+    return list_data_files(data_dir, '_lexicon.tsv')
+
+def get_fingerprint(data_dir, data_files):
+    digest = hashlib.sha1()
+    for data_file in data_files:
+        digest.update(data_file.encode('utf-8') + b'\0')
+        with open(os.path.join(data_dir, data_file), 'rb') as f:
+            digest.update(f.read() + b'\0')
+    return digest.hexdigest()
+
+def get_cache_dir():
+    cache_dir = os.environ.get('INDO_XLIT_CACHE_DIR')
+    if not cache_dir:
+        cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        cache_dir = os.path.join(cache_home, 'indo_arabic_transliteration')
+    return cache_dir
+
+def get_compiled_tables_path(fingerprint):
+    return os.path.join(get_cache_dir(), f'compiled_tables-v{TABLES_FORMAT_VERSION}-{fingerprint}.pickle')
+
+def parse_csv_table(path):
+    '''
+    Parses a header-less table like `pd.read_csv(path, header=None)` followed by
+    `str(df[column][row]).strip()`, and returns it as a tuple of columns.
+    '''
+    import csv
+    with open(path, encoding='utf-8', newline='') as f:
+        rows = [row for row in csv.reader(f) if row]
+    if not rows:
+        return ()
+
+    num_columns = len(rows[0])
+    columns = []
+    for i in range(num_columns):
+        column = []
+        for row in rows:
+            cell = row[i] if i < len(row) else ''
+            column.append('nan' if cell in NA_VALUES else cell.strip())
+        columns.append(tuple(column))
+    return tuple(columns)
+
+def parse_lexicon(path):
+    '''
+    Parses a lexicon file into a dict (word -> replacement).
+    '''
+    lexicon = {}
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.rstrip('\r\n')
+            if not line.strip() or line.startswith('#'):
+                continue
+            fields = line.split('\t')
+            if len(fields) != 2 or not fields[0]:
+                raise ValueError(f"{path}:{line_number}: expected a word and its replacement, separated by a tab")
+            word, replacement = fields
+            if lexicon.get(word, replacement) != replacement:
+                raise ValueError(f"{path}:{line_number}: conflicting replacements for {word!r}")
+            lexicon[word] = replacement
+    return lexicon
+
+def compile_tables(data_dir=DEFAULT_DATA_DIR, save=True):
+    '''
+    Parses all the CSV and lexicon files in `data_dir` and (optionally) writes the compiled artifact.
+    '''
+    csv_files, lexicon_files = list_csv_files(data_dir), list_lexicon_files(data_dir)
+    compiled = {
+        'version': TABLES_FORMAT_VERSION,
+        # Taken before parsing the files, so that a file changed meanwhile is seen as changed next time
+        'fingerprint': get_fingerprint(data_dir, csv_files + lexicon_files),
+        'tables': {csv_file: parse_csv_table(os.path.join(data_dir, csv_file)) for csv_file in csv_files},
+        'lexicons': {lexicon_file: parse_lexicon(os.path.join(data_dir, lexicon_file)) for lexicon_file in lexicon_files},
+    }
+    if save:
+        save_compiled_tables(compiled)
+    return compiled
+
+def save_compiled_tables(compiled):
+    '''
+    Writes the artifact atomically, through a temporary file of its own (processes importing
+    the package concurrently may all be compiling it).
+    '''
+    path = get_compiled_tables_path(compiled['fingerprint'])
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=os.path.dirname(path))
+    except OSError:
+        return # No writable cache directory: just use the freshly compiled tables
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(compiled, f, protocol=4)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+def load_compiled_tables(data_dir=DEFAULT_DATA_DIR):
+    '''
+    Returns the compiled tables of `data_dir`, rebuilding the artifact if it is missing or stale.
+    '''
+    compiled = _compiled_tables.get(data_dir)
+    if compiled is not None:
+        return compiled
+
+    with _compiled_tables_lock:
+        compiled = _compiled_tables.get(data_dir)
+        if compiled is None:
+            fingerprint = get_fingerprint(data_dir, list_csv_files(data_dir) + list_lexicon_files(data_dir))
+            try:
+                with open(get_compiled_tables_path(fingerprint), 'rb') as f:
+                    compiled = pickle.loads(f.read())
+            except (OSError, pickle.UnpicklingError, EOFError):
+                compiled = None
+            if compiled is None or compiled.get('version') != TABLES_FORMAT_VERSION or compiled.get('fingerprint') != fingerprint:
+                compiled = compile_tables(data_dir)
+            _compiled_tables[data_dir] = compiled
+    return compiled
+
+def load_table(data_dir, map_file):
+    '''
+    Returns the columns of `data_dir/map_file` as tuples of cells (one per row).
+    '''
+    try:
+        return load_compiled_tables(data_dir)['tables'][map_file]
+    except KeyError:
+        raise FileNotFoundError(os.path.join(data_dir, map_file))
+
+def load_lexicon(data_dir, lexicon_file):
+    '''
+    Returns the overrides of `data_dir/lexicon_file`, as a dict (word -> replacement).
+    '''
+    try:
+        return load_compiled_tables(data_dir)['lexicons'][lexicon_file]
+    except KeyError:
+        raise FileNotFoundError(os.path.join(data_dir, lexicon_file))
+
+if __name__ == '__main__':
+    import sys
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_DATA_DIR
+    compiled = compile_tables(data_dir)
+    print(f"Compiled {len(compiled['tables'])} tables and {len(compiled['lexicons'])} lexicons into {get_compiled_tables_path(compiled['fingerprint'])}")
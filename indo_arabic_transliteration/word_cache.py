@@ -0,0 +1,46 @@
+import functools
+import re
+
+DEFAULT_SEPARATOR_REGEX = r'\s+'
+
+class WordCache:
+    '''
+    Memoizes a conversion word by word: the text is (optionally) normalized as a whole,
+    then split at separators (by default, whitespace). Each chunk is converted with
+    `convert` once and remembered in a bounded LRU cache, and the converted chunks are
+    stitched back with the original separators.
+
+    This gives the same output as `convert(normalize(text))` as long as `convert` never
+    looks across, or modifies, a separator. Rules which do (like joining words) belong to
+    `normalize`. Each instance has its own cache, so use one per converter and direction.
+    '''
+    def __init__(self, convert, maxsize=65536, separator_regex=DEFAULT_SEPARATOR_REGEX, normalize=None):
+        self.convert = convert
+        self.normalize = normalize
+        self.separator = re.compile(separator_regex)
+        self.convert_word = functools.lru_cache(maxsize=maxsize)(convert)
+
+    def __call__(self, text):
+        if self.normalize:
+            text = self.normalize(text)
+        convert_word = self.convert_word
+        pieces = []
+        last = 0
+        for separator in self.separator.finditer(text):
+            start, end = separator.span()
+            if start > last:
+                pieces.append(convert_word(text[last:start]))
+            pieces.append(separator.group())
+            last = end
+        if last < len(text):
+            pieces.append(convert_word(text[last:]))
+        return ''.join(pieces)
+
+    def cache_info(self):
+        '''
+        Returns the (hits, misses, maxsize, currsize) statistics of the cache.
+        '''
+        return self.convert_word.cache_info()
+
+    def cache_clear(self):
+        self.convert_word.cache_clear()
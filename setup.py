@@ -32,6 +32,12 @@ setup(
     # packages=find_packages(exclude=("tests",)),
     include_package_data=True,
     install_requires=install_requires,
+    entry_points={
+        "console_scripts": [
+            "indo-xlit=indo_arabic_transliteration.cli:main",
+            "indo-xlit-server=indo_arabic_transliteration.server:main",
+        ],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "Operating System :: OS Independent",
@@ -0,0 +1,53 @@
+import json
+import os
+from collections import defaultdict
+
+import pytest
+
+from indo_arabic_transliteration.brahmic import BrahmicTranslator
+from indo_arabic_transliteration.mapper import script_convert
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+def load_parity_corpus():
+    corpus = defaultdict(list)
+    with open(os.path.join(DATA_DIR, 'brahmic_parity.jsonl'), encoding='utf-8') as f:
+        for line in f:
+            reference = json.loads(line)
+            corpus[reference['source'], reference['target']].append((reference['text'], reference['output']))
+    return corpus
+
+PARITY_CORPUS = load_parity_corpus()
+
+@pytest.mark.parametrize('source, target', sorted(PARITY_CORPUS))
+def test_same_output_as_aksharamukha(source, target):
+    translator = BrahmicTranslator(source, target)
+    outputs = [(text, output, translator.translate(text)) for text, output in PARITY_CORPUS[source, target]]
+    mismatches = [(text, output, builtin) for text, output, builtin in outputs if builtin != output]
+    assert not mismatches, mismatches[:5]
+
+# aksharamukha 2.3's outputs
+@pytest.mark.parametrize('source, target, text, output', [
+    ('Devanagari', 'Gurmukhi', 'पढ़ता', 'ਪੜ੍ਹਤਾ'),
+    ('Devanagari', 'Gurmukhi', 'हूँ ईं कॳ कऺ क॔', 'ਹੂੰ ਈਂ ਕਆ ਕਾ ਕ'),
+    ('Devanagari', 'Gurmukhi', 'त़ँ अँ', 'ਤ਼ੰ ਅੰ'),
+    ('Gurmukhi', 'Devanagari', 'ਮੈਂ 1947 h1', 'मैं १९४७ h1'),
+    ('Gurmukhi', 'Devanagari', 'ਪੱਸ਼਼ ਪੜ੍ਹ', 'पष्ष प\u095d'),
+    ('Gujarati', 'Devanagari', 'છે. છે.. ૧', 'छे। छे॥ १'),
+    ('Devanagari', 'Gujarati', 'है। ॥ ढ़', 'હૈ. .. ઢ઼'),
+    ('Gurmukhi', 'Devanagari', '', ''),
+])
+def test_conversion(source, target, text, output):
+    assert BrahmicTranslator(source, target).translate(text) == output
+
+def test_unsupported_conversion():
+    with pytest.raises(ValueError):
+        BrahmicTranslator('Gurmukhi', 'Gujarati')
+
+@pytest.mark.parametrize('text, from_script, to_script, output', [
+    ('پڑھدا', 'pa-PK', 'pa-IN', 'ਪੜ੍ਹਦਾ'),
+    ('ਮੈਂ 1947 ਵਿੱਚ', 'pa-IN', 'pa-PK', 'میں ۱۹۴۷ وچّ'),
+    ('અમદાવાદ શહેર છે.', 'gu-IN', 'ur-PK', 'امداواد شہیر چھے۔'),
+])
+def test_script_convert(text, from_script, to_script, output):
+    assert script_convert(text, from_script, to_script) == output
@@ -0,0 +1,49 @@
+import gzip
+import os
+import subprocess
+import sys
+
+import pytest
+
+from indo_arabic_transliteration.cli import main
+from indo_arabic_transliteration.mapper import script_convert
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LINES = ['اسلام آباد ایک شہر ہے\n', '\n', 'کتاب، دریا\r\n', 'گئے آئے']
+TEXT = ''.join(LINES)
+
+def convert_lines(lines, from_script='ur-PK', to_script='hi-IN'):
+    return ''.join(script_convert(line.rstrip('\r\n'), from_script, to_script) + line[len(line.rstrip('\r\n')):] for line in lines)
+
+def test_stdin_to_stdout():
+    result = subprocess.run([sys.executable, '-m', 'indo_arabic_transliteration.cli', '-f', 'ur-PK', '-t', 'hi-IN'],
+                            input=TEXT.encode('utf-8'), capture_output=True, cwd=ROOT_DIR, check=True)
+    assert result.stdout.decode('utf-8') == convert_lines(LINES)
+
+@pytest.mark.parametrize('options', [
+    ['--batch-size', '1'],
+    ['--batch-size', '3'],
+    ['--stream'],
+])
+def test_files(tmp_path, options):
+    input_path, output_path = tmp_path / 'in.txt', tmp_path / 'out.txt.gz'
+    input_path.write_bytes(TEXT.encode('utf-8'))
+    main(['-f', 'ur-PK', '-t', 'hi-IN', '--no-progress', str(input_path), str(input_path), '-o', str(output_path)] + options)
+    with gzip.open(output_path, 'rt', encoding='utf-8', newline='') as f:
+        output = f.read()
+    if '--stream' in options:
+        assert output == script_convert(TEXT, 'ur-PK', 'hi-IN') * 2
+    else:
+        # Lines are converted one by one, even the last one of the first input
+        assert output == convert_lines(LINES) * 2
+
+@pytest.mark.parametrize('argv', [
+    ['-f', 'ur-PK', '-t', 'xx'],
+    ['-f', 'ur-PK', '-t', 'hi-IN', '--batch-size', '0'],
+    ['-f', 'ur-PK', '-t', 'hi-IN', '--stream', '--workers', '2'],
+])
+def test_invalid_arguments(argv):
+    with pytest.raises(SystemExit) as error:
+        main(argv)
+    assert error.value.code != 0
@@ -0,0 +1,46 @@
+import pytest
+
+from indo_arabic_transliteration.hybrid import HybridRouter
+from indo_arabic_transliteration.mapper import script_convert
+
+TEXTS = ['جمہوریہ پاکستان', 'کی حکومت', 'پاکستان']
+
+def upper_engine(words):
+    return [f'<{word}>' for word in words]
+
+def failing_engine(words):
+    raise ConnectionError('engine down')
+
+def make_router(engine, **kwargs):
+    return HybridRouter('ur-PK', 'hi-IN', engine=engine, threshold=0, min_word_length=4, **kwargs)
+
+def test_escalated_words_are_merged():
+    router = make_router(upper_engine)
+    outputs = router.convert_many(TEXTS)
+    assert outputs[1] == script_convert('کی', 'ur-PK', 'hi-IN') + ' <حکومت>'
+    assert outputs[2] == '<پاکستان>'
+    assert router.metrics['escalated_words'] == 4
+    assert router.metrics['engine_inputs'] == 3
+    assert router.escalated_share == 4 / 5
+    assert not router.metrics['engine_errors']
+
+def test_failed_escalations_are_not_counted_as_escalated():
+    router = make_router(failing_engine)
+    assert router.convert_many(TEXTS) == [script_convert(text, 'ur-PK', 'hi-IN') for text in TEXTS]
+    assert (router.metrics['escalated_words'], router.metrics['failed_escalated_words'], router.metrics['engine_errors']) == (0, 4, 1)
+    assert router.escalated_share == 0
+
+    router.engine = upper_engine
+    router(TEXTS[0])
+    assert (router.metrics['escalated_words'], router.metrics['failed_escalated_words']) == (2, 4)
+
+def test_engine_errors_raise_without_fail_safe():
+    router = make_router(failing_engine, fail_safe=False)
+    with pytest.raises(ConnectionError):
+        router.convert_many(TEXTS)
+    assert (router.metrics['escalated_words'], router.metrics['failed_escalated_words']) == (0, 4)
+
+def test_short_engine_output_is_a_failure():
+    router = make_router(lambda words: upper_engine(words)[1:])
+    assert router.convert_many(TEXTS) == [script_convert(text, 'ur-PK', 'hi-IN') for text in TEXTS]
+    assert router.metrics['engine_errors'] == 1
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from indo_arabic_transliteration.incremental import TransliterationSession
+from indo_arabic_transliteration.mapper import WORD_CACHE_DELEGATES, script_convert
+
+TEXTS = {
+    ('ur-PK', 'hi-IN'): 'جمہوریہ پاکستان کی حکومت نہیں ہے۔\nاسلام آباد ایک شہر ہے\n\nگئے آئے جائیں ہوئی؟ سوال، کتاب\nکراچی ۱۹۴۷ میں ',
+    ('hi-IN', 'ur-PK'): 'हैदराबाद भारत का एक शहर है।\nइसलिए ईद उम्मीद ऊपर\n\nक़िला ज़रूर सवाल, मैं कहाँ?\nदुनिया किताब हुई १९४७ ',
+}
+
+def check(session, pair, previous_output, output_edit):
+    offset, deleted, inserted = output_edit
+    assert session.output == script_convert(session.text, *pair)
+    assert previous_output[:offset] + inserted + previous_output[offset+deleted:] == session.output
+
+@pytest.fixture(params=sorted(WORD_CACHE_DELEGATES))
+def pair(request):
+    return request.param
+
+@pytest.fixture
+def session(pair):
+    return TransliterationSession(*pair, TEXTS[pair])
+
+def test_initial_text(session, pair):
+    assert session.text == TEXTS[pair]
+    assert session.output == script_convert(session.text, *pair)
+    assert len(session) == len(session.text)
+
+@pytest.mark.parametrize('offset, deleted, inserted', [
+    # Insertions: at the start, in a word, at the end, of line breaks
+    (0, 0, 'ا '),
+    (5, 0, 'ی'),
+    (-1, 0, ' ہے'),
+    (20, 0, '\n\n'),
+    # Deletions: of a char, of line breaks (joining lines), of everything
+    (3, 1, ''),
+    ('\n', 1, ''),
+    (0, None, ''),
+    # Replacements across lines
+    (10, 30, 'کتاب\nकिताब'),
+    (0, None, 'ء\nۓ ؤ'),
+])
+def test_edit(session, pair, offset, deleted, inserted):
+    text = session.text
+    offset = text.index(offset) if isinstance(offset, str) else offset % (len(text) + 1)
+    deleted = len(text) - offset if deleted is None else deleted
+    previous_output = session.output
+    check(session, pair, previous_output, session.edit(offset, deleted, inserted))
+    assert session.text == text[:offset] + inserted + text[offset+deleted:]
+
+def test_random_edits(session, pair):
+    rng = random.Random(0)
+    alphabet = session.text + '\n\n  ء'
+    for _ in range(200):
+        offset = rng.randint(0, len(session))
+        deleted = rng.randint(0, min(len(session) - offset, 8))
+        inserted = ''.join(rng.choices(alphabet, k=rng.choice([0, 1, 1, 3, 10])))
+        previous_output = session.output
+        check(session, pair, previous_output, session.edit(offset, deleted, inserted))
+
+def test_invalid_edits(session):
+    with pytest.raises(ValueError):
+        session.edit(len(session) + 1, 0, 'a')
+    with pytest.raises(ValueError):
+        session.edit(0, len(session) + 1)
+
+def test_unsupported_pair():
+    with pytest.raises(ValueError):
+        TransliterationSession('sd-PK', 'sd-IN')
@@ -0,0 +1,104 @@
+import io
+
+import pytest
+
+from indo_arabic_transliteration.mapper import (DELEGATES, JOINABLE_PAIRS, PIVOT_DELEGATES, PIVOT_PAIRS, STREAM_DELEGATES, WORD_CACHE_DELEGATES,
+                                                PivotCache, disable_word_cache, enable_word_cache, get_converter, script_convert,
+                                                script_convert_batch, script_convert_multi, script_convert_stream)
+from indo_arabic_transliteration.punjabi import GujaratiTransliterator, PunjabiTransliterator
+
+EDGE_CASES = ['', ' ', '\n', '\n\n', 'abc 123', 'ٔ', '‌‍', '،؟۔ ।॥']
+
+TEXTS = {
+    'ur-PK': ['جمہوریہ پاکستان کی حکومت نہیں ہے۔\nاسلام آباد ایک شہر ہے', 'گئے آئے جائیں ہوئی؟ سوال، کتاب اور دریا', 'مؤمن، اُمّید؛ تشکّر "لاہور" ۱۹۴۷ ء'],
+    'hi-IN': ['हैदराबाद भारत का एक शहर है।\nइसलिए ईद उम्मीद ऊपर', 'क़िला ज़रूर सवाल, मैं कहाँ? दुनिया किताब हुई १९४७'],
+    'pa-PK': ['پنجابی لاہور دریا کتاب\nاے دی تے'],
+    'pa-IN': ['ਪੰਜਾਬੀ ਸਿੰਘ ਗੁਰੂ ਅੰਮ੍ਰਿਤਸਰ\nਲਾਹੌਰ ਦਰਿਆ ਕਿਤਾਬ ਹੈ ਦੀ ਅਤੇ ਮੈਂ 1947 ਵਿੱਚ'],
+    'sd-PK': ['سنڌي حيدرآباد ڪراچي\nدرياهه ڪتاب آهي ۾ ۽ سنڌو', 'ٻار ڄڻ ڏاڍو ڀلو'],
+    'sd-IN': ['सिन्धी हैदराबाद कराची\nदरियाह किताब आहे में ऐं सिन्धु', 'ॻाल्हि ॼणु ॾाढो'],
+    'gu-IN': ['ગુજરાતી અમદાવાદ ભારત\nશહેર છે અને પુસ્તક નદી.'],
+}
+
+@pytest.mark.parametrize('converter_class, direction, method, other_attribute, text', [
+    (PunjabiTransliterator, 'shahmukhi->gurmukhi', 'transliterate_from_shahmukhi_to_gurmukhi', 'hindi_to_urdu_pipeline', 'پنجابی لاہور'),
+    (PunjabiTransliterator, 'gurmukhi->shahmukhi', 'transliterate_from_gurmukhi_to_shahmukhi', 'devanagari_to_gurmukhi', 'ਪੰਜਾਬੀ ਲਾਹੌਰ'),
+    (GujaratiTransliterator, 'urdu->gujarati', 'transliterate_from_urdu_to_gujarati', 'gujarati_to_devanagari', 'شہر کتاب'),
+    (GujaratiTransliterator, 'gujarati->urdu', 'transliterate_from_gujarati_to_urdu', 'urdu_to_hindi_pipeline', 'શહેર છે'),
+])
+def test_one_direction_converters(converter_class, direction, method, other_attribute, text):
+    converter = converter_class(directions={direction})
+    assert getattr(converter, method)(text) == getattr(converter_class(), method)(text)
+    with pytest.raises(ValueError):
+        getattr(converter, other_attribute)
+    with pytest.raises(ValueError):
+        converter_class(directions={'ur->hi'})
+
+def test_delegates_build_one_direction():
+    for (from_script, to_script), delegate in DELEGATES.items():
+        assert delegate.direction is not None, (from_script, to_script)
+    script_convert('پنجابی', 'pa-PK', 'pa-IN')
+    assert get_converter('punjabi', 'shahmukhi->gurmukhi').directions == {'shahmukhi->gurmukhi'}
+    assert 'hindi_to_urdu_pipeline' not in vars(get_converter('punjabi', 'shahmukhi->gurmukhi'))
+
+@pytest.mark.parametrize('from_script, to_script', sorted(DELEGATES))
+def test_stream_matches_script_convert(from_script, to_script):
+    texts = TEXTS[from_script] + EDGE_CASES
+    if (from_script, to_script) not in STREAM_DELEGATES:
+        with pytest.raises(ValueError):
+            script_convert_stream(texts[0], from_script, to_script)
+        return
+    for text in texts + ['\n'.join(texts)]:
+        expected = script_convert(text, from_script, to_script)
+        for chunk_size in range(1, 8):
+            assert ''.join(script_convert_stream(text, from_script, to_script, chunk_size)) == expected, (text, chunk_size)
+        # Bytes split inside UTF-8 chars
+        assert ''.join(script_convert_stream(io.BytesIO(text.encode('utf-8')), from_script, to_script, 3)) == expected
+
+def get_batch_texts(from_script):
+    texts = TEXTS[from_script] + EDGE_CASES
+    words = ' '.join(texts).split()
+    # Duplicates, NULs (the separator of joined batches) and texts ending or starting with them
+    return texts + texts[:2] + words + ['\x00', '\x00\x00', words[0] + '\x00' + words[1], '\x00' + words[0], words[0] + '\x00', '\n' + words[0] + '\n']
+
+@pytest.mark.parametrize('from_script, to_script, word_cache', [pair + (False,) for pair in sorted(DELEGATES)] + [pair + (True,) for pair in sorted(WORD_CACHE_DELEGATES)])
+def test_batch_matches_script_convert(from_script, to_script, word_cache):
+    texts = get_batch_texts(from_script)
+    expected = [script_convert(text, from_script, to_script) for text in texts]
+    if word_cache:
+        enable_word_cache([(from_script, to_script)], maxsize=8)
+    try:
+        for batch_size in (1, 3, 512):
+            assert list(script_convert_batch(iter(texts), from_script, to_script, batch_size)) == expected, batch_size
+    finally:
+        disable_word_cache([(from_script, to_script)])
+
+def test_joinable_pairs_convert_batches_at_once(monkeypatch):
+    assert JOINABLE_PAIRS <= set(DELEGATES)
+    pair = ('ur-PK', 'hi-IN')
+    inputs = []
+    convert = DELEGATES[pair]
+    monkeypatch.setitem(DELEGATES, pair, lambda text: inputs.append(text) or convert(text))
+    texts = ['کتاب', 'دریا', 'کتاب', '', 'a\x00b']
+    assert list(script_convert_batch(texts, *pair)) == [script_convert(text, *pair) for text in texts]
+    assert inputs[:2] == ['کتاب\x00دریا\x00', 'a\x00b']
+
+def get_targets(from_script):
+    return sorted(to_script for source, to_script in DELEGATES if source == from_script)
+
+@pytest.mark.parametrize('from_script', sorted({from_script for from_script, _ in PIVOT_DELEGATES}))
+def test_multi_matches_two_step_conversion(from_script):
+    to_scripts = get_targets(from_script)
+    pivot_cache = PivotCache()
+    # With words of the Urdu to Hindi lexicon, overridden in the pivot conversion
+    texts = TEXTS[from_script] + EDGE_CASES + ['یہ نہیں و کیں']
+    for text in texts + texts:
+        outputs = script_convert_multi(text, from_script, to_scripts, pivot_cache)
+        assert outputs == {to_script: script_convert(text, from_script, to_script) for to_script in to_scripts}
+        for to_script in to_scripts:
+            if (from_script, to_script) in PIVOT_DELEGATES:
+                pivot_pair, convert_pivot = PIVOT_DELEGATES[from_script, to_script]
+                assert outputs[to_script] == convert_pivot(script_convert(text, *pivot_pair))
+    # Each distinct text is converted to the pivot only once
+    pivot_targets = [to_script for to_script in to_scripts if (from_script, to_script) in PIVOT_DELEGATES or (from_script, to_script) in PIVOT_PAIRS]
+    assert pivot_cache.misses == len(set(texts))
+    assert pivot_cache.hits + pivot_cache.misses == 2 * len(texts) * len(pivot_targets)
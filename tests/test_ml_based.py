@@ -0,0 +1,82 @@
+import re
+
+import pytest
+
+from indo_arabic_transliteration import ml_based
+from indo_arabic_transliteration.ml_based import ml_cache_info, ml_transliterate, ml_transliterate_batch
+
+PAIR = ('ur-PK', 'hi-IN')
+
+class FakeTransliterator:
+    '''
+    Stands for an indictrans transliterator: normalizes the whole text (with a rule looking across
+    words), then converts it token by token (here reversing the letters of words).
+    '''
+    tab = '\x01\x03'
+    space = '\x02\x04'
+    non_alpha = re.compile('([^\u0621-\u063a\u0641-\u064a\u0674-\u06d3]+)')
+
+    def __init__(self):
+        self.inputs = []
+
+    def convert_to_wx(self, text):
+        return re.sub('(^|[^\u0621-\u06d3])\u06be', '\\1\u06c1', text)
+
+    def case_trans(self, word, k_best=5):
+        self.inputs.append(word)
+        return word[::-1] if self.non_alpha.fullmatch(word) is None else word
+
+    def transliterate(self, text, k_best=None):
+        text = self.convert_to_wx(text).replace('\t', self.tab).replace(' ', self.space)
+        lines = [line if not line.strip() else ''.join(map(self.case_trans, self.non_alpha.split(line))) for line in text.split('\n')]
+        return '\n'.join(lines).replace(self.space, ' ').replace(self.tab, '\t')
+
+class FakeModel:
+    def __init__(self):
+        self.transliterator = FakeTransliterator()
+        self.transform = self.transliterator.transliterate
+
+class OpaqueModel:
+    '''
+    Stands for a model which cannot be split into tokens (reverses the word order).
+    '''
+    def __init__(self):
+        self.inputs = []
+
+    def transform(self, text):
+        self.inputs.append(text)
+        return ' '.join(reversed(text.split(' ')))
+
+@pytest.fixture
+def model(monkeypatch):
+    model = FakeModel()
+    monkeypatch.setitem(ml_based.MODELS, PAIR, model)
+    monkeypatch.setattr(ml_based, '_caches', {})
+    return model
+
+TEXTS = ['ایک شہر ہے', 'شہر', '', 'ایک شہر ہے', 'شہر ایک\nہے', ' ', '\n\n', 'ھم ھو، کھانا', '\tabc ۱۲ ھ']
+
+def test_batch_matches_single_texts(model):
+    expected = [ml_transliterate(text, *PAIR) for text in TEXTS]
+    assert ml_transliterate_batch(TEXTS, *PAIR) == expected
+    # Across words: ھ is normalized at the start of words only
+    assert expected[-2] == 'مہ وہ، اناھک'
+
+def test_batch_runs_model_once_per_token(model):
+    assert ml_cache_info(*PAIR) is None
+    ml_transliterate_batch(['ایک شہر', 'شہر', 'شہر ایک'], *PAIR)
+    ml_transliterate_batch(iter(['شہر', 'ہے شہر']), *PAIR)
+    words = [token for token in model.transliterator.inputs if token.strip()]
+    assert words == ['ایک', model.transliterator.space, 'شہر', 'ہے']
+    assert ml_cache_info(*PAIR).currsize == 4
+
+def test_batch_with_opaque_model(monkeypatch):
+    model = OpaqueModel()
+    monkeypatch.setitem(ml_based.MODELS, PAIR, model)
+    monkeypatch.setattr(ml_based, '_caches', {})
+    assert ml_transliterate_batch(TEXTS, *PAIR) == [ml_transliterate(text, *PAIR) for text in TEXTS]
+    assert len(model.inputs) == 2 * len(TEXTS) - 1
+
+def test_unsupported_pair():
+    with pytest.raises(ValueError):
+        ml_transliterate_batch(['text'], 'sd-PK', 'sd-IN')
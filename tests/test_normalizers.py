@@ -0,0 +1,45 @@
+import json
+import os
+from collections import defaultdict
+
+import pytest
+
+from indo_arabic_transliteration.normalizers import DevanagariNormalizer, GurmukhiNormalizer, UrduNormalizer
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+NORMALIZERS = {
+    'urdu': UrduNormalizer,
+    'devanagari': DevanagariNormalizer,
+    'gurmukhi': GurmukhiNormalizer,
+}
+
+def load_parity_corpus():
+    corpus = defaultdict(list)
+    with open(os.path.join(DATA_DIR, 'normalizers_parity.jsonl'), encoding='utf-8') as f:
+        for line in f:
+            reference = json.loads(line)
+            corpus[reference['normalizer']].append((reference['text'], reference['output']))
+    return corpus
+
+PARITY_CORPUS = load_parity_corpus()
+
+def test_parity_corpus_covers_all_normalizers():
+    assert sorted(PARITY_CORPUS) == sorted(NORMALIZERS)
+
+@pytest.mark.parametrize('name', sorted(NORMALIZERS))
+def test_same_output_as_libraries(name):
+    '''
+    Same output as urduhack / indic_nlp_library (recorded with benchmarks/validate_normalizers.py --save).
+    '''
+    normalizer = NORMALIZERS[name]()
+    mismatches = [(text, output) for text, output in PARITY_CORPUS[name] if normalizer.normalize(text) != output]
+    assert not mismatches, mismatches[:5]
+
+@pytest.mark.parametrize('name', sorted(NORMALIZERS))
+def test_stream(name):
+    normalizer = NORMALIZERS[name]()
+    for text, output in PARITY_CORPUS[name][:50]:
+        for size in (1, 2, 3):
+            chunks = [text[i:i+size] for i in range(0, len(text), size)]
+            assert ''.join(normalizer.stream(chunks)) == output, (text, size)
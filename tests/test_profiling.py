@@ -0,0 +1,56 @@
+import asyncio
+import threading
+
+from indo_arabic_transliteration.mapper import script_convert
+from indo_arabic_transliteration.profiling import StageProfiler, active_profiler
+
+TEXT = 'ہندوستانی زبان'
+
+def test_profiler_records_stages():
+    expected = script_convert(TEXT, 'ur-PK', 'hi-IN')
+    with StageProfiler() as profiler:
+        assert script_convert(TEXT, 'ur-PK', 'hi-IN') == expected
+    assert profiler.stats and all(stats.calls for stats in profiler.stats.values())
+    assert active_profiler.get() is None
+
+def test_nested_profilers():
+    with StageProfiler() as outer:
+        with StageProfiler() as inner:
+            script_convert(TEXT, 'ur-PK', 'hi-IN')
+        assert active_profiler.get() is outer
+        with inner:
+            script_convert(TEXT, 'ur-PK', 'hi-IN')
+    assert not outer.stats
+    assert {stats.calls for stats in inner.stats.values()} == {2}
+
+def test_profiler_is_local_to_threads():
+    started, stop = threading.Event(), threading.Event()
+
+    def profile():
+        with StageProfiler() as profiler:
+            started.set()
+            stop.wait()
+        return profiler
+
+    results = []
+    thread = threading.Thread(target=lambda: results.append(profile()))
+    thread.start()
+    started.wait()
+    script_convert(TEXT, 'ur-PK', 'hi-IN')
+    stop.set()
+    thread.join()
+    assert not results[0].stats
+
+def test_profiler_is_local_to_tasks():
+    async def convert(profile):
+        if not profile:
+            return script_convert(TEXT, 'ur-PK', 'hi-IN'), None
+        with StageProfiler() as profiler:
+            await asyncio.sleep(0.01)
+            return script_convert(TEXT, 'ur-PK', 'hi-IN'), profiler
+
+    async def main():
+        return await asyncio.gather(convert(True), convert(False), convert(False))
+
+    (_, profiler), _, _ = asyncio.run(main())
+    assert {stats.calls for stats in profiler.stats.values()} == {1}
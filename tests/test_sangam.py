@@ -0,0 +1,144 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from indo_arabic_transliteration import sangam_cache
+from indo_arabic_transliteration.sangam_cache import OfflineCacheMiss, SangamCache
+
+class SangamHandler(BaseHTTPRequestHandler):
+    '''
+    Stand-in for the Sangam API: returns the input reversed, line by line.
+    '''
+    def do_POST(self):
+        text = json.loads(self.rfile.read(int(self.headers['Content-Length'])))['input']
+        self.server.inputs.append(text)
+        body = json.dumps({'d': '\n'.join(line[::-1] for line in text.split('\n'))}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SangamHandler)
+    server.inputs = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def sangam_api(server, monkeypatch):
+    pytest.importorskip('requests')
+    from indo_arabic_transliteration import sangam_api
+    monkeypatch.setitem(sangam_api.ENDPOINTS, ('hi-IN', 'ur-PK'), f'http://127.0.0.1:{server.server_port}/Hindi2Urdu')
+    yield sangam_api
+    sangam_api.disable_cache()
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / 'sangam cache?#%.sqlite3')
+
+def test_cache_get_set(cache_path):
+    cache = SangamCache(cache_path)
+    assert cache.get('a', 'x') is None
+    cache.set('a', 'x', 'X')
+    cache.set('b', 'x', 'Y')
+    cache.set('a', 'x', 'Z')
+    assert (cache.get('a', 'x'), cache.get('b', 'x'), len(cache)) == ('Z', 'Y', 2)
+    cache.close()
+
+    cache = SangamCache(cache_path)
+    assert (cache.get('a', 'x'), cache.count) == ('Z', 2)
+    cache.clear()
+    assert (cache.get('a', 'x'), len(cache)) == (None, 0)
+    cache.close()
+
+def test_cache_evicts_least_recently_used(cache_path, monkeypatch):
+    monkeypatch.setattr(sangam_cache, 'EVICT_HEADROOM', 0.5)
+    cache = SangamCache(cache_path, max_entries=4)
+    for text in 'abcdef':
+        cache.set('a', text, text.upper())
+        # Keeps 'a' recently used (written back in batches)
+        cache.get('a', 'a')
+    assert len(cache) == 6
+    cache.set('a', 'g', 'G')
+    assert len(cache) == 4
+    assert [text for text in 'abcdefg' if cache.get('a', text)] == ['a', 'e', 'f', 'g']
+
+    cache.set('a', 'h', 'H')
+    cache.evict()
+    assert len(cache) == 4
+    cache.close()
+
+def test_cache_batches_access_times(cache_path, monkeypatch):
+    monkeypatch.setattr(sangam_cache, 'ACCESS_BATCH_SIZE', 2)
+    cache = SangamCache(cache_path)
+    for text in 'abc':
+        cache.set('a', text, text.upper())
+    accessed = dict(cache.db.execute('SELECT input, accessed FROM responses'))
+    cache.get('a', 'a')
+    assert dict(cache.db.execute('SELECT input, accessed FROM responses')) == accessed
+    cache.get('a', 'b')
+    new_accessed = dict(cache.db.execute('SELECT input, accessed FROM responses'))
+    assert new_accessed['a'] > accessed['a'] and new_accessed['b'] > accessed['b'] and new_accessed['c'] == accessed['c']
+    cache.get('a', 'c')
+    cache.close()
+
+    cache = SangamCache(cache_path)
+    assert dict(cache.db.execute('SELECT input, accessed FROM responses'))['c'] > accessed['c']
+    cache.close()
+
+def test_cache_ttl(cache_path, monkeypatch):
+    monkeypatch.setattr(sangam_cache, 'EVICT_INTERVAL', 2)
+    cache = SangamCache(cache_path, ttl=60)
+    cache.set('a', 'x', 'X')
+    cache.db.execute('UPDATE responses SET created = created - 120')
+    assert cache.get('a', 'x') is None
+    cache.set('a', 'y', 'Y')
+    assert (len(cache), cache.get('a', 'y')) == (1, 'Y')
+    cache.close()
+
+def test_offline_cache(cache_path):
+    cache = SangamCache(cache_path)
+    cache.set('a', 'x', 'X')
+    cache.close()
+
+    cache = SangamCache(cache_path, offline=True)
+    assert (cache.get('a', 'x'), cache.get('a', 'y')) == ('X', None)
+    cache.set('a', 'y', 'Y')
+    assert len(cache) == 1
+    cache.close()
+
+def test_online_transliterate(sangam_api, server, cache_path):
+    assert sangam_api.online_transliterate('abc', 'hi-IN', 'ur-PK') == 'cba'
+    sangam_api.enable_cache(cache_path)
+    assert [sangam_api.online_transliterate(text, 'hi-IN', 'ur-PK') for text in ['abc', 'de', 'abc']] == ['cba', 'ed', 'cba']
+    assert server.inputs == ['abc', 'abc', 'de']
+
+    sangam_api.enable_cache(cache_path, offline=True)
+    assert sangam_api.online_transliterate('de', 'hi-IN', 'ur-PK') == 'ed'
+    with pytest.raises(OfflineCacheMiss):
+        sangam_api.online_transliterate('fg', 'hi-IN', 'ur-PK')
+    assert len(server.inputs) == 3
+
+def test_transliterate_many(sangam_api, server, cache_path):
+    cache = SangamCache(cache_path)
+    cache.set(sangam_api.ENDPOINTS['hi-IN', 'ur-PK'], 'cached', 'CACHED')
+
+    async def run():
+        async with sangam_api.AsyncSangamClient(concurrency=2, pack_chars=8, cache=cache) as client:
+            return await client.transliterate_many(['ab', 'cd', 'cached', 'ab', 'long text', 'e\nf'], 'hi-IN', 'ur-PK')
+
+    assert asyncio.run(run()) == ['ba', 'dc', 'CACHED', 'ba', 'txet gnol', 'e\nf']
+    assert sorted(server.inputs) == ['ab\ncd', 'e\nf', 'long text']
+    assert cache.get(sangam_api.ENDPOINTS['hi-IN', 'ur-PK'], 'cd') == 'dc'
+    cache.close()
@@ -0,0 +1,65 @@
+import asyncio
+import json
+
+import pytest
+
+from indo_arabic_transliteration.mapper import script_convert
+from indo_arabic_transliteration.server import TransliterationServer
+
+async def post(port, path, body):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    body = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+    writer.write(f'POST {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n'.encode('latin-1') + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(payload)
+
+def run_requests(requests):
+    '''
+    Starts a single-thread server and sends it each (path, body) request over HTTP.
+    '''
+    async def run():
+        server = TransliterationServer(pairs=[('ur-PK', 'hi-IN')], ml_pairs=[], workers=0)
+        await server.start(port=0)
+        port = server.server.sockets[0].getsockname()[1]
+        try:
+            return [await post(port, path, body) for path, body in requests]
+        finally:
+            await server.close()
+    return asyncio.run(run())
+
+def test_convert():
+    texts = ['اسلام آباد ایک شہر ہے', '', 'کتاب\nدریا']
+    responses = run_requests([
+        ('/convert', {'text': texts[0], 'from': 'ur-PK', 'to': 'hi-IN'}),
+        ('/convert', {'texts': texts, 'from': 'ur-PK', 'to': 'hi-IN', 'method': 'rules'}),
+    ])
+    expected = [script_convert(text, 'ur-PK', 'hi-IN') for text in texts]
+    assert responses == [(200, {'output': expected[0]}), (200, {'outputs': expected})]
+
+@pytest.mark.parametrize('body', [
+    # Malformed JSON
+    b'{"text": ',
+    b'\xff',
+    # Not an object, or missing fields
+    [],
+    {'text': 'a', 'from': 'ur-PK'},
+    # Bad field types
+    {'text': 'a', 'from': ['ur-PK'], 'to': 'hi-IN'},
+    {'text': 'a', 'from': 'ur-PK', 'to': {'hi': 'IN'}},
+    {'text': 'a', 'from': 'ur-PK', 'to': 'hi-IN', 'method': None},
+    {'text': 1, 'from': 'ur-PK', 'to': 'hi-IN'},
+    {'texts': 'a', 'from': 'ur-PK', 'to': 'hi-IN'},
+    {'texts': ['a', None], 'from': 'ur-PK', 'to': 'hi-IN'},
+    # Unknown pairs and methods
+    {'text': 'a', 'from': 'hi-IN', 'to': 'ur-PK'},
+    {'text': 'a', 'from': 'ur-PK', 'to': 'hi-IN', 'method': 'ml'},
+])
+def test_bad_requests(body):
+    [(status, payload)] = run_requests([('/convert', body)])
+    assert status == 400 and 'error' in payload
+
+def test_unknown_endpoint():
+    assert run_requests([('/missing', {})])[0][0] == 404
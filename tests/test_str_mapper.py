@@ -0,0 +1,178 @@
+import random
+
+import pytest
+
+from indo_arabic_transliteration import str_mapper
+from indo_arabic_transliteration.hindustani import HindustaniTransliterator
+from indo_arabic_transliteration.punjabi import GujaratiTransliterator, PunjabiTransliterator
+from indo_arabic_transliteration.sindhi import SindhiTransliterator
+from indo_arabic_transliteration.str_mapper import BACKENDS, StringTranslator, TranslatorPipeline, can_fuse_passes
+
+EDGE_CASES = ['', ' ', '\n', 'abc 123', '...', 'ٔ', 'ّ ّ', '‌‍', '،؟۔ ।॥']
+
+CORPUS = {
+    'ur-PK': ['جمہوریہ پاکستان کی حکومت نہیں ہے۔', 'اسلام آباد ایک شہر ہے', 'گئے آئے جائیں ہوئی؟', 'سوال، کتاب اور دریا', 'کراچی ۱۹۴۷ میں', 'مؤمن، اُمّید؛ تشکّر "لاہور"'],
+    'hi-IN': ['हैदराबाद भारत का एक शहर है।', 'इसलिए ईद उम्मीद ऊपर', 'ऐसा औरत गए आए', 'क़िला ज़रूर सवाल, मैं कहाँ?', 'दुनिया किताब हुई १९४७', 'ह्ह हा जमहोरीह'],
+    'sd-PK': ['سنڌي حيدرآباد ڪراچي', 'درياهه ڪتاب آهي ۾ ۽ سنڌو', 'ٻار ڄڻ ڏاڍو ڀلو'],
+    'sd-IN': ['सिन्धी हैदराबाद कराची', 'दरियाह किताब आहे में ऐं सिन्धु', 'ॻाल्हि ॼणु ॾाढो'],
+    'pa-IN': ['ਪੰਜਾਬੀ ਸਿੰਘ ਗੁਰੂ ਅੰਮ੍ਰਿਤਸਰ', 'ਲਾਹੌਰ ਦਰਿਆ ਕਿਤਾਬ ਹੈ ਦੀ ਅਤੇ', 'ਮੈਂ 1947 ਵਿੱਚ'],
+    'gu-IN': ['ગુજરાતી અમદાવાદ ભારત', 'શહેર છે અને પુસ્તક નદી.'],
+}
+
+CONVERSIONS = [
+    (HindustaniTransliterator, 'transliterate_from_urdu_to_hindi', 'ur-PK'),
+    (HindustaniTransliterator, 'transliterate_from_hindi_to_urdu', 'hi-IN'),
+    (SindhiTransliterator, 'transliterate_from_sindhi_to_devanagari', 'sd-PK'),
+    (SindhiTransliterator, 'transliterate_from_devanagari_to_sindhi', 'sd-IN'),
+    (PunjabiTransliterator, 'transliterate_from_gurmukhi_to_shahmukhi', 'pa-IN'),
+    (GujaratiTransliterator, 'transliterate_from_gujarati_to_urdu', 'gu-IN'),
+]
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, monkeypatch):
+    monkeypatch.setattr(str_mapper, 'DEFAULT_BACKEND', request.param)
+    return request.param
+
+def test_set_default_backend(monkeypatch):
+    monkeypatch.setattr(str_mapper, 'DEFAULT_BACKEND', 'regex')
+    str_mapper.set_default_backend('trie')
+    assert StringTranslator({'a': 'b'}).backend == 'trie'
+    with pytest.raises(ValueError):
+        str_mapper.set_default_backend('dfa')
+
+@pytest.mark.parametrize('table, text, output', [
+    # Longest match
+    ({'a': '1', 'ab': '2', 'abc': '3'}, 'abcab a x', '32 1 x'),
+    # Overlapping keys: leftmost first
+    ({'ab': 'X', 'bc': 'Y'}, 'abc bcab', 'Xc YX'),
+    ({'aa': 'X'}, 'aaa', 'Xa'),
+    # Multi-char values are not rescanned
+    ({'a': 'aa', 'b': 'a'}, 'ab', 'aaa'),
+    # Unmapped chars are kept
+    ({'ک': 'क', 'ب': 'ब'}, 'کتاب x ب', 'क' + 'تا' + 'ब x ब'),
+    ({'a': 'b'}, '', ''),
+    ({'a': 'b'}, 'xyz', 'xyz'),
+])
+def test_translate(backend, table, text, output):
+    assert StringTranslator(table).translate(text) == output
+
+def test_translate_in_given_order(backend):
+    translator = StringTranslator({'a': '1', 'ab': '2'}, sort_by_descending_key_length=False)
+    assert translator.translate('ab') == '1b'
+
+def test_word_boundaries(backend):
+    assert StringTranslator({'a': 'A', 'ab': 'X'}, match_initial_only=True).translate('aa ab ba') == 'Aa X ba'
+    assert StringTranslator({'a': 'A', 'ba': 'X'}, match_final_only=True).translate('aa ba ab') == 'aA X ab'
+    assert StringTranslator({'a': 'A'}, match_initial_only=True, match_final_only=True).translate('a aa a') == 'A aa A'
+
+def test_reverse_translate(backend):
+    translator = StringTranslator({'a': 'x', 'b': 'x', 'c': 'yz'}, reverse_overrides={'x': 'a'})
+    assert translator.reverse_translate('xyzy') == 'acy'
+    assert dict(translator.reverse_translation_dict) == {'yz': 'c', 'x': 'a'}
+    with pytest.raises(AttributeError):
+        StringTranslator({'a': 'x'}, support_back_translation=False).reverse_translate('x')
+
+def test_stream(backend):
+    translator = StringTranslator({'a': '1', 'abc': '3', 'c': '2'}, match_final_only=True)
+    text = 'abc a ca abcabc c'
+    for size in range(1, 5):
+        chunks = [text[i:i+size] for i in range(0, len(text), size)]
+        assert ''.join(translator.stream(chunks)) == translator.translate(text)
+
+def get_trie_twin(translator):
+    if translator.reverse_source is None:
+        return StringTranslator(translator.translation_dict, translator.sort_by_descending_key_length, translator.match_initial_only,
+                                translator.match_final_only, translator.boundary_regex, support_back_translation=False, backend='trie')
+    return StringTranslator(translator.reverse_source, translator.sort_by_descending_key_length, translator.match_initial_only,
+                            translator.match_final_only, translator.boundary_regex, backend='trie', reverse_overrides=translator.reverse_overrides)
+
+def get_pipelines(converter):
+    return [value for value in vars(converter).values() if isinstance(value, TranslatorPipeline)]
+
+@pytest.mark.parametrize('converter_class', [HindustaniTransliterator, SindhiTransliterator])
+def test_pipeline_backends_agree(monkeypatch, converter_class):
+    '''
+    Every StringTranslator pass of the converters gives the same output with both backends, on the texts it actually sees.
+    '''
+    monkeypatch.setattr(str_mapper, 'DEFAULT_BACKEND', 'regex')
+    texts = [text for script_texts in CORPUS.values() for text in script_texts] + EDGE_CASES
+    num_compared = 0
+    for pipeline in get_pipelines(converter_class()):
+        for text in texts:
+            for stage in pipeline.stages:
+                translator = getattr(stage, '__self__', None)
+                if isinstance(translator, StringTranslator):
+                    assert getattr(get_trie_twin(translator), stage.__name__)(text) == stage(text), (pipeline.name, stage.__name__, text)
+                    num_compared += 1
+                text = stage(text)
+    assert num_compared
+
+def make_converter(converter_class, compile_pipeline):
+    if converter_class in (PunjabiTransliterator, GujaratiTransliterator):
+        # Always built on unfused HindustaniTransliterator pipelines
+        return converter_class()
+    return converter_class(compile_pipeline=compile_pipeline)
+
+@pytest.mark.parametrize('converter_class, method, script', CONVERSIONS)
+def test_conversion_backends_and_fusion_agree(monkeypatch, converter_class, method, script):
+    texts = CORPUS[script] + EDGE_CASES
+    outputs = {}
+    for backend in BACKENDS:
+        monkeypatch.setattr(str_mapper, 'DEFAULT_BACKEND', backend)
+        for compile_pipeline in (False, True):
+            converter = make_converter(converter_class, compile_pipeline)
+            outputs[backend, compile_pipeline] = [getattr(converter, method)(text) for text in texts]
+    expected = outputs['regex', False]
+    assert all(output == expected for output in outputs.values())
+
+def test_fusion_reduces_scans():
+    converter = HindustaniTransliterator(compile_pipeline=True)
+    unfused = HindustaniTransliterator()
+    assert converter.urdu_to_hindi_pipeline.num_scans < unfused.urdu_to_hindi_pipeline.num_scans
+
+def make_pass(table, initial=False, final=False):
+    return (table, initial, final, r'\b')
+
+@pytest.mark.parametrize('earlier, later, fusable', [
+    (make_pass({'a': 'x'}), make_pass({'b': 'y'}), True),
+    (make_pass({'ab': 'x', 'c': 'zz'}), make_pass({'d': 'y', 'ee': 'w'}), True),
+    # Outputs feeding the later pass
+    (make_pass({'a': 'b'}), make_pass({'b': 'c'}), False),
+    (make_pass({'a': ''}), make_pass({'b': 'c'}), False),
+    # Partially overlapping keys, and keys containing keys of the earlier pass
+    (make_pass({'ab': 'x'}), make_pass({'bc': 'y'}), False),
+    (make_pass({'bc': 'x'}), make_pass({'ab': 'y'}), False),
+    (make_pass({'b': 'x'}), make_pass({'abc': 'y'}), False),
+    # Empty passes and keys
+    (make_pass({}), make_pass({'b': 'y'}), False),
+    (make_pass({'': 'x'}), make_pass({'b': 'y'}), False),
+    # Replacements changing the word boundaries seen by the later pass
+    (make_pass({'a': '-'}), make_pass({'b': 'y'}, initial=True), False),
+    (make_pass({'a': 'x'}), make_pass({'b': 'y'}, final=True), True),
+    (make_pass({'a': 'x'}), ({'b': 'y'}, True, False, r'\s'), False),
+])
+def test_can_fuse_passes(earlier, later, fusable):
+    assert can_fuse_passes(earlier, later) == fusable
+
+def make_random_translator(rng, keys_alphabet, values_alphabet):
+    table = {}
+    for _ in range(rng.randint(1, 4)):
+        table[''.join(rng.choices(keys_alphabet, k=rng.randint(1, 3)))] = ''.join(rng.choices(values_alphabet, k=rng.randint(1, 2)))
+    return StringTranslator(table, match_initial_only=rng.random() < 0.3, match_final_only=rng.random() < 0.3, support_back_translation=False)
+
+def test_fused_pipeline_random(backend):
+    '''
+    Fused pipelines give the same output as running their passes one by one, on random passes and texts.
+    '''
+    rng = random.Random(0)
+    num_fused = 0
+    for _ in range(300):
+        translators = [make_random_translator(rng, 'abcd- ', 'abcdxyz -') for _ in range(rng.randint(2, 4))]
+        stages = [(translator, False) for translator in translators]
+        fused, unfused = TranslatorPipeline(stages), TranslatorPipeline(stages, fuse=False)
+        num_fused += fused.num_scans < unfused.num_scans
+        for _ in range(20):
+            text = ''.join(rng.choices('abcdxy- ', k=rng.randint(0, 12)))
+            assert fused(text) == unfused(text), (stages, text)
+            assert ''.join(fused.stream(text)) == fused(text)
+    assert num_fused
@@ -0,0 +1,82 @@
+import os
+import pickle
+import shutil
+import threading
+
+import pytest
+
+from indo_arabic_transliteration import tables
+from indo_arabic_transliteration.tables import compile_tables, load_lexicon, load_table
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(tables, '_compiled_tables', {})
+    monkeypatch.setenv('INDO_XLIT_CACHE_DIR', str(tmp_path / 'cache'))
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    (data_dir / 'letters.csv').write_text('ب,پ\nb,p\nब,प\n', encoding='utf-8')
+    (data_dir / 'words_lexicon.tsv').write_text('# word\treplacement\nکہ\tकि\n', encoding='utf-8')
+    return str(data_dir) + '/'
+
+def reload(data_dir, monkeypatch):
+    monkeypatch.setattr(tables, '_compiled_tables', {})
+    return load_table(data_dir, 'letters.csv')
+
+def list_artifacts():
+    return os.listdir(tables.get_cache_dir())
+
+def read_artifact():
+    [artifact] = list_artifacts()
+    with open(os.path.join(tables.get_cache_dir(), artifact), 'rb') as f:
+        return pickle.load(f)
+
+def fail(*args):
+    raise AssertionError("should not be called")
+
+def test_load(data_dir):
+    assert load_table(data_dir, 'letters.csv') == (('ب', 'b', 'ब'), ('پ', 'p', 'प'))
+    assert load_lexicon(data_dir, 'words_lexicon.tsv') == {'کہ': 'कि'}
+    with pytest.raises(FileNotFoundError):
+        load_table(data_dir, 'missing.csv')
+    assert read_artifact()['lexicons'] == {'words_lexicon.tsv': {'کہ': 'कि'}}
+    assert sorted(os.listdir(data_dir)) == ['letters.csv', 'words_lexicon.tsv']
+
+def test_unwritable_cache_dir(data_dir, monkeypatch):
+    # Not a directory (and not writable either)
+    monkeypatch.setenv('INDO_XLIT_CACHE_DIR', os.path.join(data_dir, 'letters.csv', 'cache'))
+    assert load_table(data_dir, 'letters.csv') == (('ب', 'b', 'ब'), ('پ', 'p', 'प'))
+    assert sorted(os.listdir(data_dir)) == ['letters.csv', 'words_lexicon.tsv']
+
+def test_touched_or_copied_files_are_not_recompiled(data_dir, tmp_path, monkeypatch):
+    load_table(data_dir, 'letters.csv')
+    path = os.path.join(data_dir, 'letters.csv')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    monkeypatch.setattr(tables, 'compile_tables', fail)
+    assert reload(data_dir, monkeypatch) == (('ب', 'b', 'ब'), ('پ', 'p', 'प'))
+    copy_dir = tmp_path / 'copy'
+    shutil.copytree(data_dir, copy_dir)
+    assert load_table(str(copy_dir), 'letters.csv') == (('ب', 'b', 'ब'), ('پ', 'p', 'प'))
+
+def test_changed_files_are_recompiled(data_dir, monkeypatch):
+    load_table(data_dir, 'letters.csv')
+    with open(os.path.join(data_dir, 'letters.csv'), 'a', encoding='utf-8') as f:
+        f.write('x,y\n')
+    assert reload(data_dir, monkeypatch) == (('ب', 'b', 'ब', 'x'), ('پ', 'p', 'प', 'y'))
+    assert len(list_artifacts()) == 2
+
+def test_concurrent_compilation(data_dir):
+    errors = []
+    def run():
+        try:
+            compile_tables(data_dir)
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert sorted(os.listdir(data_dir)) == ['letters.csv', 'words_lexicon.tsv']
+    assert read_artifact()['tables']['letters.csv'] == (('ب', 'b', 'ब'), ('پ', 'p', 'प'))